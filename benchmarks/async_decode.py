@@ -0,0 +1,63 @@
+"""Event-loop stall while ``arpc`` decodes a large ``item.get`` response, inline and in a ``ProcessDecoder``.
+
+The response comes from the simulator inventory; a ticker task waking every millisecond
+records the longest time the event loop was blocked during the decoding.
+
+Usage: python benchmarks/async_decode.py [rows]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from pyzbx.async_client import ProcessDecoder, decode_response
+from pyzbx.simulator import Inventory
+
+OUTPUT = ["itemid", "hostid", "name", "key_", "lastclock", "lastvalue"]
+COLUMNS = {"itemid": "q", "hostid": "q", "name": "s", "key_": "s", "lastclock": "q", "lastvalue": "s"}
+
+
+async def _stall(decode: "asyncio.Future") -> float:
+    longest = 0.0
+    last = time.perf_counter()
+    while not decode.done():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        longest = max(longest, now - last)
+        last = now
+    return longest
+
+
+async def _measure(body: bytes, decoder: ProcessDecoder | None) -> float:
+    async def decode() -> None:
+        await asyncio.sleep(0.01)
+        if decoder is None:
+            decode_response(body, COLUMNS)
+        else:
+            await decoder.decode(body, COLUMNS)
+
+    task = asyncio.ensure_future(decode())
+    stall = await _stall(task)
+    await task
+    return stall
+
+
+async def main(rows: int) -> None:
+    inventory = Inventory(hosts=rows // 100, items_per_host=100)
+    result = inventory.call("item.get", {"output": OUTPUT})
+    body = json.dumps({"jsonrpc": "2.0", "result": result, "id": 1}).encode()
+    decoder = ProcessDecoder(threshold=0)
+    # start the worker before measuring
+    await decoder.decode(json.dumps({"jsonrpc": "2.0", "result": [], "id": 1}).encode())
+    try:
+        inline = await _measure(body, None)
+        pooled = await _measure(body, decoder)
+    finally:
+        decoder.close()
+    print(f"{len(result)} rows, {len(body) / 2**20:.1f} MiB")
+    print(f"longest event-loop stall: inline {inline * 1000:.0f} ms, process pool {pooled * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 400_000))
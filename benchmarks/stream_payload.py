@@ -0,0 +1,72 @@
+"""Peak memory of downloading an image with ``download_image`` compared to a buffered ``image.get``.
+
+The image is served from memory through an ``httpx.MockTransport`` in 64 KiB chunks, and
+the decoded bytes are discarded, so the peak traced by ``tracemalloc`` is what the client
+itself holds.
+
+Usage: python benchmarks/stream_payload.py [megabytes]
+"""
+
+import base64
+import json
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+
+import httpx
+
+from pyzbx.generics import rpc
+from pyzbx.payload import download_image
+
+CHUNK = 64 * 1024
+
+
+class _Discard:
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+
+class _Stream(httpx.SyncByteStream):
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self.chunks = chunks
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.chunks
+
+
+def _client(body: bytes) -> httpx.Client:
+    def chunks() -> Iterator[bytes]:
+        for offset in range(0, len(body), CHUNK):
+            yield body[offset : offset + CHUNK]
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, stream=_Stream(chunks()))
+
+    return httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(handler))
+
+
+def _peak(body: bytes, call: Callable[[httpx.Client], object]) -> int:
+    with _client(body) as client:
+        tracemalloc.start()
+        call(client)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak
+
+
+def main(megabytes: float) -> None:
+    image = os.urandom(int(megabytes * 2**20))
+    result = [{"imageid": "1", "image": base64.b64encode(image).decode()}]
+    body = json.dumps({"jsonrpc": "2.0", "result": result, "id": 1}).encode()
+    params = {"output": ["imageid"], "imageids": [1], "select_image": True}
+    streamed = _peak(body, lambda client: download_image(client, 1, _Discard()))
+    buffered = _peak(body, lambda client: base64.b64decode(rpc(client, "image.get", params)[0]["image"]))
+    print(f"{len(image) / 2**20:.1f} MiB image, {len(body) / 2**20:.1f} MiB response")
+    print(
+        f"peak traced memory: download_image {streamed / 2**10:.0f} KiB, buffered image.get {buffered / 2**10:.0f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 3)
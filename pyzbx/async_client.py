@@ -0,0 +1,172 @@
+import asyncio
+import json
+import math
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from httpx import USE_CLIENT_DEFAULT, AsyncClient, TimeoutException
+from httpx._client import UseClientDefault
+from pydantic import BaseModel, TypeAdapter
+
+from .deadline import current_deadline
+from .exceptions import DeadlineExceededError, EmptyResponseError, ZabbixAPIError
+from .generics import _ParamsT
+
+# values of missing fields per column type of ``columns``: 64 bit integers, floats, or strings
+_MISSING = {"q": 0, "d": math.nan, "s": ""}
+
+Columns = dict[str, array | list[str]]
+
+
+def decode_response(body: bytes, columns: Mapping[str, str] | None = None, model: type[BaseModel] | None = None) -> Any:
+    """
+    Decodes a JSON-RPC response body and converts its result.
+
+    Args:
+        body (bytes): The raw response body.
+        columns (Mapping[str, str], optional): Return the rows as columns instead, keyed by field with a
+            type code: ``"q"`` (int64 array), ``"d"`` (float64 array) or ``"s"`` (list of str). Defaults to None.
+        model (type[BaseModel], optional): Validate every row as this model. Defaults to None.
+
+    Returns:
+        Any: The result, its columns, or its rows as models.
+
+    Raises:
+        EmptyResponseError: If the body is empty.
+        ZabbixAPIError: If the response is an error.
+    """
+    if not body or not (response := json.loads(body)):
+        msg = "Received empty response from Zabbix server"
+        raise EmptyResponseError(msg)
+    if "error" in response:
+        raise ZabbixAPIError(
+            code=response["error"].get("code"),
+            message=response["error"].get("message"),
+            data=response["error"].get("data"),
+        )
+    result = response["result"]
+    if columns is not None:
+        return to_columns(result, columns)
+    if model is not None:
+        return TypeAdapter(list[model]).validate_python(result)
+    return result
+
+
+def to_columns(rows: list[dict[str, Any]], columns: Mapping[str, str]) -> Columns:
+    """
+    Converts ``rows`` to one typed array (or list of strings) per field of ``columns``.
+
+    Missing, None and empty values are stored as 0, NaN or an empty string.
+
+    Raises:
+        TypeError: If ``rows`` is not a list, e.g. the result of ``countOutput`` or ``preservekeys``.
+    """
+    if not isinstance(rows, list):
+        msg = f"Only a list of rows can be converted to columns, not a {type(rows).__name__}"
+        raise TypeError(msg)
+    result: Columns = {}
+    for name, kind in columns.items():
+        missing = _MISSING[kind]
+        values = [row.get(name) for row in rows]
+        if kind == "s":
+            result[name] = [missing if value is None else str(value) for value in values]
+        else:
+            convert = int if kind == "q" else float
+            result[name] = array(kind, [missing if value in (None, "") else convert(value) for value in values])
+    return result
+
+
+class ProcessDecoder:
+    """Decodes large responses in a process pool so that the event loop keeps running.
+
+    Bodies smaller than ``threshold`` bytes are decoded inline, where a round trip to a
+    worker would cost more than the decoding. Larger ones are sent to a worker as raw
+    bytes; ask for ``columns`` to get compact typed arrays back instead of a list of
+    dictionaries, which would cost almost as much to send back as to decode.
+
+    Example:
+        >>> decoder = ProcessDecoder()
+        >>> items = await arpc(client, "item.get", params, decoder=decoder, columns={"itemid": "q", "name": "s"})
+    """
+
+    def __init__(
+        self,
+        threshold: int = 4 * 1024 * 1024,
+        max_workers: int | None = None,
+        executor: ProcessPoolExecutor | None = None,
+    ) -> None:
+        """
+        Initializes the decoder; the worker processes are started on first use.
+
+        Args:
+            threshold (int, optional): Smallest body size in bytes decoded in a worker. Defaults to 4 MiB.
+            max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            executor (ProcessPoolExecutor, optional): An existing pool to use instead. Defaults to None.
+        """
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owned = executor is None
+
+    async def decode(
+        self, body: bytes, columns: Mapping[str, str] | None = None, model: type[BaseModel] | None = None
+    ) -> Any:
+        """Decodes ``body``, in a worker process if it is larger than ``threshold``. See ``decode_response``."""
+        if len(body) < self.threshold:
+            return decode_response(body, columns, model)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        columns = dict(columns) if columns is not None else None
+        return await asyncio.get_running_loop().run_in_executor(self._executor, decode_response, body, columns, model)
+
+    def close(self) -> None:
+        if self._executor is not None and self._owned:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+async def arpc(
+    client: AsyncClient,
+    method: str,
+    params: _ParamsT,
+    id_: int | None = 1,
+    timeout: float | None | UseClientDefault = USE_CLIENT_DEFAULT,
+    decoder: ProcessDecoder | None = None,
+    columns: Mapping[str, str] | None = None,
+    model: type[BaseModel] | None = None,
+) -> Any:
+    """
+    Calls an API method with an ``httpx.AsyncClient``, the asynchronous counterpart of ``rpc``.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP session, with the API endpoint as ``base_url``.
+        method (str): The API method, e.g. ``"item.get"``.
+        params (_ParamsT): The parameters.
+        id_ (int, optional): The JSON-RPC request id. Defaults to 1.
+        timeout (float, optional): The request timeout. Defaults to the client's timeout.
+        decoder (ProcessDecoder, optional): Decode large responses in a process pool. Defaults to None.
+        columns (Mapping[str, str], optional): Return the rows as typed columns, see ``decode_response``.
+            Defaults to None.
+        model (type[BaseModel], optional): Validate every row as this model. Defaults to None.
+
+    Returns:
+        Any: The result of the call.
+    """
+    payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": id_}
+    url = str(client.base_url).rstrip("/")
+    if (deadline := current_deadline()) is not None:
+        deadline.check(method)
+        timeout = deadline.timeout(client.timeout if isinstance(timeout, UseClientDefault) else timeout)
+    try:
+        r = await client.post(url, json=payload, timeout=timeout)
+    except TimeoutException as e:
+        if deadline is not None and deadline.expired:
+            msg = f"Deadline exceeded during {method}"
+            raise DeadlineExceededError(msg) from e
+        raise
+    r.raise_for_status()
+    if decoder is None:
+        return decode_response(r.content, columns, model)
+    return await decoder.decode(r.content, columns, model)
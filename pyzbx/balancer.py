@@ -0,0 +1,184 @@
+import re
+import threading
+import time
+from collections.abc import Callable, Sequence
+
+import httpx
+
+from .logger import logger
+
+_METHOD_RE = re.compile(rb'"method"\s*:\s*"([^"]+)"')
+_IDEMPOTENT_METHODS = {"apiinfo.version", "user.checkAuthentication"}
+_HEALTH_CHECK_BODY = b'{"jsonrpc":"2.0","method":"apiinfo.version","params":[],"id":1}'
+
+
+class _Endpoint:
+    __slots__ = ["url", "transport", "ewma", "inflight", "healthy", "ejected_at"]
+
+    def __init__(self, url: str, transport: httpx.BaseTransport) -> None:
+        self.url = httpx.URL(url)
+        self.transport = transport
+        self.ewma = 0.0
+        self.inflight = 0
+        self.healthy = True
+        self.ejected_at = 0.0
+
+    def __repr__(self) -> str:
+        state = "up" if self.healthy else "ejected"
+        return f"<Endpoint {self.url} {state} ewma={self.ewma * 1000:.1f}ms inflight={self.inflight}>"
+
+
+class BalancedTransport(httpx.BaseTransport):
+    """An httpx transport that spreads requests over several stateless Zabbix frontends.
+
+    Each request goes to the healthy endpoint with the lowest EWMA latency weighted by its
+    requests in flight. An endpoint that fails with a connection error or a 5xx response is
+    ejected; it is re-admitted by the background health checks, or half-open after
+    ``readmit_after`` seconds when health checks are not running. Idempotent reads
+    (``*.get``, ``apiinfo.version``) that fail are retried on another endpoint.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        alpha: float = 0.3,
+        retries: int = 1,
+        readmit_after: float = 30.0,
+        transport_factory: Callable[[], httpx.BaseTransport] = httpx.HTTPTransport,
+    ) -> None:
+        """
+        Initializes the transport.
+
+        Args:
+            urls (Sequence[str]): Full API endpoint URLs, e.g. ``https://fe1/api_jsonrpc.php``.
+            alpha (float, optional): Weight of the newest sample in the latency EWMA. Defaults to 0.3.
+            retries (int, optional): Extra attempts on other endpoints for idempotent reads. Defaults to 1.
+            readmit_after (float, optional): Seconds after which an ejected endpoint is tried again.
+                Defaults to 30.
+            transport_factory (Callable[[], httpx.BaseTransport], optional): Creates the transport of
+                each endpoint. Defaults to ``httpx.HTTPTransport``.
+        """
+        if not urls:
+            msg = "At least one endpoint URL is required."
+            raise ValueError(msg)
+        self.endpoints = [_Endpoint(url, transport_factory()) for url in urls]
+        self.alpha = alpha
+        self.retries = retries
+        self.readmit_after = readmit_after
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._checker: threading.Thread | None = None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        match = _METHOD_RE.search(request.read())
+        method = match.group(1).decode() if match else ""
+        attempts = 1 + self.retries if method.endswith(".get") or method in _IDEMPOTENT_METHODS else 1
+        tried: list[_Endpoint] = []
+        while True:
+            endpoint = self._pick(tried)
+            tried.append(endpoint)
+            last_attempt = len(tried) >= min(attempts, len(self.endpoints))
+            try:
+                response = self._send(endpoint, request)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                logger.warning("%s failed on %s, retrying on another endpoint", method, endpoint.url)
+                continue
+            if response.status_code < httpx.codes.INTERNAL_SERVER_ERROR or last_attempt:
+                return response
+            response.close()
+            logger.warning("%s returned %s on %s, retrying", method, response.status_code, endpoint.url)
+
+    def start_health_checks(self, interval: float = 10.0, timeout: float = 5.0) -> None:
+        """Starts a daemon thread probing every endpoint with ``apiinfo.version`` every ``interval`` seconds."""
+        if self._checker is not None:
+            return
+        self._stop.clear()
+        self._checker = threading.Thread(
+            target=self._health_loop, args=(interval, timeout), name="pyzbx-health-check", daemon=True
+        )
+        self._checker.start()
+
+    def check_health(self, timeout: float = 5.0) -> None:
+        """Probes every endpoint once, ejecting failing ones and re-admitting recovered ones."""
+        for endpoint in self.endpoints:
+            request = httpx.Request(
+                "POST",
+                endpoint.url,
+                content=_HEALTH_CHECK_BODY,
+                headers={"Content-Type": "application/json-rpc"},
+                extensions={"timeout": httpx.Timeout(timeout).as_dict()},
+            )
+            started = time.monotonic()
+            try:
+                response = endpoint.transport.handle_request(request)
+                response.read()
+                response.close()
+                ok = response.status_code == httpx.codes.OK
+            except httpx.TransportError:
+                ok = False
+            with self._lock:
+                if ok:
+                    self._observe(endpoint, time.monotonic() - started)
+                    if not endpoint.healthy:
+                        logger.info("endpoint %s re-admitted", endpoint.url)
+                    endpoint.healthy = True
+                elif endpoint.healthy:
+                    self._eject(endpoint)
+
+    def close(self) -> None:
+        self._stop.set()
+        for endpoint in self.endpoints:
+            endpoint.transport.close()
+
+    def _health_loop(self, interval: float, timeout: float) -> None:
+        while not self._stop.wait(interval):
+            self.check_health(timeout)
+
+    def _pick(self, tried: list[_Endpoint]) -> _Endpoint:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [e for e in self.endpoints if e not in tried] or self.endpoints
+            # half-open: an ejected endpoint gets a new chance after readmit_after seconds
+            if usable := [e for e in candidates if e.healthy or now - e.ejected_at >= self.readmit_after]:
+                endpoint = min(usable, key=lambda e: e.ewma * (e.inflight + 1))
+            else:
+                endpoint = min(candidates, key=lambda e: e.ejected_at)
+            endpoint.inflight += 1
+            return endpoint
+
+    def _send(self, endpoint: _Endpoint, request: httpx.Request) -> httpx.Response:
+        headers = request.headers.copy()
+        headers["Host"] = endpoint.url.netloc.decode("ascii")
+        routed = httpx.Request(
+            request.method, endpoint.url, headers=headers, content=request.content, extensions=request.extensions
+        )
+        started = time.monotonic()
+        try:
+            response = endpoint.transport.handle_request(routed)
+        except httpx.TransportError:
+            with self._lock:
+                self._release(endpoint)
+                self._eject(endpoint)
+            raise
+        with self._lock:
+            self._release(endpoint)
+            if response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR:
+                self._eject(endpoint)
+            else:
+                self._observe(endpoint, time.monotonic() - started)
+                endpoint.healthy = True
+        return response
+
+    def _release(self, endpoint: _Endpoint) -> None:
+        endpoint.inflight = max(endpoint.inflight - 1, 0)
+
+    def _observe(self, endpoint: _Endpoint, elapsed: float) -> None:
+        endpoint.ewma = elapsed if endpoint.ewma == 0 else self.alpha * elapsed + (1 - self.alpha) * endpoint.ewma
+
+    def _eject(self, endpoint: _Endpoint) -> None:
+        if endpoint.healthy:
+            logger.warning("endpoint %s ejected", endpoint.url)
+        endpoint.healthy = False
+        endpoint.ejected_at = time.monotonic()
@@ -0,0 +1,191 @@
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Self
+from weakref import WeakKeyDictionary
+
+from httpx import USE_CLIENT_DEFAULT, Client, Response
+from httpx._client import UseClientDefault
+
+from .exceptions import MemoryBudgetExceededError
+from .logger import logger
+
+if TYPE_CHECKING:
+    from .explain import QueryPlan
+
+# error responses are small, larger bodies are not parsed to look for an expired session
+_MAX_ERROR_SIZE = 64 * 1024
+
+_current: ContextVar["MemoryBudget | None"] = ContextVar("pyzbx_memory_budget", default=None)
+_client_budgets: "WeakKeyDictionary[Client, MemoryBudget]" = WeakKeyDictionary()
+
+
+class MemoryBudget:
+    """A limit on the size of API results, checked before a get call and while responses are received.
+
+    While a budget is active, ``rpc`` streams every response and aborts it with
+    ``MemoryBudgetExceededError`` as soon as its body grows beyond ``response_bytes``,
+    instead of buffering it whole. ``get`` first estimates the size of its result with a
+    ``countOutput`` preflight (see ``explain``): a result estimated over ``max_bytes``
+    fails before it is fetched, and a result over ``response_bytes`` is fetched in
+    several calls of at most ``response_bytes`` each. Sizes are response bytes; decoded
+    objects take several times more memory.
+
+    A budget applies to the calls made within ``with``, or to every call of a client
+    given one with ``set_client_budget``. Budgets nest: an inner budget never allows more
+    than the outer one.
+
+    Example:
+        >>> with MemoryBudget(256 * 1024 * 1024):
+        ...     items = zbx.item.get(ItemGet(output="extend"))
+    """
+
+    __slots__ = ["max_bytes", "response_bytes", "_token"]
+
+    def __init__(self, max_bytes: int, response_bytes: int | None = None) -> None:
+        """
+        Initializes a budget; it applies to calls made inside ``with``.
+
+        Args:
+            max_bytes (int): Largest result a get call may buffer, in response bytes.
+            response_bytes (int, optional): Largest single response. Defaults to a quarter of ``max_bytes``.
+        """
+        response_bytes = response_bytes if response_bytes is not None else max(max_bytes // 4, 1)
+        if (parent := _current.get()) is not None:
+            max_bytes = min(max_bytes, parent.max_bytes)
+            response_bytes = min(response_bytes, parent.response_bytes)
+        self.max_bytes = max_bytes
+        self.response_bytes = min(response_bytes, max_bytes)
+        self._token: Token | None = None
+
+    def __repr__(self) -> str:
+        return f"<MemoryBudget max_bytes={self.max_bytes} response_bytes={self.response_bytes}>"
+
+    def __enter__(self) -> Self:
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        _current.reset(self._token)
+
+    def plan(self, client: Client, object_name: str, params: dict[str, Any]) -> "QueryPlan | None":
+        """
+        Checks the estimated result of a get call against the budget.
+
+        A ``limit`` small enough to fit a single response spares the ``countOutput`` preflight.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            object_name (str): The API object, e.g. ``"item"``.
+            params (dict[str, Any]): The get parameters.
+
+        Returns:
+            QueryPlan | None: A plan splitting the call into responses within the budget,
+                or None if a single response fits it.
+
+        Raises:
+            MemoryBudgetExceededError: If the result is estimated over ``max_bytes``, or over
+                ``response_bytes`` without a way to split it into smaller responses.
+        """
+        from .explain import Strategy, estimate_bytes, explain
+        from .generics import get_pk
+
+        if params.get("countOutput"):
+            return None
+        output = params.get("output", "extend")
+        if params.get("limit") and estimate_bytes(object_name, output, int(params["limit"])) <= self.response_bytes:
+            return None
+        plan = explain(client, object_name, params, max_rows=2**31, max_bytes=self.response_bytes)
+        if plan.estimated_bytes > self.max_bytes:
+            msg = (
+                f"{object_name}.get would return {plan.count} rows, ~{plan.estimated_bytes} bytes, over the memory "
+                f"budget of {self.max_bytes} bytes; narrow the request or iterate over it"
+            )
+            raise MemoryBudgetExceededError(msg, plan.estimated_bytes, self.max_bytes)
+        if plan.shards == 1:
+            if plan.estimated_bytes > self.response_bytes:
+                msg = f"{object_name}.get of ~{plan.estimated_bytes} bytes cannot be split: {plan.reason}"
+                raise MemoryBudgetExceededError(msg, plan.estimated_bytes, self.response_bytes)
+            return None
+        # key-set paging first fetches the IDs of all the rows in a single call
+        ids = estimate_bytes(object_name, [get_pk(object_name)], plan.count)
+        if plan.strategy == Strategy.KEYSET_PAGING and ids > self.response_bytes:
+            msg = f"The IDs of {object_name}.get alone, ~{ids} bytes, are over {self.response_bytes} bytes per response"
+            raise MemoryBudgetExceededError(msg, ids, self.response_bytes)
+        logger.debug("%s.get over %d bytes per response: %s", object_name, self.response_bytes, plan)
+        return plan
+
+    def post(
+        self, client: Client, url: str, method: str, timeout: float | UseClientDefault | None, **request: Any
+    ) -> Response:
+        """
+        Sends a request and reads its response, aborting once it exceeds ``response_bytes``.
+
+        ``request`` holds the body arguments of ``httpx.Client.post``: ``json``, or ``content``
+        and ``headers``. The session token of a ``SessionManager`` is added without its
+        response buffering; an expired session is renewed and the request sent again once.
+
+        Raises:
+            MemoryBudgetExceededError: If the response is larger than ``response_bytes``.
+        """
+        from .session import SessionManager, is_expired_error
+
+        auth = client.auth if isinstance(client.auth, SessionManager) else None
+        token = auth.valid_token() if auth is not None else None
+        r = self._read(client, url, method, token, timeout, request)
+        if auth is not None and len(r.content) <= _MAX_ERROR_SIZE:
+            try:
+                error = r.json().get("error")
+            except (ValueError, AttributeError):
+                error = None
+            if isinstance(error, dict) and is_expired_error(error.get("data")):
+                r = self._read(client, url, method, auth.renew(token), timeout, request)
+        return r
+
+    def _read(
+        self,
+        client: Client,
+        url: str,
+        method: str,
+        token: str | None,
+        timeout: float | UseClientDefault | None,
+        request: dict[str, Any],
+    ) -> Response:
+        headers = dict(request.get("headers") or {})
+        if token is not None:
+            # the token is sent here, bypassing the manager, so that an expired one is known and can be renewed
+            headers["Authorization"] = f"Bearer {token}"
+        with client.stream(
+            "POST",
+            url,
+            **{**request, "headers": headers or None},
+            timeout=timeout,
+            auth=None if token is not None else USE_CLIENT_DEFAULT,
+        ) as r:
+            length = r.headers.get("Content-Length")
+            if length is not None and int(length) > self.response_bytes:
+                msg = f"Response of {method} is {length} bytes, over the budget of {self.response_bytes} bytes"
+                raise MemoryBudgetExceededError(msg, int(length), self.response_bytes)
+            chunks = []
+            size = 0
+            for chunk in r.iter_bytes():
+                size += len(chunk)
+                if size > self.response_bytes:
+                    msg = f"Response of {method} exceeded the budget of {self.response_bytes} bytes"
+                    raise MemoryBudgetExceededError(msg, size, self.response_bytes)
+                chunks.append(chunk)
+        # the body is already decoded, the new response must not decode it again
+        return Response(r.status_code, content=b"".join(chunks), request=r.request)
+
+
+def set_client_budget(client: Client, budget: MemoryBudget | int | None) -> None:
+    """Applies ``budget``, or a ``MemoryBudget`` of that many bytes, to every call of ``client``; None removes it."""
+    if budget is None:
+        _client_budgets.pop(client, None)
+        return
+    _client_budgets[client] = budget if isinstance(budget, MemoryBudget) else MemoryBudget(budget)
+
+
+def current_budget(client: Client) -> MemoryBudget | None:
+    """Returns the budget active in this context, else the budget of ``client``, if any."""
+    if (budget := _current.get()) is not None:
+        return budget
+    return _client_budgets.get(client) if _client_budgets else None
@@ -0,0 +1,243 @@
+import json
+import sqlite3
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple, Self
+
+from httpx import Client
+
+from .generics import chunked, rpc
+
+
+class _Resource(NamedTuple):
+    method: str
+    pk: str
+    ids_param: str
+    resourcetype: int
+    parent: str | None = None
+
+
+# resource types as reported by auditlog.get
+_RESOURCES: dict[str, _Resource] = {
+    "host": _Resource("host.get", "hostid", "hostids", 4),
+    "hostgroup": _Resource("hostgroup.get", "groupid", "groupids", 14),
+    "template": _Resource("template.get", "templateid", "templateids", 30),
+    "item": _Resource("item.get", "itemid", "itemids", 15, parent="hostid"),
+}
+_RESOURCE_BY_TYPE = {r.resourcetype: kind for kind, r in _RESOURCES.items()}
+# sent with every get of the kind: hosts keep their groups and templates so that deleting
+# those can be cascaded, and items of templates are not cached
+_PARAMS: dict[str, dict[str, Any]] = {
+    "host": {"selectHostGroups": ["groupid"], "selectParentTemplates": ["templateid"]},
+    "item": {"templated": False},
+}
+# JSON paths of the host links to a group or a template, and of their ID
+_HOST_LINKS = {"hostgroup": ("$.hostgroups", "$.groupid"), "template": ("$.parentTemplates", "$.templateid")}
+
+_AUDIT_ACTION_DELETE = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    kind TEXT NOT NULL,
+    objectid INTEGER NOT NULL,
+    parentid INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, objectid)
+);
+CREATE INDEX IF NOT EXISTS objects_parent ON objects (kind, parentid);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class InventoryCache:
+    """On-disk cache of hosts, host groups, templates and items.
+
+    The first ``sync()`` downloads the full inventory. Subsequent runs warm start from the
+    SQLite file and only read ``auditlog.get`` entries newer than the last seen clock,
+    refetching the objects those entries touched. Deleting a host removes its items; deleting
+    a host group or a template refetches the hosts linked to it, and the items of hosts that
+    inherited items from the template.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        path: str | Path,
+        chunk_size: int = 1000,
+        clock_overlap: int = 60,
+    ) -> None:
+        """
+        Opens (or creates) the cache file.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            path (str | Path): Location of the SQLite cache file.
+            chunk_size (int, optional): Number of IDs fetched per get call. Defaults to 1000.
+            clock_overlap (int, optional): Seconds re-read from the audit log on every sync to
+                tolerate clock skew between the client and the server. Defaults to 60.
+        """
+        self.client = client
+        self.chunk_size = chunk_size
+        self.clock_overlap = clock_overlap
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    @property
+    def last_clock(self) -> int | None:
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'last_clock'").fetchone()
+        return int(row[0]) if row else None
+
+    def sync(self) -> int:
+        """Bring the cache up to date with the server.
+
+        Returns:
+            int: The number of objects that were (re)fetched.
+        """
+        if self.last_clock is None:
+            return self._full_load()
+        return self._incremental_load(self.last_clock)
+
+    def get(self, kind: str, objectid: int) -> dict[str, Any] | None:
+        row = self.db.execute(
+            "SELECT data FROM objects WHERE kind = ? AND objectid = ?", (kind, int(objectid))
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def all(self, kind: str) -> Iterator[dict[str, Any]]:
+        for (data,) in self.db.execute("SELECT data FROM objects WHERE kind = ? ORDER BY objectid", (kind,)):
+            yield json.loads(data)
+
+    def children(self, kind: str, parentid: int) -> Iterator[dict[str, Any]]:
+        """Iterate over cached objects of ``kind`` that belong to ``parentid``, e.g. the items of a host."""
+        query = "SELECT data FROM objects WHERE kind = ? AND parentid = ? ORDER BY objectid"
+        for (data,) in self.db.execute(query, (kind, int(parentid))):
+            yield json.loads(data)
+
+    def count(self, kind: str) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM objects WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def _full_load(self) -> int:
+        started = int(time.time())
+        fetched = 0
+        with self.db:
+            self.db.execute("DELETE FROM objects")
+            for kind in ("hostgroup", "template", "host"):
+                params = {"output": "extend", **_PARAMS.get(kind, {})}
+                fetched += self._store(kind, rpc(self.client, _RESOURCES[kind].method, params))
+            hostids = [row[0] for row in self.db.execute("SELECT objectid FROM objects WHERE kind = 'host'")]
+            fetched += self._reload_items(hostids)
+            self._set_last_clock(started)
+        return fetched
+
+    def _incremental_load(self, since: int) -> int:
+        entries = rpc(
+            self.client,
+            "auditlog.get",
+            {
+                "output": ["clock", "action", "resourcetype", "resourceid"],
+                "filter": {"resourcetype": list(_RESOURCE_BY_TYPE)},
+                "time_from": max(since - self.clock_overlap, 0),
+                "sortfield": "clock",
+                "sortorder": "ASC",
+            },
+        )
+        if not entries:
+            return 0
+        touched: dict[str, set[int]] = {kind: set() for kind in _RESOURCES}
+        deleted: dict[str, set[int]] = {kind: set() for kind in _RESOURCES}
+        for entry in entries:
+            kind = _RESOURCE_BY_TYPE[int(entry["resourcetype"])]
+            objectid = int(entry["resourceid"])
+            if int(entry["action"]) == _AUDIT_ACTION_DELETE:
+                deleted[kind].add(objectid)
+                touched[kind].discard(objectid)
+            else:
+                touched[kind].add(objectid)
+                deleted[kind].discard(objectid)
+        fetched = 0
+        with self.db:
+            # the server does not audit the hosts that lose a deleted group or template, nor the
+            # inherited items removed with a template
+            regrouped = self._linked_hosts("hostgroup", deleted["hostgroup"]) - deleted["host"]
+            unlinked = self._linked_hosts("template", deleted["template"]) - deleted["host"]
+            for kind, ids in deleted.items():
+                self._delete(kind, ids)
+            touched["host"] |= regrouped | unlinked
+            for kind, ids in touched.items():
+                fetched += self._refetch(kind, sorted(ids))
+            fetched += self._reload_items(sorted(unlinked))
+            self._set_last_clock(max(int(entry["clock"]) for entry in entries))
+        return fetched
+
+    def _refetch(self, kind: str, ids: list[int]) -> int:
+        resource = _RESOURCES[kind]
+        fetched = 0
+        for chunk in chunked(ids, self.chunk_size):
+            params = {"output": "extend", **_PARAMS.get(kind, {}), resource.ids_param: chunk}
+            objects = rpc(self.client, resource.method, params)
+            # objects missing from the response were removed after the audit entry was written,
+            # or are items of a template
+            self._delete(kind, set(chunk) - {int(obj[resource.pk]) for obj in objects})
+            fetched += self._store(kind, objects)
+        return fetched
+
+    def _reload_items(self, hostids: list[int]) -> int:
+        """Replaces the cached items of ``hostids``."""
+        fetched = 0
+        for chunk in chunked(hostids, self.chunk_size):
+            self.db.executemany("DELETE FROM objects WHERE kind = 'item' AND parentid = ?", [(h,) for h in chunk])
+            items = rpc(self.client, "item.get", {"output": "extend", **_PARAMS["item"], "hostids": chunk})
+            fetched += self._store("item", items)
+        return fetched
+
+    def _linked_hosts(self, kind: str, ids: set[int]) -> set[int]:
+        """Returns the cached hosts linked to any of the host groups or templates ``ids``."""
+        if not ids:
+            return set()
+        links, linkid = _HOST_LINKS[kind]
+        query = """
+            SELECT DISTINCT host.objectid FROM objects AS host, json_each(host.data, ?) AS link
+            WHERE host.kind = 'host' AND json_extract(link.value, ?) IN (SELECT value FROM json_each(?))
+        """
+        params = (links, linkid, json.dumps([str(objectid) for objectid in ids]))
+        return {row[0] for row in self.db.execute(query, params)}
+
+    def _store(self, kind: str, objects: list[dict[str, Any]]) -> int:
+        resource = _RESOURCES[kind]
+        self.db.executemany(
+            "INSERT OR REPLACE INTO objects (kind, objectid, parentid, data) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    kind,
+                    int(obj[resource.pk]),
+                    int(obj[resource.parent]) if resource.parent and obj.get(resource.parent) else None,
+                    json.dumps(obj, separators=(",", ":")),
+                )
+                for obj in objects
+            ),
+        )
+        return len(objects)
+
+    def _delete(self, kind: str, ids: set[int]) -> None:
+        if not ids:
+            return
+        params = [(kind, objectid) for objectid in ids]
+        self.db.executemany("DELETE FROM objects WHERE kind = ? AND objectid = ?", params)
+        if kind == "host":
+            # items of a deleted host are removed with it
+            self.db.executemany(
+                "DELETE FROM objects WHERE kind = 'item' AND parentid = ?", [(objectid,) for objectid in ids]
+            )
+
+    def _set_last_clock(self, clock: int) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_clock', ?)", (str(clock),))
@@ -0,0 +1,367 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from httpx import Client
+
+from .generics import chunked, rpc
+from .logger import logger
+
+if TYPE_CHECKING:
+    from .client import ZabbixClient
+
+# column name and type of each output schema
+_Columns = tuple[tuple[str, str], ...]
+_HISTORY_KEYS = (("itemid", "int"), ("clock", "int"), ("ns", "int"))
+SCHEMAS: dict[str, _Columns] = {
+    "float": (*_HISTORY_KEYS, ("value", "float")),
+    "uint": (*_HISTORY_KEYS, ("value", "uint")),
+    "text": (*_HISTORY_KEYS, ("value", "str")),
+    "trend": (
+        ("itemid", "int"),
+        ("clock", "int"),
+        ("num", "int"),
+        ("value_min", "float"),
+        ("value_avg", "float"),
+        ("value_max", "float"),
+    ),
+}
+# history value types: 0 numeric float, 3 numeric unsigned, 1 character, 2 log, 4 text
+_VALUE_TYPE_SCHEMAS = {0: "float", 3: "uint"}
+_CONVERTERS = {"int": int, "uint": int, "float": float, "str": str}
+
+
+class Window(NamedTuple):
+    itemid: int
+    value_type: int
+    time_from: int
+    time_till: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.itemid}:{self.time_from}"
+
+
+def _timestamp(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def _item_ids(values: Sequence[str]) -> list[int]:
+    ids: list[int] = []
+    for value in values:
+        if value.startswith("@"):
+            ids.extend(int(line) for line in Path(value[1:]).read_text().split() if line)
+        else:
+            ids.extend(int(part) for part in value.split(",") if part)
+    return ids
+
+
+class _State:
+    """Windows of committed part files, so that an interrupted export resumes where it stopped."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        data = json.loads(path.read_text()) if path.exists() else {}
+        self.done: set[str] = set(data.get("done", []))
+        self.parts: list[str] = data.get("parts", [])
+
+    def commit(self, part: str, keys: Sequence[str]) -> None:
+        self.done.update(keys)
+        self.parts.append(part)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"done": sorted(self.done), "parts": self.parts}))
+        tmp.replace(self.path)
+
+
+class _PartWriter:
+    """Writes rows of one schema to rotating part files; a part is committed to the state only once closed."""
+
+    def __init__(self, directory: Path, fmt: str, schema: str, state: _State, rows_per_file: int) -> None:
+        self.directory = directory
+        self.fmt = fmt
+        self.schema = schema
+        self.columns = SCHEMAS[schema]
+        self.state = state
+        self.rows_per_file = rows_per_file
+        self._writer: Any = None
+        self._file: Any = None
+        self._name = ""
+        self._rows = 0
+        self._keys: list[str] = []
+        self._counter = 0
+
+    def write(self, window: Window, rows: list[dict[str, Any]]) -> None:
+        if self._writer is None:
+            self._open()
+        if rows:
+            self._write_rows(window.itemid, rows)
+        self._rows += len(rows)
+        self._keys.append(window.key)
+        if self._rows >= self.rows_per_file:
+            self.close()
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        if self.fmt == "csv":
+            self._file.close()
+        else:
+            self._writer.close()
+        self.state.commit(self._name, self._keys)
+        self._writer = None
+        self._rows = 0
+        self._keys = []
+
+    def _open(self) -> None:
+        suffix = {"csv": "csv", "arrow": "arrow", "parquet": "parquet"}[self.fmt]
+        while True:
+            self._counter += 1
+            self._name = f"part-{self.schema}-{self._counter:05d}.{suffix}"
+            if self._name not in self.state.parts:
+                break
+        path = self.directory / self._name
+        if self.fmt == "csv":
+            self._file = path.open("w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow([name for name, _ in self.columns])
+        else:
+            pa, ipc, pq = _pyarrow()
+            schema = pa.schema([(name, _arrow_type(pa, kind)) for name, kind in self.columns])
+            if self.fmt == "arrow":
+                self._writer = ipc.new_file(str(path), schema)
+            else:
+                self._writer = pq.ParquetWriter(str(path), schema)
+
+    def _write_rows(self, itemid: int, rows: list[dict[str, Any]]) -> None:
+        if self.fmt == "csv":
+            names = [name for name, _ in self.columns[1:]]
+            self._writer.writerows([itemid, *(row.get(name) for name in names)] for row in rows)
+            return
+        pa, _, _ = _pyarrow()
+        arrays = [pa.array([itemid] * len(rows), type=pa.int64())]
+        for name, kind in self.columns[1:]:
+            convert = _CONVERTERS[kind]
+            values = [None if row.get(name) is None else convert(row[name]) for row in rows]
+            arrays.append(pa.array(values, type=_arrow_type(pa, kind)))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, names=[name for name, _ in self.columns]))
+
+
+def _arrow_type(pa: Any, kind: str) -> Any:
+    return {"int": pa.int64(), "uint": pa.uint64(), "float": pa.float64(), "str": pa.string()}[kind]
+
+
+def _pyarrow() -> tuple[Any, Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from pyarrow import ipc
+    except ImportError as e:
+        msg = "Arrow and Parquet output require pyarrow: pip install 'pyzbx[export]'"
+        raise SystemExit(msg) from e
+    return pa, ipc, pq
+
+
+def _windows(
+    client: Client, itemids: list[int], time_from: int, time_till: int, window: int, history_type: int | None
+) -> Iterator[Window]:
+    if history_type is None:
+        value_types = {}
+        for chunk in chunked(itemids, 1000):
+            items = rpc(client, "item.get", {"output": ["itemid", "value_type"], "itemids": chunk})
+            value_types.update({int(item["itemid"]): int(item["value_type"]) for item in items})
+    else:
+        value_types = dict.fromkeys(itemids, history_type)
+    for start in range(time_from, time_till + 1, window):
+        for itemid in itemids:
+            if itemid in value_types:
+                yield Window(itemid, value_types[itemid], start, min(start + window - 1, time_till))
+
+
+def _fetch(client: Client, trend: bool, window: Window) -> list[dict[str, Any]]:
+    params: dict[str, Any] = {
+        "output": "extend",
+        "itemids": [window.itemid],
+        "time_from": window.time_from,
+        "time_till": window.time_till,
+    }
+    if trend:
+        return rpc(client, "trend.get", params)
+    params.update(history=window.value_type, sortfield="clock", sortorder="ASC")
+    return rpc(client, "history.get", params)
+
+
+def export_history(
+    client: Client,
+    itemids: list[int],
+    time_from: int,
+    time_till: int,
+    output: Path,
+    fmt: str = "csv",
+    trend: bool = False,
+    window: int = 3600,
+    workers: int = 4,
+    history_type: int | None = None,
+    rows_per_file: int = 1_000_000,
+) -> int:
+    """
+    Exports ``history.get`` or ``trend.get`` data to part files in ``output``.
+
+    Every item is read in windows of ``window`` seconds on ``workers`` threads; at most
+    ``2 * workers`` windows are held in memory at a time. Values are written with typed
+    columns, one set of part files per schema: ``float``, ``uint`` and ``text`` history,
+    or ``trend``. Part files are committed to ``output/state.json`` when closed, and a later
+    run with the same arguments skips the committed windows and removes part files of an
+    interrupted run.
+
+    Returns:
+        int: The number of rows written.
+    """
+    output.mkdir(parents=True, exist_ok=True)
+    state = _State(output / "state.json")
+    for stale in output.glob("part-*"):
+        if stale.name not in state.parts:
+            stale.unlink()
+    writers: dict[str, _PartWriter] = {}
+    windows = _windows(client, itemids, time_from, time_till, window, history_type)
+    todo = (w for w in windows if w.key not in state.done)
+    written = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyzbx-export") as pool:
+        pending: dict[Future, Window] = {}
+        while True:
+            for w in todo:
+                pending[pool.submit(_fetch, client, trend, w)] = w
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rows = future.result()
+                w = pending.pop(future)
+                schema = "trend" if trend else _VALUE_TYPE_SCHEMAS.get(w.value_type, "text")
+                if schema not in writers:
+                    writers[schema] = _PartWriter(output, fmt, schema, state, rows_per_file)
+                writers[schema].write(w, rows)
+                written += len(rows)
+    for writer in writers.values():
+        writer.close()
+    return written
+
+
+def _client(args: argparse.Namespace) -> "ZabbixClient":
+    from .client import ZabbixClient
+
+    return ZabbixClient(args.url, username=args.username, password=args.password, token=args.token)
+
+
+def _export_history(args: argparse.Namespace) -> int:
+    with _client(args) as client:
+        rows = export_history(
+            client,
+            _item_ids(args.items),
+            _timestamp(args.time_from),
+            _timestamp(args.time_till) if args.time_till else int(time.time()),
+            Path(args.output),
+            fmt=args.format,
+            trend=args.trend,
+            window=args.window,
+            workers=args.workers,
+            history_type=args.history_type,
+            rows_per_file=args.rows_per_file,
+        )
+    logger.info("exported %d rows to %s", rows, args.output)
+    return 0
+
+
+def _simulate(args: argparse.Namespace) -> int:
+    from .simulator import Faults, Inventory, serve
+
+    inventory = Inventory(
+        hosts=args.hosts,
+        items_per_host=args.items_per_host,
+        seed=args.seed,
+        item_delay=args.item_delay,
+        event_interval=args.event_interval,
+    )
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        bandwidth=args.bandwidth,
+        session_ttl=args.session_ttl,
+        expire_rate=args.expire_rate,
+        seed=args.seed,
+    )
+    logger.info("serving %r on http://%s:%d", inventory, args.host, args.port)
+    serve(inventory, faults, args.host, args.port)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pyzbx", description="Zabbix API command line tools.")
+    parser.add_argument("--url", default=os.environ.get("ZABBIX_URL"), help="frontend URL [$ZABBIX_URL]")
+    parser.add_argument("--token", default=os.environ.get("ZABBIX_TOKEN"), help="API token [$ZABBIX_TOKEN]")
+    parser.add_argument("--username", default=os.environ.get("ZABBIX_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("ZABBIX_PASSWORD"))
+    parser.add_argument("-v", "--verbose", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export-history", help="export history or trends to CSV, Arrow or Parquet")
+    export.add_argument("--items", nargs="+", required=True, help="item IDs, comma separated, or @file")
+    export.add_argument("--from", dest="time_from", required=True, help="unix timestamp or ISO date")
+    export.add_argument("--till", dest="time_till", help="unix timestamp or ISO date, defaults to now")
+    export.add_argument("--format", choices=["csv", "arrow", "parquet"], default="csv")
+    export.add_argument("--output", required=True, help="output directory, also holds the resume state")
+    export.add_argument("--trend", action="store_true", help="export trend.get instead of history.get")
+    export.add_argument("--history-type", type=int, help="history value type, read from the items by default")
+    export.add_argument("--window", type=int, default=3600, help="seconds of data per request")
+    export.add_argument("--workers", type=int, default=4, help="concurrent requests")
+    export.add_argument("--rows-per-file", type=int, default=1_000_000, help="rows per part file")
+    export.set_defaults(func=_export_history)
+
+    simulate = commands.add_parser("simulate", help="serve a fake Zabbix API with a synthetic inventory")
+    simulate.add_argument("--host", default="127.0.0.1", help="listen address")
+    simulate.add_argument("--port", type=int, default=8080)
+    simulate.add_argument("--hosts", type=int, default=1000, help="number of hosts")
+    simulate.add_argument("--items-per-host", type=int, default=100)
+    simulate.add_argument("--seed", type=int, default=0)
+    simulate.add_argument("--item-delay", type=int, default=60, help="seconds between two values of an item")
+    simulate.add_argument("--event-interval", type=int, default=3600, help="seconds between two problems of a host")
+    simulate.add_argument("--latency", type=float, default=0.0, help="seconds added to every call")
+    simulate.add_argument("--jitter", type=float, default=0.0, help="random extra latency, up to this many seconds")
+    simulate.add_argument("--error-rate", type=float, default=0.0, help="probability of a 503 answer")
+    simulate.add_argument("--bandwidth", type=int, help="bytes per second of response bodies")
+    simulate.add_argument("--session-ttl", type=float, help="seconds before user.login sessions expire")
+    simulate.add_argument("--expire-rate", type=float, default=0.0, help="probability of a session expiring on a call")
+    simulate.set_defaults(func=_simulate, url_required=False)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.url and getattr(args, "url_required", True):
+        parser.error("--url or $ZABBIX_URL is required")
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        return args.func(args)
+    finally:
+        logger.removeHandler(handler)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
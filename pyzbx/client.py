@@ -1,55 +1,90 @@
+from pathlib import Path
 from types import TracebackType
 
-import httpx
 from httpx import Client
 
 from . import schemas as sc
-from .exceptions import CredentialMissingError, EmptyResponseError, ZabbixAPIError
+from .balancer import BalancedTransport
+from .budget import MemoryBudget, set_client_budget
+from .exceptions import CredentialMissingError
 from .generics import ZbxBase, ZbxGenericBatch, ZbxGenericCrud, ZbxGenericGet, ZbxGenericUr, rpc
+from .session import SessionManager, TokenCache, default_cache_path
 from .singleton import singleton
 
 
 class ZabbixClient:
     def __init__(
         self,
-        url: str,
+        url: str | list[str],
         username: str | None = None,
         password: str | None = None,
         token: str | None = None,
         timeout: int | None = 5,
         session: Client | None = None,
+        token_cache: str | Path | bool = False,
+        memory_budget: MemoryBudget | int | None = None,
+        health_check_interval: float | None = 10.0,
     ) -> None:
         """
         Initializes a new instance of the ZabbixClient class.
 
         Args:
-            url (str): The URL of the Zabbix server's API endpoint.
+            url (str | list[str]): The URL of the Zabbix server's API endpoint. With a list of URLs of
+                stateless frontends, requests are balanced over them by latency, see ``BalancedTransport``;
+                a list cannot be combined with ``session``, whose transport is already set.
             username (str, optional): The username for authentication. Defaults to None.
             password (str, optional): The password for authentication. Defaults to None.
             token (str, optional): The authentication token. Defaults to None.
             timeout (int, optional): The timeout for API requests. Defaults to 5.
             session (httpx.Client, optional): An existing HTTP session to use. Defaults to None.
+            token_cache (str | Path | bool, optional): With username and password, the file where session
+                tokens are shared between processes, or True for ``~/.cache/pyzbx/sessions.json``; the file is
+                readable by its owner only. False logs in on every construction and out on close. Defaults to
+                False.
+            memory_budget (MemoryBudget | int, optional): A ``MemoryBudget``, or its ``max_bytes``, applied to
+                every call of the client. Defaults to None, no limit.
+            health_check_interval (float, optional): With several URLs, seconds between two background
+                health checks of the frontends, None to not run them. Defaults to 10.
         Returns:
             None
         Raises:
             CredentialMissingError: If username and password are not provided and token is not provided.
+            ValueError: If several URLs are given with ``session``.
 
         """
-        self.url = f"{url}/api_jsonrpc.php" if url[-1] != "/" else f"{url}api_jsonrpc.php"
-        if not token:
-            if username and password:
-                token = self._login(username, password)
-            else:
-                msg = "Username and password are required if token is not provided."
-                raise CredentialMissingError(msg)
-        self.headers = {"Content-Type": "application/json-rpc", "Authorization": f"Bearer {token}"}
+        urls = [url] if isinstance(url, str) else url
+        self.urls = [f"{u}/api_jsonrpc.php" if u[-1] != "/" else f"{u}api_jsonrpc.php" for u in urls]
+        self.url = self.urls[0]
+        if not token and not (username and password):
+            msg = "Username and password are required if token is not provided."
+            raise CredentialMissingError(msg)
+        if session and len(self.urls) > 1:
+            msg = "Several URLs need the balancing transport of a new session, they cannot be used with session."
+            raise ValueError(msg)
+        self.transport = BalancedTransport(self.urls) if len(self.urls) > 1 else None
+        if self.transport is not None and health_check_interval is not None:
+            self.transport.start_health_checks(health_check_interval)
+        self.headers = {"Content-Type": "application/json-rpc"}
         if session:
             session.base_url = self.url
             session.headers = self.headers
             session.timeout = timeout
             self.client = session
         else:
-            self.client = Client(base_url=self.url, headers=self.headers, timeout=timeout)
+            self.client = Client(base_url=self.url, headers=self.headers, timeout=timeout, transport=self.transport)
+        if memory_budget is not None:
+            set_client_budget(self.client, memory_budget)
+        self.auth: SessionManager | None = None
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+            self.client.headers["Authorization"] = self.headers["Authorization"]
+        else:
+            cache = None
+            if token_cache:
+                cache = TokenCache(default_cache_path() if token_cache is True else token_cache)
+            self.auth = SessionManager(self.url, username, password, cache=cache)
+            self.auth.open(self.client)
+            self.client.auth = self.auth
 
     def __enter__(self) -> Client:
         return self.client
@@ -60,35 +95,22 @@ class ZabbixClient:
         exc_value: BaseException | None = None,
         traceback: TracebackType | None = None,
     ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the HTTP session.
+
+        A session opened with username and password is logged out first if its token is not
+        shared with other processes, i.e. with ``token_cache=False``; a cached session stays
+        valid for them.
+        """
         if self.client.is_closed:
             return
+        if self.auth is not None:
+            self.auth.close()
         self.client.close()
 
-    def _login(self, username: str, password: str) -> str:
-        """recommended way is creating a long term token. if not,
-        remember to logout to prevent a large number of open sessions"""
-        r = httpx.post(
-            self.url,
-            headers={"Content-Type": "application/json-rpc"},
-            json={
-                "jsonrpc": "2.0",
-                "method": "user.login",
-                "params": {"user": username, "password": password},
-                "id": 1,
-            },
-        )
-        r.raise_for_status()
-        if not (result := r.json()):
-            msg = "Received empty response from Zabbix server"
-            raise EmptyResponseError(msg)
-        if "error" in result:
-            raise ZabbixAPIError(
-                code=result["error"].get("code"),
-                message=result["error"].get("message"),
-                data=result["error"].get("data"),
-            )
-        return result["result"]
-
     @property
     def action(self) -> "_Action":
         return _Action(self.client, "action")
@@ -419,11 +441,21 @@ class _History(ZbxGenericGet[sc.HistoryGet]):
     def clear(self, data: list[int]) -> int | None:
         ...
 
+    def push(self, data: list[sc.HistoryPushValue]) -> dict:
+        """Sends item values, see ``pyzbx.pusher.HistoryPusher`` for batched high-throughput ingestion."""
+        self.id_ += 1
+        return rpc(self.client, f"{self.object_name}.push", data, self.id_)
+
 
 @singleton
 class _HostGroup(
     ZbxGenericBatch[
-        sc.HostGroupCreate, sc.HostGroupGet, sc.HostGroupUpdate, sc.HostGroupMassAdd, sc.HostGroupMassUpdate
+        sc.HostGroupCreate,
+        sc.HostGroupGet,
+        sc.HostGroupMassAdd,
+        sc.HostGroupMassRemove,
+        sc.HostGroupMassUpdate,
+        sc.HostGroupUpdate,
     ]
 ):
     def propagate(self, data: sc.HostGroupPropagate) -> int | None:
@@ -431,7 +463,16 @@ class _HostGroup(
 
 
 @singleton
-class _Host(ZbxGenericBatch[sc.HostCreate, sc.HostGet, sc.HostUpdate, sc.HostMassAdd, sc.HostMassUpdate]):
+class _Host(
+    ZbxGenericBatch[
+        sc.HostCreate,
+        sc.HostGet,
+        sc.HostMassAdd,
+        sc.HostMassRemove,
+        sc.HostMassUpdate,
+        sc.HostUpdate,
+    ]
+):
     ...
 
 
@@ -440,9 +481,10 @@ class _HostInterface(
     ZbxGenericBatch[
         sc.HostInterfaceCreate,
         sc.HostInterfaceGet,
-        sc.HostInterfaceUpdate,
         sc.HostInterfaceMassAdd,
+        sc.HostInterfaceMassRemove,
         sc.HostInterfaceMassUpdate,
+        sc.HostInterfaceUpdate,
     ]
 ):
     def mass_update(self) -> int | None:
@@ -557,8 +599,10 @@ class _Settings(ZbxGenericUr[sc.SettingsGet, sc.SettingsUpdate]):
 
 @singleton
 class _Sla(ZbxGenericCrud[sc.SlaCreate, sc.SlaGet, sc.SlaUpdate]):
-    def getsli(self) -> None:
-        None
+    def getsli(self, data: sc.SlaGetSli) -> sc.SlaGetSliResult:
+        """SLI of one SLA, see ``pyzbx.sli.get_sli`` for many SLAs and long period ranges."""
+        self.id_ += 1
+        return rpc(self.client, f"{self.object_name}.getsli", data.model_dump(exclude_unset=True), self.id_)
 
 
 @singleton
@@ -579,9 +623,10 @@ class _TemplateGroup(
     ZbxGenericBatch[
         sc.TemplateGroupCreate,
         sc.TemplateGroupGet,
-        sc.TemplateGroupUpdate,
         sc.TemplateGroupMassAdd,
+        sc.TemplateGroupMassRemove,
         sc.TemplateGroupMassUpdate,
+        sc.TemplateGroupUpdate,
     ]
 ):
     ...
@@ -589,7 +634,14 @@ class _TemplateGroup(
 
 @singleton
 class _Template(
-    ZbxGenericBatch[sc.TemplateCreate, sc.TemplateGet, sc.TemplateUpdate, sc.TemplateMassAdd, sc.TemplateMassUpdate]
+    ZbxGenericBatch[
+        sc.TemplateCreate,
+        sc.TemplateGet,
+        sc.TemplateMassAdd,
+        sc.TemplateMassRemove,
+        sc.TemplateMassUpdate,
+        sc.TemplateUpdate,
+    ]
 ):
     ...
 
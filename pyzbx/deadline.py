@@ -0,0 +1,110 @@
+import math
+import threading
+from contextvars import ContextVar, Token
+from time import monotonic
+from typing import Self
+
+from httpx import Timeout
+
+from .exceptions import DeadlineExceededError, OperationCancelledError
+
+_current: ContextVar["Deadline | None"] = ContextVar("pyzbx_deadline", default=None)
+
+
+class Deadline:
+    """A time budget shared by every API call made within it, including those of fan-out threads.
+
+    While a deadline is active, ``rpc`` refuses to start calls once it has expired or has
+    been cancelled, and caps the HTTP timeout of each call to the remaining time. Neither
+    expiry nor ``cancel()`` interrupts a request already sent: it runs until its response
+    arrives or its capped timeout fires. Deadlines nest: an inner deadline never ends after
+    the outer one, and cancelling the outer one cancels it.
+
+    Example:
+        >>> with Deadline(2.0):
+        ...     items = zbx.item.get(ItemGet(hostids=hostids))
+    """
+
+    __slots__ = ["parent", "expires_at", "_cancelled", "_token"]
+
+    def __init__(self, seconds: float | None = None, parent: "Deadline | None" = None) -> None:
+        """
+        Initializes a deadline; it applies to calls made inside ``with``.
+
+        Args:
+            seconds (float, optional): The time budget from now. Defaults to None, only the parent's budget.
+            parent (Deadline, optional): The enclosing deadline. Defaults to the active deadline.
+        """
+        self.parent = parent if parent is not None else _current.get()
+        expires_at = monotonic() + seconds if seconds is not None else math.inf
+        self.expires_at = min(expires_at, self.parent.expires_at) if self.parent is not None else expires_at
+        self._cancelled = threading.Event()
+        self._token: Token | None = None
+
+    def __repr__(self) -> str:
+        return f"<Deadline remaining={self.remaining():.3f}s cancelled={self.cancelled}>"
+
+    def __enter__(self) -> Self:
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        _current.reset(self._token)
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() >= self.expires_at
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or (self.parent is not None and self.parent.cancelled)
+
+    def remaining(self) -> float:
+        """Returns the seconds left, ``math.inf`` without a time limit."""
+        return max(self.expires_at - monotonic(), 0.0)
+
+    def wait_timeout(self) -> float | None:
+        """Returns the remaining time, or None without a time limit, as expected by ``wait``."""
+        return None if math.isinf(self.expires_at) else self.remaining()
+
+    def cancel(self) -> None:
+        """
+        Makes calls not yet started under this deadline fail with ``OperationCancelledError``.
+
+        Requests already sent are not interrupted; they end with their response or their timeout.
+        """
+        self._cancelled.set()
+
+    def check(self, method: str = "") -> None:
+        """
+        Raises if no call may start anymore.
+
+        Raises:
+            OperationCancelledError: If the deadline was cancelled.
+            DeadlineExceededError: If the time budget ran out.
+        """
+        if self.cancelled:
+            msg = f"{method} cancelled" if method else "Operation cancelled"
+            raise OperationCancelledError(msg)
+        if self.expired:
+            msg = f"Deadline exceeded before {method}" if method else "Deadline exceeded"
+            raise DeadlineExceededError(msg)
+
+    def timeout(self, timeout: Timeout | float | None) -> Timeout:
+        """Returns ``timeout`` with every phase capped to the remaining time."""
+        timeout = timeout if isinstance(timeout, Timeout) else Timeout(timeout)
+        remaining = self.remaining()
+        if math.isinf(remaining):
+            return timeout
+
+        def _cap(value: float | None) -> float:
+            return remaining if value is None else min(value, remaining)
+
+        return Timeout(
+            connect=_cap(timeout.connect), read=_cap(timeout.read), write=_cap(timeout.write), pool=_cap(timeout.pool)
+        )
+
+
+def current_deadline() -> Deadline | None:
+    """Returns the deadline active in this context, if any."""
+    return _current.get()
@@ -17,3 +17,26 @@ class ZabbixAPIError(Exception):
 
     def __str__(self) -> str:
         return f"Error: code: {self.code}, message: {self.message}, data: {self.data}"
+
+
+class DeadlineExceededError(TimeoutError):
+    """The time budget of an operation ran out; ``partial`` holds the results gathered until then."""
+
+    def __init__(self, message: str = "Deadline exceeded", partial: Any | None = None) -> None:
+        super().__init__(message)
+        self.partial = partial
+
+
+class OperationCancelledError(Exception):
+    """A call was dropped because a sibling call of the same fan-out failed."""
+
+
+class MemoryBudgetExceededError(Exception):
+    """A result does not fit the memory budget; ``size`` is its estimated or received size in bytes."""
+
+    def __init__(
+        self, message: str = "Memory budget exceeded", size: int | None = None, limit: int | None = None
+    ) -> None:
+        super().__init__(message)
+        self.size = size
+        self.limit = limit
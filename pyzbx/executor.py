@@ -0,0 +1,73 @@
+import contextvars
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, TypeVar
+
+from .deadline import Deadline
+from .exceptions import DeadlineExceededError
+
+_T = TypeVar("_T")
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def run_concurrently(
+    func: Callable[..., _T], calls: Iterable[tuple[Any, ...]], max_workers: int = DEFAULT_MAX_WORKERS
+) -> list[_T]:
+    """
+    Runs ``func`` once per argument tuple on a thread pool.
+
+    ``httpx.Client`` is thread safe, so the calls of a fan-out can share one session. The
+    active ``Deadline`` applies to every call. When a call fails or the deadline expires,
+    the calls not started yet are dropped, and the calls in flight are refused any further
+    request with ``OperationCancelledError``. An HTTP request already sent is not cancelled:
+    it completes in the background, bounded by its timeout, after this function has raised.
+
+    Args:
+        func (Callable[..., _T]): The function to call, usually ``rpc``.
+        calls (Iterable[tuple[Any, ...]]): Positional arguments of each call.
+        max_workers (int, optional): Maximum number of calls in flight. Defaults to 8.
+
+    Returns:
+        list[_T]: The results, in the order of ``calls``.
+
+    Raises:
+        DeadlineExceededError: If the deadline expired; ``partial`` holds the results in the order
+            of ``calls``, None for the calls that did not complete.
+    """
+    calls = list(calls)
+    results: list[Any] = [None] * len(calls)
+    if len(calls) <= 1 or max_workers <= 1:
+        try:
+            for i, args in enumerate(calls):
+                results[i] = func(*args)
+        except DeadlineExceededError as e:
+            e.partial = results
+            raise
+        return results
+    # a child deadline, so that a failure cancels the siblings of this fan-out only
+    scope = Deadline()
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(calls)))
+    try:
+        with scope:
+            futures = {pool.submit(contextvars.copy_context().run, func, *args): i for i, args in enumerate(calls)}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=scope.wait_timeout(), return_when=FIRST_EXCEPTION)
+            if not done:
+                msg = f"Deadline exceeded with {len(pending)} of {len(calls)} calls pending"
+                # raised here so that the handler below cancels the calls in flight
+                raise DeadlineExceededError(msg)  # noqa: TRY301
+            for future in done:
+                results[futures[future]] = future.result()
+    except DeadlineExceededError as e:
+        scope.cancel()
+        e.partial = results
+        raise
+    except BaseException:
+        scope.cancel()
+        raise
+    finally:
+        # do not wait for calls in flight, they are bounded by the deadline and their timeout
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
@@ -0,0 +1,261 @@
+import math
+import time
+from collections.abc import Iterable
+from enum import StrEnum
+from typing import Any, NamedTuple
+
+from httpx import Client
+
+from .exceptions import DeadlineExceededError
+from .executor import DEFAULT_MAX_WORKERS, run_concurrently
+from .generics import PK_LESS_OBJECTS, chunked, get_pk, paginate, rpc, sort_value
+from .logger import logger
+
+ID_FILTERS = ("hostids", "itemids", "groupids", "eventids", "objectids")
+
+# objects without a primary key that can only be split along time
+TIME_SERIES_OBJECTS = PK_LESS_OBJECTS
+TIME_SHARDABLE_OBJECTS = TIME_SERIES_OBJECTS | {"event", "alert", "auditlog", "problem"}
+
+# average size in bytes of one serialized field, including its key and punctuation
+DEFAULT_FIELD_SIZE = 24
+FIELD_SIZES: dict[str, dict[str, int]] = {
+    "item": {
+        "description": 160,
+        "params": 200,
+        "name": 48,
+        "key_": 48,
+        "posts": 120,
+        "headers": 80,
+        "query_fields": 80,
+    },
+    "host": {"description": 120, "name": 40, "host": 40},
+    "trigger": {"description": 80, "expression": 96, "recovery_expression": 96, "comments": 120, "url": 64},
+    "event": {"name": 80, "opdata": 48},
+    "problem": {"name": 80, "opdata": 48},
+    "alert": {"message": 400, "subject": 96, "sendto": 48, "error": 64},
+    "history": {"value": 28},
+    "auditlog": {"details": 400, "resourcename": 48},
+}
+# number of fields returned by output="extend"
+EXTEND_FIELDS: dict[str, int] = {
+    "item": 70,
+    "host": 40,
+    "trigger": 30,
+    "event": 22,
+    "problem": 20,
+    "alert": 18,
+    "history": 4,
+    "trend": 7,
+    "auditlog": 12,
+}
+DEFAULT_EXTEND_FIELDS = 20
+
+
+class Strategy(StrEnum):
+    SINGLE = "single"
+    KEYSET_PAGING = "keyset_paging"
+    TIME_SHARDING = "time_sharding"
+    ID_SHARDING = "id_sharding"
+
+
+class QueryPlan(NamedTuple):
+    object_name: str
+    params: dict[str, Any]
+    count: int
+    estimated_bytes: int
+    strategy: Strategy
+    shards: int
+    reason: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.object_name}.get: {self.count} rows, ~{self.estimated_bytes} bytes, "
+            f"strategy={self.strategy} shards={self.shards} ({self.reason})"
+        )
+
+
+def estimate_bytes(object_name: str, output: Any, count: int) -> int:
+    """
+    Estimates the size of a get response from the per-field size model.
+
+    Args:
+        object_name (str): The API object, e.g. ``"item"``.
+        output (Any): The ``output`` parameter of the request.
+        count (int): The number of rows expected.
+
+    Returns:
+        int: The estimated response size in bytes.
+    """
+    sizes = FIELD_SIZES.get(object_name, {})
+    if isinstance(output, list):
+        row = sum(sizes.get(field, DEFAULT_FIELD_SIZE) for field in output)
+    else:
+        extend = EXTEND_FIELDS.get(object_name, DEFAULT_EXTEND_FIELDS)
+        row = sum(sizes.values()) + (extend - len(sizes)) * DEFAULT_FIELD_SIZE
+    return count * (row + 2)
+
+
+def explain(
+    client: Client,
+    object_name: str,
+    params: dict[str, Any],
+    max_rows: int = 10000,
+    max_bytes: int = 32 * 1024 * 1024,
+) -> QueryPlan:
+    """
+    Runs a ``countOutput`` preflight of a get call and decides how to execute it.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        object_name (str): The API object, e.g. ``"item"``.
+        params (dict[str, Any]): The get parameters.
+        max_rows (int, optional): Largest number of rows fetched by a single call. Defaults to 10000.
+        max_bytes (int, optional): Largest estimated response fetched by a single call. Defaults to 32 MiB.
+
+    Returns:
+        QueryPlan: The row count, size estimate and chosen strategy.
+    """
+    preflight = {
+        key: value
+        for key, value in params.items()
+        if not key.startswith("select") and key not in ("output", "limit", "sortfield", "sortorder", "preservekeys")
+    }
+    count = int(rpc(client, f"{object_name}.get", {**preflight, "countOutput": True}))
+    if params.get("limit"):
+        count = min(count, int(params["limit"]))
+    estimated = estimate_bytes(object_name, params.get("output", "extend"), count)
+    shards = max(math.ceil(count / max_rows), math.ceil(estimated / max_bytes), 1)
+    id_filter = largest_id_filter(params)
+    if shards == 1:
+        plan = (Strategy.SINGLE, 1, "within single call limits")
+    elif object_name in TIME_SHARDABLE_OBJECTS and params.get("time_from") is not None:
+        plan = (Strategy.TIME_SHARDING, shards, "time range can be split")
+    elif params.get("limit") and object_name not in TIME_SERIES_OBJECTS:
+        # every ID shard could return ``limit`` rows, the IDs of the first ``limit`` rows are fetched instead
+        plan = (Strategy.KEYSET_PAGING, shards, "paging the first limit IDs by primary key")
+    elif id_filter and len(params[id_filter]) > 1:
+        plan = (Strategy.ID_SHARDING, min(shards, len(params[id_filter])), f"{id_filter} can be split")
+    elif object_name not in TIME_SERIES_OBJECTS:
+        plan = (Strategy.KEYSET_PAGING, shards, "paging by primary key")
+    else:
+        plan = (Strategy.SINGLE, 1, "no scalable strategy without time_from or multiple IDs")
+    result = QueryPlan(object_name, params, count, estimated, *plan)
+    logger.debug("query plan: %s", result)
+    return result
+
+
+def execute(client: Client, plan: QueryPlan, max_workers: int = DEFAULT_MAX_WORKERS) -> Any:
+    """
+    Executes a get call following ``plan``.
+
+    The rows of the calls are merged with ``merge_results``, sorted and limited again.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        plan (QueryPlan): A plan returned by ``explain``.
+        max_workers (int, optional): Maximum number of shards fetched concurrently. Defaults to 8.
+
+    Returns:
+        Any: The result, as a single get call would return it.
+    """
+    object_name = plan.object_name
+    method = f"{object_name}.get"
+    params = plan.params
+    if plan.strategy == Strategy.SINGLE or params.get("countOutput"):
+        return rpc(client, method, params)
+    parts = part_params(object_name, params)
+    if plan.strategy == Strategy.KEYSET_PAGING:
+        pages = paginate(client, object_name, parts, math.ceil(plan.count / plan.shards))
+        return merge_results(object_name, params, [pages])
+    if plan.strategy == Strategy.ID_SHARDING:
+        id_filter = largest_id_filter(parts)
+        ids = parts[id_filter]
+        shards = [{**parts, id_filter: chunk} for chunk in chunked(ids, math.ceil(len(ids) / plan.shards))]
+    else:
+        shards = [{**parts, "time_from": start, "time_till": end} for start, end in _time_windows(parts, plan.shards)]
+    try:
+        results = run_concurrently(rpc, [(client, method, shard) for shard in shards], max_workers)
+    except DeadlineExceededError as e:
+        e.partial = merge_results(object_name, params, [result for result in e.partial or [] if result])
+        raise
+    return merge_results(object_name, params, results)
+
+
+def largest_id_filter(params: dict[str, Any]) -> str | None:
+    """Returns the longest ID filter of ``params``, e.g. ``"hostids"``, if any."""
+    filters = [key for key in ID_FILTERS if isinstance(params.get(key), list)]
+    return max(filters, key=lambda key: len(params[key]), default=None)
+
+
+def part_params(object_name: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Returns ``params`` for calls fetching parts of a get, with the fields ``merge_results`` uses in ``output``."""
+    if not isinstance(output := params.get("output"), list):
+        return params
+    missing = [field for field in _merge_fields(object_name, params) if field not in output]
+    return {**params, "output": [*output, *missing]} if missing else params
+
+
+def merge_results(object_name: str, params: dict[str, Any], results: Iterable[Any]) -> Any:
+    """
+    Merges the results of calls fetching parts of a get into the result of a single call.
+
+    Objects found by several parts are returned once, then ``sortfield`` and ``sortorder``
+    are applied again over all parts, then ``limit`` and ``preservekeys``. The parts must
+    have been fetched with ``part_params(object_name, params)``; the fields it added to
+    ``output`` are removed again.
+
+    Args:
+        object_name (str): The API object, e.g. ``"item"``.
+        params (dict[str, Any]): The get parameters of the single call.
+        results (Iterable[Any]): The results of the parts, lists or ``preservekeys`` objects.
+
+    Returns:
+        Any: The rows, or the objects by ID with ``preservekeys``.
+    """
+    pk = None if object_name in TIME_SERIES_OBJECTS else get_pk(object_name)
+    seen: set[str] = set()
+    rows = []
+    for result in results:
+        for row in result.values() if isinstance(result, dict) else result:
+            if pk is not None:
+                if (key := str(row[pk])) in seen:
+                    continue
+                seen.add(key)
+            rows.append(row)
+    _sort(rows, params)
+    if limit := params.get("limit"):
+        rows = rows[: int(limit)]
+    keys = [row[pk] for row in rows] if pk is not None else []
+    output = params.get("output")
+    if isinstance(output, list) and (added := [f for f in _merge_fields(object_name, params) if f not in output]):
+        rows = [{key: value for key, value in row.items() if key not in added} for row in rows]
+    if params.get("preservekeys") and pk is not None:
+        return dict(zip(keys, rows, strict=True))
+    return rows
+
+
+def _sort(rows: list[dict[str, Any]], params: dict[str, Any]) -> None:
+    if not (sortfield := params.get("sortfield")):
+        return
+    fields = [sortfield] if isinstance(sortfield, str) else sortfield
+    orders = params.get("sortorder")
+    orders = orders if isinstance(orders, list) else [orders] * len(fields)
+    # stable sorts from the last key to the first, each key in its own order
+    for i in reversed(range(len(fields))):
+        descending = i < len(orders) and orders[i] == "DESC"
+        rows.sort(key=lambda row, field=fields[i]: sort_value(row, field), reverse=descending)
+
+
+def _merge_fields(object_name: str, params: dict[str, Any]) -> list[str]:
+    sortfield = params.get("sortfield") or []
+    fields = [sortfield] if isinstance(sortfield, str) else list(sortfield)
+    return fields if object_name in TIME_SERIES_OBJECTS else [get_pk(object_name), *fields]
+
+
+def _time_windows(params: dict[str, Any], shards: int) -> list[tuple[int, int]]:
+    # time_from and time_till are both inclusive
+    start = int(params["time_from"])
+    end = int(params.get("time_till") or time.time())
+    step = max(math.ceil((end - start + 1) / shards), 1)
+    return [(lower, min(lower + step - 1, end)) for lower in range(start, end + 1, step)]
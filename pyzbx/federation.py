@@ -0,0 +1,248 @@
+import contextvars
+import heapq
+from collections.abc import Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from httpx import USE_CLIENT_DEFAULT
+from pydantic import BaseModel
+
+from .deadline import current_deadline
+from .generics import rpc, sort_value
+from .logger import logger
+
+if TYPE_CHECKING:
+    from .client import ZabbixClient
+
+# fields the get method of each object can sort by on the server
+SORTFIELDS: dict[str, frozenset[str]] = {
+    "alert": frozenset({"alertid", "clock", "eventid", "mediatypeid", "sendto", "status"}),
+    "event": frozenset({"eventid", "objectid", "clock"}),
+    "history": frozenset({"itemid", "clock"}),
+    "host": frozenset({"hostid", "host", "name", "status"}),
+    "hostgroup": frozenset({"groupid", "name"}),
+    "item": frozenset({"itemid", "name", "key_", "delay", "history", "trends", "type", "status"}),
+    "maintenance": frozenset({"maintenanceid", "name", "maintenance_type"}),
+    "problem": frozenset({"eventid"}),
+    "trigger": frozenset({"triggerid", "description", "status", "priority", "lastchange", "hostname"}),
+}
+
+
+class FederatedResult(NamedTuple):
+    rows: list[dict[str, Any]]
+    errors: dict[str, BaseException]
+    # the sum of the counts of the servers that answered, with ``countOutput``
+    count: int | None = None
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.errors)
+
+
+class ZabbixFederation:
+    """Runs get calls on many independent Zabbix servers at once.
+
+    Every row is tagged with the name of the server it came from under ``source_key``. A
+    global query costs the latency of the slowest server (bounded by ``timeout``) instead
+    of the sum of all of them; servers that fail or time out are reported in
+    ``FederatedResult.errors`` while the rows of the others are still returned.
+
+    Example:
+        >>> federation = ZabbixFederation({"eu": eu_client, "us": us_client}, timeout=10)
+        >>> result = federation.problem.get(ProblemGet(recent=True), sort_key="clock", reverse=True)
+    """
+
+    def __init__(
+        self,
+        clients: Mapping[str, "ZabbixClient"],
+        timeout: float | None = None,
+        source_key: str = "zabbix_server",
+    ) -> None:
+        """
+        Initializes a federation of Zabbix servers.
+
+        Args:
+            clients (Mapping[str, ZabbixClient]): The clients, keyed by a server name used to tag results.
+            timeout (float, optional): Default per-server time limit in seconds. Defaults to None.
+            source_key (str, optional): Key added to every row naming its server. Defaults to "zabbix_server".
+        """
+        self.clients = dict(clients)
+        self.timeout = timeout
+        self.source_key = source_key
+
+    def __getattr__(self, object_name: str) -> "_FederatedNamespace":
+        if object_name.startswith("_"):
+            raise AttributeError(object_name)
+        return _FederatedNamespace(self, object_name)
+
+    def get(
+        self,
+        object_name: str,
+        params: BaseModel | dict[str, Any],
+        sort_key: str | None = None,
+        reverse: bool = False,
+        timeout: float | None = None,
+        allow_partial: bool = True,
+    ) -> FederatedResult:
+        """
+        Runs ``<object_name>.get`` on every server concurrently and merges the results.
+
+        The merge starts once every server has answered, failed or timed out: the rows of each
+        server are sorted by ``sort_key`` and then merged with ``heapq.merge``, so the call takes
+        as long as the slowest server and holds every row. Use ``iter_get`` to consume rows as each
+        server answers. With ``countOutput``, the counts of the servers are summed into
+        ``FederatedResult.count``. ``preservekeys`` is not supported, since IDs of independent
+        servers collide.
+
+        Args:
+            object_name (str): The API object, e.g. ``"problem"``.
+            params (BaseModel | dict[str, Any]): The get request sent to every server.
+            sort_key (str, optional): Merge the results ordered by this field. It is sent as ``sortfield``
+                if the object can sort by it (see ``SORTFIELDS``); otherwise every server returns all its
+                rows, without ``limit``, and they are sorted locally. Defaults to None.
+            reverse (bool, optional): Merge in descending order. Defaults to False.
+            timeout (float, optional): Per-server time limit, overriding the federation default. Defaults to None.
+            allow_partial (bool, optional): Return the rows of the servers that answered when others fail.
+                Defaults to True.
+
+        Returns:
+            FederatedResult: The merged rows, at most ``limit`` of them, and the errors of the servers
+                that did not answer.
+
+        Raises:
+            ValueError: With ``preservekeys``.
+            Exception: The first server error, if ``allow_partial`` is False.
+        """
+        params = _params(params)
+        streams: dict[str, Any] = {}
+        errors: dict[str, BaseException] = {}
+        for name, rows, error in self._fan_out(object_name, params, sort_key, reverse, timeout):
+            if error is not None:
+                if not allow_partial:
+                    raise error
+                errors[name] = error
+            else:
+                streams[name] = rows
+        if params.get("countOutput"):
+            return FederatedResult([], errors, sum(int(count) for count in streams.values()))
+        if sort_key is None:
+            merged = [row for rows in streams.values() for row in rows]
+        else:
+            merged = list(heapq.merge(*streams.values(), key=lambda row: sort_value(row, sort_key), reverse=reverse))
+        if limit := params.get("limit"):
+            merged = merged[: int(limit)]
+        return FederatedResult(merged, errors)
+
+    def iter_get(
+        self,
+        object_name: str,
+        params: BaseModel | dict[str, Any],
+        timeout: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yields the rows of every server as soon as that server answers.
+
+        Servers that fail or time out are logged and skipped.
+
+        Raises:
+            ValueError: With ``countOutput`` or ``preservekeys``, whose results are not rows.
+        """
+        params = _params(params)
+        if params.get("countOutput"):
+            msg = "iter_get yields rows, use get to sum countOutput over the servers"
+            raise ValueError(msg)
+        for name, rows, error in self._fan_out(object_name, params, None, False, timeout):
+            if error is not None:
+                logger.warning("federated %s.get failed on %s: %s", object_name, name, error)
+                continue
+            yield from rows
+
+    def _fan_out(
+        self,
+        object_name: str,
+        params: dict[str, Any],
+        sort_key: str | None,
+        reverse: bool,
+        timeout: float | None,
+    ) -> Iterator[tuple[str, Any, BaseException | None]]:
+        if sort_key in SORTFIELDS.get(object_name, ()):
+            params = {**params, "sortfield": sort_key, "sortorder": "DESC" if reverse else "ASC"}
+        elif sort_key is not None:
+            # the first ``limit`` rows of a server in its own order need not be its first ones by ``sort_key``
+            params = {key: value for key, value in params.items() if key != "limit"}
+        timeout = timeout if timeout is not None else self.timeout
+        if (deadline := current_deadline()) is not None and (budget := deadline.wait_timeout()) is not None:
+            timeout = budget if timeout is None else min(timeout, budget)
+        pool = ThreadPoolExecutor(max_workers=max(len(self.clients), 1), thread_name_prefix="pyzbx-federation")
+        args = (object_name, params, sort_key, reverse, timeout)
+        # each server call runs in a copy of the caller's context, so that it sees the active deadline
+        futures: dict[Future, str] = {
+            pool.submit(contextvars.copy_context().run, self._get_one, name, client, *args): name
+            for name, client in self.clients.items()
+        }
+        deadline = None if timeout is None else monotonic() + timeout
+        try:
+            pending = set(futures)
+            while pending:
+                remaining = None if deadline is None else max(deadline - monotonic(), 0)
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    for future in pending:
+                        yield futures[future], [], FutureTimeoutError(f"no answer within {timeout}s")
+                    return
+                for future in done:
+                    try:
+                        yield futures[future], future.result(), None
+                    except Exception as e:  # noqa: BLE001
+                        yield futures[future], [], e
+        finally:
+            # do not wait for servers that are still answering after the time limit
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_one(
+        self,
+        name: str,
+        client: "ZabbixClient",
+        object_name: str,
+        params: dict[str, Any],
+        sort_key: str | None,
+        reverse: bool,
+        timeout: float | None,
+    ) -> Any:
+        # without a time limit, the timeout configured on the client applies
+        limit = USE_CLIENT_DEFAULT if timeout is None else timeout
+        rows = rpc(client.client, f"{object_name}.get", params, timeout=limit)
+        if params.get("countOutput"):
+            return rows
+        for row in rows:
+            row[self.source_key] = name
+        if sort_key is not None:
+            # the server sorts strings lexically, or not by ``sort_key`` at all; heapq.merge needs numeric
+            # order for IDs and clocks
+            rows.sort(key=lambda row: sort_value(row, sort_key), reverse=reverse)
+        return rows
+
+
+def _params(params: BaseModel | dict[str, Any]) -> dict[str, Any]:
+    if isinstance(params, BaseModel):
+        params = params.model_dump(exclude_unset=True, by_alias=True)
+    if params.get("preservekeys"):
+        msg = "preservekeys cannot merge the results of several servers, whose IDs collide"
+        raise ValueError(msg)
+    return params
+
+
+class _FederatedNamespace:
+    __slots__ = ["federation", "object_name"]
+
+    def __init__(self, federation: ZabbixFederation, object_name: str) -> None:
+        self.federation = federation
+        self.object_name = object_name
+
+    def get(self, data: BaseModel | dict[str, Any], **kwargs: Any) -> FederatedResult:
+        return self.federation.get(self.object_name, data, **kwargs)
+
+    def iter_get(self, data: BaseModel | dict[str, Any], **kwargs: Any) -> Iterator[dict[str, Any]]:
+        return self.federation.iter_get(self.object_name, data, **kwargs)
@@ -1,9 +1,17 @@
-from typing import Any, Generic, TypedDict, TypeVar
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Generic, TypedDict, TypeVar
 
-from httpx import Client
+from httpx import USE_CLIENT_DEFAULT, Client, Response, TimeoutException
+from httpx._client import UseClientDefault
 from pydantic import BaseModel
 
-from .exceptions import EmptyResponseError, ZabbixAPIError
+from .budget import current_budget
+from .deadline import current_deadline
+from .exceptions import DeadlineExceededError, EmptyResponseError, ZabbixAPIError
+
+if TYPE_CHECKING:
+    from .explain import QueryPlan
+    from .prepared import PreparedQuery
 
 _CreateT = TypeVar("_CreateT", bound=BaseModel)
 _GetT = TypeVar("_GetT", bound=BaseModel)
@@ -12,8 +20,13 @@ _MassRemoveT = TypeVar("_MassRemoveT", bound=BaseModel)
 _MassUpdateT = TypeVar("_MassUpdateT", bound=BaseModel)
 _UpdateT = TypeVar("_UpdateT", bound=BaseModel)
 
+_T = TypeVar("_T")
+
 _ParamsT = TypeVar("_ParamsT", str, dict[str, Any], list[int], int)
 
+# objects returned without a primary key, e.g. history values
+PK_LESS_OBJECTS = frozenset({"history", "trend"})
+
 
 class ZbxCreateResponse(TypedDict):
     jsonrpc: str
@@ -22,7 +35,7 @@ class ZbxCreateResponse(TypedDict):
 
 
 class ZbxBase:
-    __slots__ = ["client", "object_name", "id_"]
+    __slots__ = ["client", "object_name", "id_", "__weakref__"]
 
     def __init__(self, client: Client, object_name: str, id_: int = 1) -> None:
         self.client = client
@@ -30,14 +43,89 @@ class ZbxBase:
         self.id_ = id_
 
 
-class ZbxGenericBatch(ZbxBase, Generic[_CreateT, _GetT, _MassAddT, _MassRemoveT, _MassUpdateT, _UpdateT]):
-    def create(self, data: _CreateT) -> int | None:
+class ZbxGenericGet(ZbxBase, Generic[_GetT]):
+    def get(self, data: _GetT) -> int | None:
+        """
+        Runs ``<object>.get``.
+
+        An ID filter (``hostids``, ``itemids``, ...) longer than the current shard size is
+        split into shards fetched concurrently and merged, see ``sharding.sharded_get``. Under a
+        ``MemoryBudget``, the result size is estimated first: a result over the budget fails
+        before it is fetched, and one over a single response is fetched in several calls.
+        """
+        from .explain import execute
+        from .sharding import shard_filter, sharded_get
+
         self.id_ += 1
-        return rpc(self.client, f"{self.object_name}.create", data.model_dump(exclude_unset=True), self.id_)
+        params = data.model_dump(exclude_unset=True, by_alias=True)
+        if (budget := current_budget(self.client)) is not None and (
+            plan := budget.plan(self.client, self.object_name, params)
+        ):
+            return execute(self.client, plan)
+        if id_filter := shard_filter(self.object_name, params):
+            return sharded_get(self.client, self.object_name, params, id_filter)
+        return rpc(self.client, f"{self.object_name}.get", params, self.id_)
 
-    def get(self, data: _GetT) -> int | None:
+    def iterate(self, data: _GetT, page_size: int = 1000) -> Iterator[dict[str, Any]]:
+        """
+        Iterates over all objects matching ``data`` one page at a time.
+
+        The matching IDs are fetched first, then the objects themselves in pages of
+        ``page_size`` IDs. Unlike ``get``, no implicit ``output="extend"`` is applied: unless
+        ``output`` is set explicitly on ``data`` only the primary key of each object is returned.
+
+        Args:
+            data (_GetT): The get request.
+            page_size (int, optional): Number of objects requested per call. Defaults to 1000.
+
+        Returns:
+            Iterator[dict[str, Any]]: The objects, page by page in ascending primary key order.
+        """
+        return paginate(self.client, self.object_name, data.model_dump(exclude_unset=True, by_alias=True), page_size)
+
+    def explain(self, data: _GetT, max_rows: int = 10000, max_bytes: int = 32 * 1024 * 1024) -> "QueryPlan":
+        """
+        Estimates the cost of ``get(data)`` with a ``countOutput`` preflight and picks an execution strategy.
+
+        Args:
+            data (_GetT): The get request.
+            max_rows (int, optional): Largest number of rows fetched by a single call. Defaults to 10000.
+            max_bytes (int, optional): Largest estimated response fetched by a single call. Defaults to 32 MiB.
+
+        Returns:
+            QueryPlan: The row count, size estimate and chosen strategy, printable for logging.
+        """
+        from .explain import explain
+
+        params = data.model_dump(exclude_unset=True, by_alias=True)
+        return explain(self.client, self.object_name, params, max_rows, max_bytes)
+
+    def planned_get(self, data: _GetT, max_rows: int = 10000, max_bytes: int = 32 * 1024 * 1024) -> list[Any]:
+        """Like ``get``, but large queries are routed onto the strategy chosen by ``explain``."""
+        from .explain import execute
+
+        return execute(self.client, self.explain(data, max_rows, max_bytes))
+
+    def prepare(self, data: _GetT, *variables: str) -> "PreparedQuery":
+        """
+        Encodes ``data`` once for repeated calls where only ``variables`` change.
+
+        Args:
+            data (_GetT): The constant part of the get request.
+            *variables (str): API names of the parameters given on each call, e.g. ``"time_from"``.
+
+        Returns:
+            PreparedQuery: Callable with the variables as keyword arguments, returning the get result.
+        """
+        from .prepared import PreparedQuery
+
+        return PreparedQuery(self.client, f"{self.object_name}.get", data, variables)
+
+
+class ZbxGenericBatch(ZbxGenericGet[_GetT], Generic[_CreateT, _GetT, _MassAddT, _MassRemoveT, _MassUpdateT, _UpdateT]):
+    def create(self, data: _CreateT) -> int | None:
         self.id_ += 1
-        return rpc(self.client, f"{self.object_name}.get", data.model_dump(exclude_unset=True), self.id_)
+        return rpc(self.client, f"{self.object_name}.create", data.model_dump(exclude_unset=True), self.id_)
 
     def massadd(self, data: _MassAddT) -> int | None:
         self.id_ += 1
@@ -61,15 +149,11 @@ class ZbxGenericBatch(ZbxBase, Generic[_CreateT, _GetT, _MassAddT, _MassRemoveT,
         return rpc(self.client, f"{self.object_name}.delete", data, self.id_)
 
 
-class ZbxGenericCrud(ZbxBase, Generic[_CreateT, _GetT, _UpdateT]):
+class ZbxGenericCrud(ZbxGenericGet[_GetT], Generic[_CreateT, _GetT, _UpdateT]):
     def create(self, data: _CreateT) -> int | None:
         self.id_ += 1
         return rpc(self.client, f"{self.object_name}.create", data.model_dump(exclude_unset=True), self.id_)
 
-    def get(self, data: _GetT) -> int | None:
-        self.id_ += 1
-        return rpc(self.client, f"{self.object_name}.get", data.model_dump(exclude_unset=True), self.id_)
-
     def update(self, data: _UpdateT) -> int | None:
         self.id_ += 1
         return rpc(self.client, f"{self.object_name}.update", data.model_dump(exclude_unset=True), self.id_)
@@ -80,25 +164,109 @@ class ZbxGenericCrud(ZbxBase, Generic[_CreateT, _GetT, _UpdateT]):
         return rpc(self.client, f"{self.object_name}.delete", data, self.id_)
 
 
-class ZbxGenericGet(ZbxBase, Generic[_GetT]):
-    def get(self, data: _GetT) -> int | None:
-        self.id_ += 1
-        return rpc(self.client, f"{self.object_name}.get", data.model_dump(exclude_unset=True), self.id_)
-
-
 class ZbxGenericUr(ZbxBase, Generic[_GetT, _UpdateT]):
     def get(self, data: _GetT) -> int | None:
         self.id_ += 1
-        return rpc(self.client, f"{self.object_name}.get", data.model_dump(exclude_unset=True), self.id_)
+        params = data.model_dump(exclude_unset=True, by_alias=True)
+        return rpc(self.client, f"{self.object_name}.get", params, self.id_)
 
     def update(self, data: _UpdateT) -> int | None:
         self.id_ += 1
         return rpc(self.client, f"{self.object_name}.update", data.model_dump(exclude_unset=True), self.id_)
 
 
-def rpc(client: Client, method: str, params: _ParamsT, id_: int | None = 1) -> Any:
+def rpc(
+    client: Client,
+    method: str,
+    params: _ParamsT,
+    id_: int | None = 1,
+    timeout: float | None | UseClientDefault = USE_CLIENT_DEFAULT,
+) -> Any:
     payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": id_}
-    r = client.post(json=payload)
+    return _call(client, method, timeout, json=payload)
+
+
+def _call(client: Client, method: str, timeout: float | None | UseClientDefault, **request: Any) -> Any:
+    """
+    Sends a JSON-RPC request under the active deadline and memory budget and returns its result.
+
+    ``request`` holds the body arguments of ``httpx.Client.post``: ``json``, or ``content`` and ``headers``.
+    """
+    deadline = current_deadline()
+    budget = current_budget(client)
+    if deadline is None and budget is None:
+        return _parse_response(post(client, timeout=timeout, **request))
+    if deadline is not None:
+        deadline.check(method)
+        timeout = deadline.timeout(client.timeout if isinstance(timeout, UseClientDefault) else timeout)
+    try:
+        if budget is None:
+            r = post(client, timeout=timeout, **request)
+        else:
+            r = budget.post(client, api_url(client), method, timeout, **request)
+    except TimeoutException as e:
+        if deadline is not None and deadline.expired:
+            msg = f"Deadline exceeded during {method}"
+            raise DeadlineExceededError(msg) from e
+        raise
+    return _parse_response(r)
+
+
+def post(client: Client, **kwargs: Any) -> Response:
+    """
+    Sends a request to the API endpoint of ``client`` and reads its response.
+
+    With a ``SessionManager`` as ``auth``, a request failing because its session expired
+    is sent again once with a renewed token.
+
+    Args:
+        client (httpx.Client): The HTTP session.
+        **kwargs: Arguments of ``httpx.Client.post``, such as ``json`` and ``timeout``.
+
+    Returns:
+        httpx.Response: The response.
+    """
+    from .session import SessionManager, is_expired_response
+
+    r = client.post(api_url(client), **kwargs)
+    if isinstance(client.auth, SessionManager) and is_expired_response(r):
+        client.auth.renew(r.request.headers["Authorization"].removeprefix("Bearer "))
+        r = client.post(api_url(client), **kwargs)
+    return r
+
+
+def api_url(client: Client) -> str:
+    """Returns the API endpoint of ``client``; httpx would append a trailing slash to a relative empty path."""
+    return str(client.base_url).rstrip("/")
+
+
+def paginate(
+    client: Client, object_name: str, params: dict[str, Any], page_size: int = 1000
+) -> Iterator[dict[str, Any]]:
+    """
+    Fetches the IDs matching ``params``, then the objects in pages of ``page_size`` IDs. See ``iterate``.
+
+    Objects are yielded one by one, ``preservekeys`` is ignored.
+
+    Raises:
+        ValueError: If ``object_name`` objects have no primary key, e.g. history values.
+    """
+    if object_name in PK_LESS_OBJECTS:
+        msg = f"{object_name} objects have no primary key to page by"
+        raise ValueError(msg)
+    pk = get_pk(object_name)
+    method = f"{object_name}.get"
+    id_params = {key: value for key, value in params.items() if not key.startswith("select") and key != "preservekeys"}
+    ids = sorted(int(row[pk]) for row in rpc(client, method, {**id_params, "output": [pk]}))
+    page_params = {
+        key: value for key, value in params.items() if key not in ("limit", "sortfield", "sortorder", "preservekeys")
+    }
+    page_params["output"] = params.get("output") or [pk]
+    for page in chunked(ids, page_size):
+        yield from rpc(client, method, {**page_params, f"{pk}s": page})
+
+
+def _parse_response(r: Response) -> Any:
     r.raise_for_status()
     if not (result := r.json()):
         msg = "Received empty response from Zabbix server"
@@ -118,6 +286,41 @@ def _id_to_list(id_: int | list[int]) -> list[int]:
     return id_
 
 
+def chunked(ids: Sequence[_T], size: int) -> Iterator[list[_T]]:
+    """Yield successive lists of at most ``size`` elements from ``ids``."""
+    for i in range(0, len(ids), size):
+        yield list(ids[i : i + size])
+
+
+def sort_value(row: dict[str, Any], key: str) -> tuple[int, int | str]:
+    """Sort key of ``row[key]`` ordering numeric strings such as IDs and clocks by value."""
+    value = row.get(key)
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        return (0, int(value))
+    return (1, str(value))
+
+
+def get_pk(object_name: str) -> str:
+    """Returns the name of the primary key field of ``object_name`` objects."""
+    pk_name_mappings = {
+        "itemprototype": "itemid",
+        "discoveryrule": "itemid",
+        "triggerprototype": "triggerid",
+        "graphprototype": "graphid",
+        "hostprototype": "hostid",
+        "hostgroup": "groupid",
+        "templategroup": "groupid",
+        "usergroup": "usrgrpid",
+        "templatedashboard": "dashboardid",
+        "map": "sysmapid",
+        "hanode": "ha_nodeid",
+        "webscenario": "httptestid",
+        "usermacro": "hostmacroid",
+        "problem": "eventid",
+    }
+    return pk_name_mappings.get(object_name, f"{object_name}id")
+
+
 def get_id(response: ZbxCreateResponse, object_name: str) -> int:
     id_name_mappings = {
         "itemprototype": "itemids",
@@ -0,0 +1,203 @@
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from httpx import Client
+from pydantic import BaseModel
+
+from .executor import DEFAULT_MAX_WORKERS, run_concurrently
+from .generics import chunked, rpc
+
+
+class Hop(NamedTuple):
+    """An intermediate lookup mapping IDs of one object type to IDs of another.
+
+    Only the objects whose fields equal every ``(field, value)`` of ``where`` are mapped.
+    """
+
+    method: str
+    ids_param: str
+    pk: str
+    field: str
+    select: str | None = None
+    target: str | None = None
+    where: tuple[tuple[str, str], ...] = ()
+
+
+class Relation(NamedTuple):
+    """How to resolve a ``select*`` parameter on the client instead of the server.
+
+    Only the rows whose fields equal every ``(field, value)`` of ``where`` are joined, the
+    others get no related objects.
+    """
+
+    local_key: str
+    method: str
+    ids_param: str
+    pk: str
+    hops: tuple[Hop, ...] = ()
+    many: bool = True
+    where: tuple[tuple[str, str], ...] = ()
+
+
+# the objectid of an event is a trigger only for trigger events, source 0 and object 0; the
+# item and LLD rule of internal events (source 3, object 4 or 5) are not resolved
+_TRIGGER_EVENT = (("source", "0"), ("object", "0"))
+_EVENT_TO_TRIGGER = Hop("event.get", "eventids", "eventid", "objectid", where=_TRIGGER_EVENT)
+_TRIGGER_TO_HOSTS = Hop("trigger.get", "triggerids", "triggerid", "hosts", select="selectHosts", target="hostid")
+
+RELATIONS: dict[str, dict[str, Relation]] = {
+    "alert": {
+        "selectHosts": Relation("eventid", "host.get", "hostids", "hostid", (_EVENT_TO_TRIGGER, _TRIGGER_TO_HOSTS)),
+        "selectUsers": Relation("userid", "user.get", "userids", "userid"),
+        "selectMediatypes": Relation("mediatypeid", "mediatype.get", "mediatypeids", "mediatypeid"),
+    },
+    "event": {
+        "selectHosts": Relation(
+            "objectid", "host.get", "hostids", "hostid", (_TRIGGER_TO_HOSTS,), where=_TRIGGER_EVENT
+        ),
+        "selectRelatedObject": Relation(
+            "objectid", "trigger.get", "triggerids", "triggerid", many=False, where=_TRIGGER_EVENT
+        ),
+    },
+    # problem.get has no host sub-select on the server, it is resolved the same way as for events
+    "problem": {
+        "selectHosts": Relation(
+            "objectid", "host.get", "hostids", "hostid", (_TRIGGER_TO_HOSTS,), where=_TRIGGER_EVENT
+        ),
+    },
+    "item": {
+        "selectHosts": Relation("hostid", "host.get", "hostids", "hostid"),
+        "selectInterfaces": Relation("interfaceid", "hostinterface.get", "interfaceids", "interfaceid"),
+    },
+}
+
+
+# primary keys differing from "<object>id", to re-key the rows for preservekeys
+_PRIMARY_KEYS = {"problem": "eventid"}
+
+
+def _matches(row: dict[str, Any], where: tuple[tuple[str, str], ...]) -> bool:
+    return all(str(row.get(field)) == value for field, value in where)
+
+
+def _result_key(select: str) -> str:
+    name = select.removeprefix("select")
+    return name[0].lower() + name[1:]
+
+
+class JoinPlanner:
+    """Replaces expensive nested ``select*`` sub-queries with client-side hash joins.
+
+    The primary get runs without the nested selects. The foreign IDs of its rows are then
+    deduplicated and the related objects fetched in chunked bulk gets, concurrently, and
+    attached to each row under the same key the server would have used (``selectHosts``
+    fills ``hosts`` and so on), so results have the same shape as the nested-select form.
+    A ``"count"`` output attaches the number of related objects instead.
+
+    Event and problem relations are resolved for trigger events only: requesting them with
+    a ``source`` or ``object`` other than 0 raises ``ValueError``, use the nested select for
+    internal and discovery events.
+    """
+
+    def __init__(self, client: Client, chunk_size: int = 1000, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    def get(self, object_name: str, params: BaseModel | dict[str, Any]) -> Any:
+        """
+        Runs ``<object_name>.get`` with its supported ``select*`` parameters resolved on the client.
+
+        Args:
+            object_name (str): The API object, e.g. ``"alert"``.
+            params (BaseModel | dict[str, Any]): The get request, as passed to the nested-select form.
+
+        Returns:
+            list[dict[str, Any]] | dict[str, dict[str, Any]] | str: The rows, each with the requested
+                related objects attached; rows keyed by ID with ``preservekeys``, the count with ``countOutput``.
+
+        Raises:
+            ValueError: If a trigger-only relation is requested for other events.
+        """
+        relations = RELATIONS.get(object_name, {})
+        params = params.model_dump(exclude_unset=True, by_alias=True) if isinstance(params, BaseModel) else dict(params)
+        joins = {select: (relations[select], params.pop(select)) for select in list(params) if select in relations}
+        if not joins or params.get("countOutput"):
+            # the server ignores sub-selects when counting
+            return rpc(self.client, f"{object_name}.get", params)
+        for select, (relation, _) in joins.items():
+            if any(field in params and str(params[field]) != value for field, value in relation.where):
+                wanted = ", ".join(f"{field} {value}" for field, value in relation.where)
+                msg = f"{object_name}.get {select} is joined for {wanted} only, use the nested select for other objects"
+                raise ValueError(msg)
+        pk = _PRIMARY_KEYS.get(object_name, f"{object_name}id")
+        preserve = bool(params.pop("preservekeys", False))
+        output = params.get("output", "extend")
+        added: set[str] = set()
+        if isinstance(output, list):
+            needed = {field for relation, _ in joins.values() for field, _ in relation.where}
+            needed.update(relation.local_key for relation, _ in joins.values())
+            if preserve:
+                needed.add(pk)
+            added = needed - set(output)
+            params["output"] = [*output, *sorted(added)]
+        rows = rpc(self.client, f"{object_name}.get", params)
+        for select, (relation, sub_output) in joins.items():
+            self._join(rows, _result_key(select), relation, sub_output)
+        keys = [row[pk] for row in rows] if preserve else []
+        for row in rows:
+            for key in added:
+                row.pop(key, None)
+        return dict(zip(keys, rows, strict=True)) if preserve else rows
+
+    def _join(self, rows: list[dict[str, Any]], key: str, relation: Relation, sub_output: Any) -> None:
+        joined = [row for row in rows if _matches(row, relation.where)]
+        # local id -> ids of the related objects, walked through every hop
+        links: dict[str, list[str]] = {
+            row[relation.local_key]: [row[relation.local_key]] for row in joined if row.get(relation.local_key)
+        }
+        for hop in relation.hops:
+            mapping = self._hop(hop, {i for ids in links.values() for i in ids})
+            links = {local: [j for i in ids for j in mapping.get(i, ())] for local, ids in links.items()}
+        count = sub_output == "count"
+        objects = self._fetch(relation, {i for ids in links.values() for i in ids}, [] if count else sub_output)
+        for row in rows:
+            ids = links.get(row.get(relation.local_key), ()) if _matches(row, relation.where) else ()
+            related = [objects[i] for i in dict.fromkeys(ids) if i in objects]
+            if count:
+                row[key] = str(len(related))
+            else:
+                row[key] = related if relation.many else (related[0] if related else [])
+
+    def _hop(self, hop: Hop, ids: set[str]) -> dict[str, list[str]]:
+        fields = [field for field, _ in hop.where]
+        if hop.select:
+            params: dict[str, Any] = {"output": [hop.pk, *fields], hop.select: [hop.target]}
+        else:
+            params = {"output": [hop.pk, hop.field, *fields]}
+        mapping: dict[str, list[str]] = {}
+        for row in self._bulk_get(hop.method, hop.ids_param, ids, params):
+            if not _matches(row, hop.where):
+                continue
+            value = row[hop.field]
+            mapping[row[hop.pk]] = [obj[hop.target] for obj in value] if hop.select else [value]
+        return mapping
+
+    def _fetch(self, relation: Relation, ids: set[str], sub_output: Any) -> dict[str, dict[str, Any]]:
+        output = sub_output
+        if isinstance(output, list) and relation.pk not in output:
+            output = [*output, relation.pk]
+        objects = {
+            row[relation.pk]: row
+            for row in self._bulk_get(relation.method, relation.ids_param, ids, {"output": output})
+        }
+        if output is not sub_output:
+            for obj in objects.values():
+                obj.pop(relation.pk, None)
+        return objects
+
+    def _bulk_get(
+        self, method: str, ids_param: str, ids: Iterable[str], params: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        calls = [(self.client, method, {**params, ids_param: chunk}) for chunk in chunked(sorted(ids), self.chunk_size)]
+        return [row for result in run_concurrently(rpc, calls, self.max_workers) for row in result]
@@ -0,0 +1,4 @@
+import logging
+
+logger = logging.getLogger("pyzbx")
+logger.addHandler(logging.NullHandler())
@@ -0,0 +1,314 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta, tzinfo
+from typing import Any, NamedTuple
+
+from httpx import Client
+
+from .generics import chunked, rpc
+
+ONE_TIME = 0
+DAILY = 2
+WEEKLY = 3
+MONTHLY = 4
+# ``every`` of a monthly period selecting the last week of the month
+_LAST_WEEK = 5
+# operators of maintenance tags and their evaluation types
+TAG_OPERATOR_EQUALS = 0
+TAG_OPERATOR_CONTAINS = 2
+TAG_EVALTYPE_AND_OR = 0
+TAG_EVALTYPE_OR = 2
+
+_MAINTENANCE_PARAMS: dict[str, Any] = {
+    "output": ["maintenanceid", "name", "maintenance_type", "active_since", "active_till", "tags_evaltype"],
+    "selectHosts": ["hostid"],
+    "selectHostGroups": ["groupid"],
+    "selectTimeperiods": "extend",
+    "selectTags": "extend",
+}
+
+
+class Window(NamedTuple):
+    """A maintenance window of a host; a window with ``tags`` only covers the problems matching them."""
+
+    maintenanceid: int
+    start: int
+    end: int
+    maintenance_type: int
+    # ``(tag, operator, value)`` conditions
+    tags: tuple[tuple[str, int, str], ...] = ()
+    tags_evaltype: int = TAG_EVALTYPE_AND_OR
+
+    def covers(self, problem_tags: Iterable[dict[str, Any]] | None = None) -> bool:
+        """
+        Returns whether the window covers a problem with ``problem_tags``.
+
+        Conditions on the same tag name are alternatives; conditions on different names must
+        all hold, or any of them with ``TAG_EVALTYPE_OR``. Without ``problem_tags``, only a
+        window without tags, covering the whole host, covers the problem.
+        """
+        if not self.tags:
+            return True
+        if problem_tags is None:
+            return False
+        pairs = [(tag["tag"], str(tag.get("value", ""))) for tag in problem_tags]
+        by_name: dict[str, bool] = {}
+        for name, operator, value in self.tags:
+            matched = any(
+                tag == name and (v == value if operator == TAG_OPERATOR_EQUALS else value in v) for tag, v in pairs
+            )
+            by_name[name] = by_name.get(name, False) or matched
+        return any(by_name.values()) if self.tags_evaltype == TAG_EVALTYPE_OR else all(by_name.values())
+
+
+class _HostWindows(NamedTuple):
+    """Windows of one host sorted by start; ``max_ends[i]`` is the latest end of windows ``0..i``."""
+
+    starts: array
+    ends: array
+    max_ends: array
+    maintenanceids: array
+
+    @classmethod
+    def build(cls, windows: list[tuple[int, int, int]]) -> "_HostWindows":
+        windows.sort()
+        starts, ends, max_ends, ids = array("q"), array("q"), array("q"), array("q")
+        latest = 0
+        for start, end, maintenanceid in windows:
+            latest = max(latest, end)
+            starts.append(start)
+            ends.append(end)
+            max_ends.append(latest)
+            ids.append(maintenanceid)
+        return cls(starts, ends, max_ends, ids)
+
+    def overlapping(self, start: int, end: int) -> Iterator[int]:
+        """Yields the positions of the windows overlapping ``[start, end)``, latest start first."""
+        i = bisect_left(self.starts, end) - 1
+        # windows are sorted by start only, max_ends tells when no earlier window can reach ``start``
+        while i >= 0 and self.max_ends[i] > start:
+            if self.ends[i] > start:
+                yield i
+            i -= 1
+
+
+class MaintenanceIndex:
+    """Maintenance windows of every host, for fast "is this host in maintenance" checks.
+
+    ``refresh()`` loads all maintenances in one ``maintenance.get`` call, resolves their
+    host groups to hosts and expands their one-time, daily, weekly and monthly time
+    periods into concrete windows from ``past`` seconds ago to ``future`` seconds ahead.
+    Each host's windows are kept in sorted arrays, so point and range queries are binary
+    searches. Queries refresh the index first once it is older than ``refresh_interval``.
+
+    Time periods are evaluated in ``tz``, which must be the time zone of the Zabbix server.
+
+    A maintenance limited by tags only suppresses the problems matching them: it puts a
+    host in maintenance only for queries given matching ``problem_tags``, and its windows
+    carry the tags.
+
+    Example:
+        >>> index = MaintenanceIndex(zbx.client, tz=ZoneInfo("Europe/Paris"))
+        >>> index.in_maintenance(10084)
+        True
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        tz: tzinfo | None = None,
+        refresh_interval: float = 60.0,
+        past: int = 86400,
+        future: int = 35 * 86400,
+        chunk_size: int = 1000,
+    ) -> None:
+        """
+        Initializes an empty index; it is loaded on the first query.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            tz (tzinfo, optional): Time zone of the Zabbix server. Defaults to the local time zone.
+            refresh_interval (float, optional): Seconds after which a query reloads the index. Defaults to 60.
+            past (int, optional): Seconds before the refresh covered by the windows. Defaults to 1 day.
+            future (int, optional): Seconds after the refresh covered by the windows. Defaults to 35 days.
+            chunk_size (int, optional): Number of host groups resolved per call. Defaults to 1000.
+        """
+        self.client = client
+        self.tz = tz
+        self.refresh_interval = refresh_interval
+        self.past = past
+        self.future = future
+        self.chunk_size = chunk_size
+        self.maintenances: dict[int, dict[str, Any]] = {}
+        self.refreshed: float | None = None
+        self._hosts: dict[int, _HostWindows] = {}
+        # maintenanceid -> (maintenance_type, tags, tags_evaltype)
+        self._attributes: dict[int, tuple[int, tuple[tuple[str, int, str], ...], int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.maintenances)
+
+    def refresh(self) -> int:
+        """
+        Reloads all maintenances and rebuilds the windows.
+
+        Returns:
+            int: The number of maintenances loaded.
+        """
+        maintenances = rpc(self.client, "maintenance.get", _MAINTENANCE_PARAMS)
+        groupids = sorted({int(group["groupid"]) for m in maintenances for group in m.get("hostgroups", [])})
+        group_hosts: dict[int, list[int]] = {}
+        for chunk in chunked(groupids, self.chunk_size):
+            params = {"output": ["groupid"], "groupids": chunk, "selectHosts": ["hostid"]}
+            for group in rpc(self.client, "hostgroup.get", params):
+                group_hosts[int(group["groupid"])] = [int(host["hostid"]) for host in group.get("hosts", [])]
+        now = int(time.time())
+        start, end = now - self.past, now + self.future
+        windows: dict[int, list[tuple[int, int, int]]] = {}
+        for m in maintenances:
+            maintenanceid = int(m["maintenanceid"])
+            hostids = {int(host["hostid"]) for host in m.get("hosts", [])}
+            for group in m.get("hostgroups", []):
+                hostids.update(group_hosts.get(int(group["groupid"]), ()))
+            spans = list(expand(m, start, end, self.tz))
+            for hostid in hostids:
+                windows.setdefault(hostid, []).extend((s, e, maintenanceid) for s, e in spans)
+        hosts = {hostid: _HostWindows.build(host_windows) for hostid, host_windows in windows.items()}
+        with self._lock:
+            self.maintenances = {int(m["maintenanceid"]): m for m in maintenances}
+            self._attributes = {maintenanceid: _attributes(m) for maintenanceid, m in self.maintenances.items()}
+            self._hosts = hosts
+            self.refreshed = time.monotonic()
+        return len(maintenances)
+
+    def in_maintenance(
+        self, hostid: int, ts: float | None = None, problem_tags: Iterable[dict[str, Any]] | None = None
+    ) -> bool:
+        """
+        Returns whether ``hostid`` is in maintenance at ``ts`` (default: now).
+
+        Without ``problem_tags``, only maintenances of the whole host count; with them,
+        maintenances limited to matching tags count too.
+        """
+        return any(window.covers(problem_tags) for window in self._overlapping(hostid, *_point(ts)))
+
+    def windows(self, hostid: int, ts: float | None = None) -> list[Window]:
+        """Returns the maintenance windows of ``hostid`` active at ``ts`` (default: now), tag-limited ones included."""
+        return list(self._overlapping(hostid, *_point(ts)))
+
+    def windows_between(self, hostid: int, start: float, end: float) -> list[Window]:
+        """
+        Returns the maintenance windows of ``hostid`` overlapping ``[start, end)``, sorted by start.
+
+        Only windows within the ``past`` and ``future`` horizon of the last refresh are known.
+        """
+        return sorted(self._overlapping(hostid, int(start), int(end)), key=lambda w: w.start)
+
+    def hosts_in_maintenance(self, ts: float | None = None) -> list[int]:
+        """Returns the hosts in maintenance at ``ts`` (default: now), ignoring maintenances limited by tags."""
+        start, end = _point(ts)
+        self._maybe_refresh()
+        attributes = self._attributes
+        return sorted(
+            hostid
+            for hostid, host in self._hosts.items()
+            if any(not attributes[host.maintenanceids[i]][1] for i in host.overlapping(start, end))
+        )
+
+    def _overlapping(self, hostid: int, start: int, end: int) -> Iterator[Window]:
+        self._maybe_refresh()
+        host, attributes = self._hosts.get(int(hostid)), self._attributes
+        if host is None:
+            return
+        for i in host.overlapping(start, end):
+            maintenanceid = host.maintenanceids[i]
+            yield Window(maintenanceid, host.starts[i], host.ends[i], *attributes.get(maintenanceid, (0, (), 0)))
+
+    def _maybe_refresh(self) -> None:
+        if self.refreshed is None or time.monotonic() - self.refreshed >= self.refresh_interval:
+            self.refresh()
+
+
+def _attributes(maintenance: dict[str, Any]) -> tuple[int, tuple[tuple[str, int, str], ...], int]:
+    tags = tuple(
+        (tag["tag"], int(tag.get("operator", TAG_OPERATOR_CONTAINS)), str(tag.get("value", "")))
+        for tag in maintenance.get("tags", [])
+    )
+    return int(maintenance["maintenance_type"]), tags, int(maintenance.get("tags_evaltype", TAG_EVALTYPE_AND_OR))
+
+
+def expand(maintenance: dict[str, Any], start: int, end: int, tz: tzinfo | None = None) -> Iterator[tuple[int, int]]:
+    """
+    Expands the time periods of a maintenance into the windows overlapping ``[start, end)``.
+
+    Windows are clipped to the ``active_since`` and ``active_till`` of the maintenance.
+
+    Args:
+        maintenance (dict[str, Any]): A maintenance with its ``timeperiods``.
+        start (int): Start of the range, inclusive.
+        end (int): End of the range, exclusive.
+        tz (tzinfo, optional): Time zone of the Zabbix server. Defaults to the local time zone.
+
+    Returns:
+        Iterator[tuple[int, int]]: ``(start, end)`` of every window, unsorted.
+    """
+    since, till = int(maintenance["active_since"]), int(maintenance["active_till"])
+    start, end = max(start, since), min(end, till)
+    if start >= end:
+        return
+    for period in maintenance.get("timeperiods", []):
+        for s, e in _period_windows(period, since, start, end, tz):
+            if s < end and e > start:
+                yield max(s, since), min(e, till)
+
+
+def _period_windows(
+    period: dict[str, Any], since: int, start: int, end: int, tz: tzinfo | None
+) -> Iterable[tuple[int, int]]:
+    kind = int(period["timeperiod_type"])
+    duration = int(period["period"])
+    if kind == ONE_TIME:
+        first = int(period["start_date"])
+        return [(first, first + duration)]
+    start_time = int(period.get("start_time", 0))
+    every = max(int(period.get("every", 1)), 1)
+    first_day = datetime.fromtimestamp(since, tz).date()
+    # a window starting up to ``duration`` before the range may still overlap it
+    day = datetime.fromtimestamp(start - duration, tz).date() - timedelta(days=1)
+    last_day = datetime.fromtimestamp(end, tz).date()
+    windows = []
+    while day <= last_day:
+        if _matches(kind, period, every, day, first_day):
+            s = int((datetime(day.year, day.month, day.day, tzinfo=tz) + timedelta(seconds=start_time)).timestamp())
+            windows.append((s, s + duration))
+        day += timedelta(days=1)
+    return windows
+
+
+def _matches(kind: int, period: dict[str, Any], every: int, day: date, first_day: date) -> bool:
+    dayofweek = int(period.get("dayofweek", 0))
+    if kind == DAILY:
+        matches = (day - first_day).days % every == 0
+    elif kind == WEEKLY:
+        weeks = (day - timedelta(days=day.weekday()) - (first_day - timedelta(days=first_day.weekday()))).days // 7
+        matches = bool(dayofweek & 1 << day.weekday()) and weeks % every == 0
+    elif kind == MONTHLY and int(period.get("month", 0)) & 1 << (day.month - 1):
+        if not dayofweek:
+            matches = day.day == int(period.get("day", 0))
+        elif every == _LAST_WEEK:
+            matches = bool(dayofweek & 1 << day.weekday()) and (day + timedelta(days=7)).month != day.month
+        else:
+            # ``every`` is the week of the month, 1 to 4
+            matches = bool(dayofweek & 1 << day.weekday()) and (day.day - 1) // 7 + 1 == every
+    else:
+        matches = False
+    return matches
+
+
+def _point(ts: float | None) -> tuple[int, int]:
+    ts = int(time.time() if ts is None else ts)
+    return ts, ts + 1
@@ -0,0 +1,315 @@
+import binascii
+import json
+import re
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import IO, Any
+
+from httpx import USE_CLIENT_DEFAULT, Client, TimeoutException
+from httpx._client import UseClientDefault
+
+from .deadline import current_deadline
+from .exceptions import DeadlineExceededError, EmptyResponseError, ZabbixAPIError
+from .executor import DEFAULT_MAX_WORKERS, run_concurrently
+from .generics import _ParamsT, api_url
+from .session import SessionManager, is_expired_error
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# the head of a response before its payload holds a few small fields, do not buffer a large non-string result
+_MAX_HEAD_SIZE = 1024 * 1024
+_IMAGE_TYPES = ((b"\x89PNG", ".png"), (b"\xff\xd8", ".jpg"), (b"GIF8", ".gif"), (b"<svg", ".svg"), (b"<?xml", ".svg"))
+
+_BACKSLASH = ord("\\")
+_U = ord("u")
+_HIGH_SURROGATES = (0xD800, 0xDC00)
+_UTF8_CONTINUATION = 0x80
+# first bytes of 2, 3 and 4 byte UTF-8 sequences start at these values
+_UTF8_LEADS = (0xC0, 0xE0, 0xF0)
+
+Sink = str | Path | IO[bytes]
+
+
+class _StringWriter:
+    """Decodes a JSON string fed in chunks and writes its value, optionally base64-decoded.
+
+    Every chunk is cut after its last complete escape sequence and decoded with
+    ``json.loads``, so decoding runs at C speed and never holds more than a chunk.
+    """
+
+    def __init__(self, write: Callable[[bytes], Any], base64: bool) -> None:
+        self._write = write
+        self._base64 = base64
+        self._pending = b""
+        self._quads = b""
+        self.size = 0
+        self.done = False
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Decodes ``chunk``; returns the bytes following the closing quote, once it is reached."""
+        data = self._pending + chunk
+        end = _closing_quote(data)
+        if end is None:
+            cut = _safe_cut(data)
+            self._pending = data[cut:]
+            self._emit(data[:cut])
+            return b""
+        self._pending = b""
+        self._emit(data[:end])
+        if self._quads:
+            self._emit_bytes(binascii.a2b_base64(self._quads))
+            self._quads = b""
+        self.done = True
+        return data[end + 1 :]
+
+    def _emit(self, escaped: bytes) -> None:
+        if not escaped:
+            return
+        value = json.loads(b'"' + escaped + b'"').encode()
+        if not self._base64:
+            self._emit_bytes(value)
+            return
+        value = self._quads + value
+        usable = len(value) - len(value) % 4
+        self._quads = value[usable:]
+        self._emit_bytes(binascii.a2b_base64(value[:usable]))
+
+    def _emit_bytes(self, value: bytes) -> None:
+        self._write(value)
+        self.size += len(value)
+
+
+def stream_result(
+    client: Client,
+    method: str,
+    params: _ParamsT,
+    sink: Sink,
+    field: str | None = None,
+    base64: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timeout: float | UseClientDefault | None = USE_CLIENT_DEFAULT,
+) -> int:
+    """
+    Calls an API method and writes a string of its result to ``sink`` while the response is received.
+
+    The response is never held in memory: the bytes preceding the string are scanned for
+    its key, then the string is decoded chunk by chunk and written out. The session token
+    of a ``SessionManager`` is added without its response buffering; an expired session
+    is renewed and the call retried once.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        method (str): The API method, e.g. ``"configuration.export"``.
+        params (_ParamsT): The parameters.
+        sink (str | Path | IO[bytes]): A file path, or a binary file-like object.
+        field (str, optional): Key of the string within the result, e.g. ``"image"``. Defaults to the result itself.
+        base64 (bool, optional): Write the base64-decoded bytes of the string. Defaults to False.
+        chunk_size (int, optional): Bytes read from the response at a time. Defaults to 64 KiB.
+        timeout (float, optional): The request timeout. Defaults to the client's timeout.
+
+    Returns:
+        int: The number of bytes written.
+
+    Raises:
+        ZabbixAPIError: If the response is an error.
+        EmptyResponseError: If the result holds no such string.
+    """
+    if not isinstance(sink, str | Path):
+        return _stream(client, method, params, sink.write, field, base64, chunk_size, timeout)
+    path = Path(sink)
+    try:
+        with path.open("wb") as f:
+            return _stream(client, method, params, f.write, field, base64, chunk_size, timeout)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+
+def export_configuration(
+    client: Client,
+    options: dict[str, Any],
+    sink: Sink,
+    format: str = "yaml",  # noqa: A002
+    prettyprint: bool = False,
+) -> int:
+    """
+    Streams a ``configuration.export`` to ``sink``.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        options (dict[str, Any]): The objects to export, e.g. ``{"templates": ["10001"]}``.
+        sink (str | Path | IO[bytes]): A file path, or a binary file-like object.
+        format (str, optional): ``"yaml"``, ``"xml"``, ``"json"`` or ``"raw"``. Defaults to "yaml".
+        prettyprint (bool, optional): Indent the export. Defaults to False.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    params = {"options": options, "format": format, "prettyprint": prettyprint}
+    return stream_result(client, "configuration.export", params, sink)
+
+
+def download_image(client: Client, imageid: int, sink: Sink) -> int:
+    """Streams the decoded content of an image to ``sink``; returns the number of bytes written."""
+    params = {"output": ["imageid"], "imageids": [imageid], "select_image": True}
+    return stream_result(client, "image.get", params, sink, field="image", base64=True)
+
+
+def download_images(
+    client: Client, imageids: Iterable[int], directory: str | Path, max_workers: int = DEFAULT_MAX_WORKERS
+) -> dict[int, Path]:
+    """
+    Downloads images concurrently, one call and one file per image, at constant memory.
+
+    Files are named after the image ID with the extension of their content, e.g. ``"12.png"``.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        imageids (Iterable[int]): The images.
+        directory (str | Path): Directory of the files, created if missing.
+        max_workers (int, optional): Maximum number of concurrent downloads. Defaults to 8.
+
+    Returns:
+        dict[int, Path]: The file of every image.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    def _download(imageid: int) -> Path:
+        path = directory / f"{imageid}.part"
+        download_image(client, imageid, path)
+        with path.open("rb") as f:
+            head = f.read(8)
+        extension = next((ext for magic, ext in _IMAGE_TYPES if head.startswith(magic)), ".bin")
+        return path.replace(path.with_suffix(extension))
+
+    imageids = [int(imageid) for imageid in imageids]
+    paths = run_concurrently(_download, [(imageid,) for imageid in imageids], max_workers)
+    return dict(zip(imageids, paths, strict=True))
+
+
+def _stream(
+    client: Client,
+    method: str,
+    params: _ParamsT,
+    write: Callable[[bytes], Any],
+    field: str | None,
+    base64: bool,
+    chunk_size: int,
+    timeout: float | UseClientDefault | None,
+) -> int:
+    payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
+    marker = re.compile(rb'"%s"\s*:\s*"' % re.escape((field or "result").encode()))
+    auth = client.auth if isinstance(client.auth, SessionManager) else None
+    token = auth.valid_token() if auth is not None else None
+    if (deadline := current_deadline()) is not None:
+        deadline.check(method)
+        timeout = deadline.timeout(client.timeout if isinstance(timeout, UseClientDefault) else timeout)
+    for attempt in range(2):
+        try:
+            size, head = _stream_once(client, payload, token, marker, write, base64, chunk_size, timeout)
+        except TimeoutException as e:
+            if deadline is not None and deadline.expired:
+                msg = f"Deadline exceeded during {method}"
+                raise DeadlineExceededError(msg) from e
+            raise
+        if size is not None:
+            return size
+        if (error := _error(head)) is None:
+            break
+        if auth is None or attempt > 0 or not is_expired_error(error.data):
+            raise error
+        token = auth.renew(token)
+    msg = f"Result of {method} holds no {field or 'string'} payload"
+    raise EmptyResponseError(msg)
+
+
+def _stream_once(
+    client: Client,
+    payload: dict[str, Any],
+    token: str | None,
+    marker: re.Pattern[bytes],
+    write: Callable[[bytes], Any],
+    base64: bool,
+    chunk_size: int,
+    timeout: float | UseClientDefault | None,
+) -> tuple[int | None, bytes]:
+    """Sends one request; returns the size of the payload written, or None and the response without one."""
+    # the token is sent here, bypassing the manager, so that an expired one is known and can be renewed
+    with client.stream(
+        "POST",
+        api_url(client),
+        json=payload,
+        headers={"Authorization": f"Bearer {token}"} if token is not None else None,
+        timeout=timeout,
+        auth=None if token is not None else USE_CLIENT_DEFAULT,
+    ) as r:
+        r.raise_for_status()
+        head = b""
+        writer = None
+        for chunk in r.iter_bytes(chunk_size):
+            if writer is not None:
+                if not writer.done:
+                    writer.feed(chunk)
+                continue
+            head += chunk
+            if (match := marker.search(head)) is not None:
+                writer = _StringWriter(write, base64)
+                writer.feed(head[match.end() :])
+            elif len(head) > _MAX_HEAD_SIZE:
+                break
+    if writer is None:
+        return None, head
+    if not writer.done:
+        msg = f"Response of {payload['method']} ended within its payload"
+        raise EmptyResponseError(msg)
+    return writer.size, head
+
+
+def _error(head: bytes) -> ZabbixAPIError | None:
+    try:
+        response = json.loads(head)
+    except ValueError:
+        return None
+    if not isinstance(response, dict) or not isinstance(error := response.get("error"), dict):
+        return None
+    return ZabbixAPIError(code=error.get("code"), message=error.get("message"), data=error.get("data"))
+
+
+def _closing_quote(data: bytes) -> int | None:
+    """Returns the index of the first quote of ``data`` not escaped by a backslash."""
+    start = 0
+    while (i := data.find(b'"', start)) >= 0:
+        if _backslashes(data, i) % 2 == 0:
+            return i
+        start = i + 1
+    return None
+
+
+def _backslashes(data: bytes, end: int) -> int:
+    """Returns the number of consecutive backslashes preceding ``data[end]``."""
+    start = end
+    while start > 0 and data[start - 1] == _BACKSLASH:
+        start -= 1
+    return end - start
+
+
+def _safe_cut(data: bytes) -> int:
+    """Returns the length of the longest prefix of ``data`` not ending within an escape sequence or a character."""
+    end = len(data)
+    while (b := data.rfind(b"\\", max(end - 12, 0), end)) >= 0 and _backslashes(data, b + 1) % 2 == 1:
+        if b + 1 < end and data[b + 1] != _U:
+            break
+        # a high surrogate is decoded together with the low surrogate following it
+        if b + 6 <= end and not _HIGH_SURROGATES[0] <= int(data[b + 2 : b + 6], 16) < _HIGH_SURROGATES[1]:
+            break
+        end = b
+    # raw UTF-8 characters may also be split between two chunks
+    start = end
+    while start > max(end - 3, 0) and data[start - 1] & 0xC0 == _UTF8_CONTINUATION:
+        start -= 1
+    if start > 0 and data[start - 1] >= _UTF8_LEADS[0]:
+        lead = data[start - 1]
+        length = 2 if lead < _UTF8_LEADS[1] else 3 if lead < _UTF8_LEADS[2] else 4
+        if end - start + 1 < length:
+            return start - 1
+    return end
@@ -0,0 +1,82 @@
+import json
+from typing import Any
+
+from httpx import USE_CLIENT_DEFAULT, Client
+from pydantic import BaseModel
+
+from .generics import _call
+
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+_HEADERS = {"Content-Type": "application/json-rpc"}
+
+
+class PreparedQuery:
+    """A get request encoded once, with only its variable parameters encoded on each call.
+
+    The constant parameters of the template are kept as a pre-encoded byte prefix; each
+    call appends the variables it is given and sends the body as is, without building a
+    model or dumping a dictionary. Variables are named by their API (alias) name. A
+    variable also set in the template is sent with the template value when it is not given.
+
+    Example:
+        >>> recent = zbx.problem.prepare(ProblemGet(recent=True, output=["eventid", "name"]), "time_from")
+        >>> while True:
+        ...     problems = recent(time_from=int(time.time()) - 60)
+    """
+
+    __slots__ = ["client", "method", "variables", "defaults", "_prefix", "_names"]
+
+    def __init__(
+        self, client: Client, method: str, template: BaseModel | dict[str, Any], variables: tuple[str, ...] = ()
+    ) -> None:
+        """
+        Encodes the constant part of the request.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            method (str): The API method, e.g. ``"problem.get"``.
+            template (BaseModel | dict[str, Any]): The request parameters.
+            variables (tuple[str, ...], optional): Names of the parameters given on each call. Defaults to ().
+        """
+        params = template.model_dump(exclude_unset=True, by_alias=True) if isinstance(template, BaseModel) else template
+        self.client = client
+        self.method = method
+        self.variables = variables
+        self.defaults = {name: params[name] for name in variables if name in params}
+        constant = {key: value for key, value in params.items() if key not in variables}
+        head = _encode({"jsonrpc": "2.0", "method": method, "id": 1})[:-1]
+        # the params object is left open so that variables can be appended
+        self._prefix = f'{head},"params":{_encode(constant)[:-1]}'.encode()
+        self._names = {name: f'"{name}":'.encode() for name in variables}
+
+    def __repr__(self) -> str:
+        return f"<PreparedQuery {self.method} variables={list(self.variables)}>"
+
+    def __call__(self, **values: Any) -> Any:
+        """
+        Sends the request with ``values`` spliced in and returns the API result.
+
+        Like ``rpc``, the call is refused once the active ``Deadline`` has passed, its timeout is
+        clamped to the time left, and its response is streamed under the active ``MemoryBudget``.
+        """
+        return _call(self.client, self.method, USE_CLIENT_DEFAULT, content=self.body(**values), headers=_HEADERS)
+
+    def body(self, **values: Any) -> bytes:
+        """Returns the encoded JSON-RPC request for ``values``."""
+        if unknown := values.keys() - self._names.keys():
+            msg = f"{self.method} was not prepared with variables {sorted(unknown)}"
+            raise TypeError(msg)
+        parts = [self._prefix]
+        empty = self._prefix.endswith(b"{")
+        for name, encoded_name in self._names.items():
+            if name in values:
+                value = values[name]
+            elif name in self.defaults:
+                value = self.defaults[name]
+            else:
+                continue
+            parts.append(encoded_name if empty else b"," + encoded_name)
+            parts.append(_encode(value).encode())
+            empty = False
+        parts.append(b"}}")
+        return b"".join(parts)
@@ -0,0 +1,301 @@
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from typing import Any, NamedTuple
+
+from httpx import Client
+
+from .generics import chunked, paginate, rpc
+from .logger import logger
+
+_EVENT_OUTPUT = ["eventid", "objectid", "clock", "name", "severity", "value", "r_eventid", "acknowledged", "suppressed"]
+# problems and events of triggers only
+_TRIGGER_EVENTS = {"source": 0, "object": 0}
+
+
+class Problem(NamedTuple):
+    eventid: int
+    triggerid: int
+    clock: int
+    name: str
+    severity: int
+    hostids: tuple[int, ...]
+    groupids: tuple[int, ...]
+    tags: tuple[tuple[str, str], ...]
+    acknowledged: bool
+    suppressed: bool
+
+
+class ProblemView:
+    """The active trigger problems, kept up to date from new events and indexed for local queries.
+
+    ``load()`` reads the active problems once; ``sync()`` then only reads the events
+    created since the last event seen, with ``event.get`` and ``eventid_from``. Problem
+    events are added, and a recovery event checks which open problems of its trigger are
+    resolved. Problems are indexed by host, host group, severity, tag and trigger, so
+    that ``query()`` intersects the smallest index sets instead of scanning. Queries sync
+    first once the view is older than ``sync_interval``; all reads and updates hold one
+    lock, so every query sees a consistent snapshot.
+
+    Acknowledgements, severity changes and suppression do not create events; ``load()``
+    again, e.g. every hour, to pick them up.
+
+    The server allocates event IDs before it commits the events, and its history syncers
+    commit concurrently, so an event can become visible after one with a higher ID. Once
+    the watermark has passed it, ``sync()`` never reads that event: its problem is missing,
+    or its recovery is not applied, until the next ``load()``. The periodic ``load()`` is
+    what bounds this drift.
+
+    Example:
+        >>> view = ProblemView(zbx.client, sync_interval=5)
+        >>> view.query(groupids=[2], severities=[4, 5], tags=[("service", "payments")])
+    """
+
+    def __init__(self, client: Client, sync_interval: float = 5.0, page_size: int = 1000) -> None:
+        """
+        Initializes an empty view; it is loaded on the first query.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            sync_interval (float, optional): Seconds after which a query reads the new events. Defaults to 5.
+            page_size (int, optional): Number of problems or events read per call. Defaults to 1000.
+        """
+        self.client = client
+        self.sync_interval = sync_interval
+        self.page_size = page_size
+        self.watermark: int | None = None
+        self.synced: float | None = None
+        self.problems: dict[int, Problem] = {}
+        self._by_trigger: dict[int, set[int]] = {}
+        self._by_host: dict[int, set[int]] = {}
+        self._by_group: dict[int, set[int]] = {}
+        self._by_severity: dict[int, set[int]] = {}
+        self._by_tag: dict[str, dict[str, set[int]]] = {}
+        self._trigger_hosts: dict[int, tuple[int, ...]] = {}
+        self._host_groups: dict[int, tuple[int, ...]] = {}
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.problems)
+
+    def load(self) -> int:
+        """
+        Reads all active problems, replacing the view.
+
+        Returns:
+            int: The number of active problems.
+        """
+        # events created while the problems are read are applied again by the next sync, which is harmless
+        latest = rpc(
+            self.client,
+            "event.get",
+            {"output": ["eventid"], **_TRIGGER_EVENTS, "sortfield": "eventid", "sortorder": "DESC", "limit": 1},
+        )
+        params = {"output": _EVENT_OUTPUT, "selectTags": ["tag", "value"], **_TRIGGER_EVENTS, "recent": False}
+        rows = list(paginate(self.client, "problem", params, self.page_size))
+        self._trigger_hosts.clear()
+        self._host_groups.clear()
+        self._resolve({int(row["objectid"]) for row in rows})
+        with self._lock:
+            for index in (self.problems, self._by_trigger, self._by_host, self._by_group, self._by_severity):
+                index.clear()
+            self._by_tag.clear()
+            for row in rows:
+                self._add(row)
+            self.watermark = int(latest[0]["eventid"]) if latest else 0
+            self.synced = time.monotonic()
+        return len(self.problems)
+
+    def sync(self) -> int:
+        """
+        Applies the events created since the last load or sync.
+
+        Events are read by ``eventid_from``: an event committed after one with a higher ID
+        that was already read is skipped, see the class docstring.
+
+        Returns:
+            int: The number of events read.
+        """
+        if self.watermark is None:
+            self.load()
+            return 0
+        events = []
+        watermark = self.watermark
+        while True:
+            page = rpc(
+                self.client,
+                "event.get",
+                {
+                    "output": _EVENT_OUTPUT,
+                    "selectTags": ["tag", "value"],
+                    **_TRIGGER_EVENTS,
+                    "eventid_from": watermark + 1,
+                    "sortfield": "eventid",
+                    "sortorder": "ASC",
+                    "limit": self.page_size,
+                },
+            )
+            events.extend(page)
+            if page:
+                watermark = int(page[-1]["eventid"])
+            if len(page) < self.page_size:
+                break
+        problems = [e for e in events if e["value"] == "1" and e["r_eventid"] == "0"]
+        self._resolve({int(e["objectid"]) for e in problems})
+        with self._lock:
+            for event in problems:
+                self._add(event)
+            recovered = {int(e["objectid"]) for e in events if e["value"] == "0"}
+            candidates = sorted({eventid for t in recovered for eventid in self._by_trigger.get(t, ())})
+        # a recovery event does not name its problems, ask which problems of its trigger are still open
+        still_open: set[int] = set()
+        for chunk in chunked(candidates, self.page_size):
+            rows = rpc(self.client, "problem.get", {"output": ["eventid"], "eventids": chunk, **_TRIGGER_EVENTS})
+            still_open.update(int(row["eventid"]) for row in rows)
+        with self._lock:
+            for eventid in candidates:
+                if eventid not in still_open:
+                    self._remove(eventid)
+            self.watermark = watermark
+            self.synced = time.monotonic()
+        logger.debug("problem view synced %d events, %d active problems", len(events), len(self.problems))
+        return len(events)
+
+    def get(self, eventid: int) -> Problem | None:
+        self._maybe_sync()
+        return self.problems.get(eventid)
+
+    def query(
+        self,
+        hostids: Iterable[int] | None = None,
+        groupids: Iterable[int] | None = None,
+        severities: Iterable[int] | None = None,
+        tags: Sequence[tuple[str, str | None]] | None = None,
+        triggerids: Iterable[int] | None = None,
+    ) -> list[Problem]:
+        """
+        Returns the active problems matching all the given criteria, oldest first.
+
+        Args:
+            hostids (Iterable[int], optional): Problems of any of these hosts. Defaults to None.
+            groupids (Iterable[int], optional): Problems of hosts in any of these groups. Defaults to None.
+            severities (Iterable[int], optional): Problems of any of these severities. Defaults to None.
+            tags (Sequence[tuple[str, str | None]], optional): ``(tag, value)`` pairs that must all be present;
+                a None value matches any value of the tag. Defaults to None.
+            triggerids (Iterable[int], optional): Problems of any of these triggers. Defaults to None.
+
+        Returns:
+            list[Problem]: The matching problems.
+        """
+        self._maybe_sync()
+        with self._lock:
+            sets = [
+                _union(index, keys)
+                for index, keys in (
+                    (self._by_host, hostids),
+                    (self._by_group, groupids),
+                    (self._by_severity, severities),
+                    (self._by_trigger, triggerids),
+                )
+                if keys is not None
+            ]
+            for tag, value in tags or ():
+                values = self._by_tag.get(tag, {})
+                sets.append(_union(values, values) if value is None else values.get(value, set()))
+            if not sets:
+                eventids: Iterable[int] = self.problems
+            else:
+                sets.sort(key=len)
+                eventids = sets[0].intersection(*sets[1:])
+            return [self.problems[eventid] for eventid in sorted(eventids)]
+
+    def counts(self, by: str = "severity") -> dict[Any, int]:
+        """Returns the number of active problems per ``"severity"``, ``"host"``, ``"group"`` or ``"trigger"``."""
+        self._maybe_sync()
+        index = {
+            "severity": self._by_severity,
+            "host": self._by_host,
+            "group": self._by_group,
+            "trigger": self._by_trigger,
+        }
+        with self._lock:
+            return {key: len(eventids) for key, eventids in index[by].items()}
+
+    def _maybe_sync(self) -> None:
+        if self.synced is not None and time.monotonic() - self.synced < self.sync_interval:
+            return
+        # concurrent queries wait for a single sync
+        with self._sync_lock:
+            if self.synced is None or time.monotonic() - self.synced >= self.sync_interval:
+                self.sync()
+
+    def _resolve(self, triggerids: set[int]) -> None:
+        """Reads the hosts of ``triggerids`` and the groups of those hosts that are not known yet."""
+        missing = sorted(triggerids - self._trigger_hosts.keys())
+        for chunk in chunked(missing, self.page_size):
+            params = {"output": ["triggerid"], "triggerids": chunk, "selectHosts": ["hostid"]}
+            for trigger in rpc(self.client, "trigger.get", params):
+                self._trigger_hosts[int(trigger["triggerid"])] = tuple(int(h["hostid"]) for h in trigger["hosts"])
+        hostids = {hostid for t in triggerids for hostid in self._trigger_hosts.get(t, ())}
+        for chunk in chunked(sorted(hostids - self._host_groups.keys()), self.page_size):
+            params = {"output": ["hostid"], "hostids": chunk, "selectHostGroups": ["groupid"]}
+            for host in rpc(self.client, "host.get", params):
+                self._host_groups[int(host["hostid"])] = tuple(int(g["groupid"]) for g in host["hostgroups"])
+
+    def _add(self, row: dict[str, Any]) -> None:
+        triggerid = int(row["objectid"])
+        hostids = self._trigger_hosts.get(triggerid, ())
+        problem = Problem(
+            eventid=int(row["eventid"]),
+            triggerid=triggerid,
+            clock=int(row["clock"]),
+            name=row["name"],
+            severity=int(row["severity"]),
+            hostids=hostids,
+            groupids=tuple(sorted({g for h in hostids for g in self._host_groups.get(h, ())})),
+            tags=tuple((tag["tag"], tag.get("value", "")) for tag in row.get("tags", [])),
+            acknowledged=row.get("acknowledged") == "1",
+            suppressed=row.get("suppressed") == "1",
+        )
+        if problem.eventid in self.problems:
+            return
+        self.problems[problem.eventid] = problem
+        for index, keys in self._keys(problem):
+            for key in keys:
+                index.setdefault(key, set()).add(problem.eventid)
+        for tag, value in problem.tags:
+            self._by_tag.setdefault(tag, {}).setdefault(value, set()).add(problem.eventid)
+
+    def _remove(self, eventid: int) -> None:
+        if (problem := self.problems.pop(eventid, None)) is None:
+            return
+        for index, keys in self._keys(problem):
+            for key in keys:
+                _discard(index, key, eventid)
+        for tag, value in problem.tags:
+            _discard(self._by_tag[tag], value, eventid)
+            if not self._by_tag[tag]:
+                del self._by_tag[tag]
+
+    def _keys(self, problem: Problem) -> list[tuple[dict[int, set[int]], Iterable[int]]]:
+        return [
+            (self._by_trigger, (problem.triggerid,)),
+            (self._by_host, problem.hostids),
+            (self._by_group, problem.groupids),
+            (self._by_severity, (problem.severity,)),
+        ]
+
+
+def _union(index: dict[Any, set[int]], keys: Iterable[Any]) -> set[int]:
+    result: set[int] = set()
+    for key in keys:
+        result.update(index.get(key, ()))
+    return result
+
+
+def _discard(index: dict[Any, set[int]], key: Any, eventid: int) -> None:
+    if (eventids := index.get(key)) is not None:
+        eventids.discard(eventid)
+        if not eventids:
+            del index[key]
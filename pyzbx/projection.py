@@ -0,0 +1,289 @@
+from collections import defaultdict
+from collections.abc import ItemsView, Iterable, Iterator, KeysView, Mapping, ValuesView
+from typing import Any, Literal, TypeVar, is_typeddict
+
+from pydantic import BaseModel
+
+_GetT = TypeVar("_GetT", BaseModel, dict[str, Any])
+
+
+def output_fields(model: type) -> list[str]:
+    """
+    Returns the API field names declared by a typed result model.
+
+    Args:
+        model (type): A ``TypedDict`` (e.g. ``schemas.Alert``) or a pydantic model (e.g. ``schemas.HostGroup``).
+
+    Returns:
+        list[str]: The field names, suitable as an ``output`` list.
+
+    Raises:
+        TypeError: If ``model`` is neither a ``TypedDict`` nor a pydantic model.
+    """
+    if is_typeddict(model):
+        return list(model.__annotations__)
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        return [field.alias or name for name, field in model.model_fields.items()]
+    msg = f"Cannot derive output fields from {model!r}"
+    raise TypeError(msg)
+
+
+class Projection:
+    """The set of fields a call site reads, including nested ``select*`` sub-selects.
+
+    Example:
+        >>> proj = Projection(["alertid", "clock", "subject"], selectHosts=["hostid", "name"])
+        >>> client.alert.get(proj.apply(AlertGet(time_from=ts)))
+    """
+
+    def __init__(self, fields: "_Fields", **selects: "_Fields") -> None:
+        self.fields = _to_fields(fields)
+        self.selects = {name: _to_fields(sub) for name, sub in selects.items()}
+
+    def __repr__(self) -> str:
+        return f"Projection({self.fields!r}, **{self.selects!r})"
+
+    def params(self) -> dict[str, Any]:
+        params: dict[str, Any] = {"output": _copy(self.fields)}
+        params.update({name: _copy(fields) for name, fields in self.selects.items()})
+        return params
+
+    def apply(self, data: _GetT) -> _GetT:
+        """
+        Returns a copy of a get request restricted to the projected fields.
+
+        Args:
+            data (BaseModel | dict): The get request, either a schema model or raw params.
+
+        Returns:
+            The same kind of object with ``output`` and the ``select*`` keys replaced.
+        """
+        if isinstance(data, BaseModel):
+            return data.model_copy(update=self.params())
+        return {**data, **self.params()}
+
+
+def _copy(fields: list[str] | str) -> list[str] | str:
+    return fields if isinstance(fields, str) else list(fields)
+
+
+_Fields = type | list[str] | tuple[str, ...] | Projection | Literal["extend"]
+
+# result keys filled by a ``select`` parameter named after the capitalized key; other list or
+# object fields, such as the ``urls`` of events, are plain output fields
+_SUB_SELECTS = frozenset(
+    {
+        "acknowledges",
+        "children",
+        "dashboards",
+        "dependencies",
+        "discoveries",
+        "discoveryRule",
+        "excludedDowntimes",
+        "filter",
+        "functions",
+        "graphs",
+        "groups",
+        "hostDiscovery",
+        "hosts",
+        "httpTests",
+        "inheritedTags",
+        "interfaces",
+        "inventory",
+        "itemDiscovery",
+        "items",
+        "lastEvent",
+        "macros",
+        "medias",
+        "mediatypes",
+        "operations",
+        "pages",
+        "parentTemplates",
+        "parents",
+        "preprocessing",
+        "problemTags",
+        "recoveryOperations",
+        "relatedObject",
+        "role",
+        "schedule",
+        "serviceTags",
+        "statusRules",
+        "steps",
+        "tags",
+        "templates",
+        "timeperiods",
+        "triggerDiscovery",
+        "triggers",
+        "updateOperations",
+        "userGroups",
+        "users",
+        "usrgrps",
+    }
+)
+
+# result keys of sub-selects whose parameter is not ``select`` followed by the capitalized key
+_SELECTS = {
+    "alerts": "select_alerts",
+    "gitems": "selectGraphItems",
+    "hostgroup_rights": "selectHostGroupRights",
+    "hostgroups": "selectHostGroups",
+    "message_templates": "selectMessageTemplates",
+    "suppression_data": "selectSuppressionData",
+    "tag_filters": "selectTagFilters",
+    "templategroup_rights": "selectTemplateGroupRights",
+    "templategroups": "selectTemplateGroups",
+    "valuemap": "selectValueMap",
+    "valuemaps": "selectValueMaps",
+}
+
+
+def _to_fields(fields: _Fields) -> list[str] | str:
+    if isinstance(fields, Projection):
+        return fields.fields
+    if fields == "extend":
+        return "extend"
+    if isinstance(fields, list | tuple):
+        return list(fields)
+    return output_fields(fields)
+
+
+def _select_param(key: str) -> str | None:
+    if key in _SUB_SELECTS:
+        return f"select{key[0].upper()}{key[1:]}"
+    return _SELECTS.get(key)
+
+
+class _TrackedDict(dict):
+    """A row recording its reads in ``accessed``.
+
+    A field read is recorded as its name, a sub-select result read as ``key.`` and the
+    fields read in its objects as ``key.field``. Reading the whole row (iterating it, its
+    ``keys()``, ``items()`` or ``values()``, ``dict(row)``, ``**row``) records ``*``, and
+    ``key.*`` for every sub-select. Reads that bypass dict methods, such as ``json.dumps``,
+    are not seen.
+    """
+
+    __slots__ = ("_accessed", "_prefix")
+
+    def __init__(self, data: Mapping[str, Any], accessed: set[str], prefix: str = "") -> None:
+        if not prefix:
+            data = {key: _track_nested(value, accessed, f"{key}.") for key, value in data.items()}
+        super().__init__(data)
+        self._accessed = accessed
+        self._prefix = prefix
+
+    def _read(self, key: str) -> None:
+        if not isinstance(super().get(key), list | Mapping):
+            self._accessed.add(f"{self._prefix}{key}")
+        elif self._prefix:
+            # sub-selects of sub-selects are not tracked, their whole objects are kept
+            self._accessed.add(f"{self._prefix}*")
+        else:
+            self._accessed.add(f"{key}.")
+
+    def _read_all(self) -> None:
+        self._accessed.add(f"{self._prefix}*")
+        if not self._prefix:
+            self._accessed.update(f"{key}.*" for key, value in super().items() if isinstance(value, list | Mapping))
+
+    def __getitem__(self, key: str) -> Any:
+        self._read(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._read(key)
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            self._read(key)
+        return super().__contains__(key)
+
+    # overriding __iter__ also makes dict(row) and **row go through keys() and __getitem__
+    def __iter__(self) -> Iterator[str]:
+        self._read_all()
+        return super().__iter__()
+
+    def keys(self) -> KeysView[str]:
+        self._read_all()
+        return super().keys()
+
+    def items(self) -> ItemsView[str, Any]:
+        self._read_all()
+        return super().items()
+
+    def values(self) -> ValuesView[Any]:
+        self._read_all()
+        return super().values()
+
+    def copy(self) -> dict[str, Any]:
+        self._read_all()
+        return dict(super().items())
+
+
+def _track_nested(value: Any, accessed: set[str], prefix: str) -> Any:
+    if isinstance(value, Mapping):
+        return _TrackedDict(value, accessed, prefix)
+    if isinstance(value, list):
+        return [_TrackedDict(v, accessed, prefix) if isinstance(v, Mapping) else v for v in value]
+    return value
+
+
+class FieldTracker:
+    """Development helper that records which result fields each call site actually reads.
+
+    Wrap get results with ``track()`` while exercising the code, then use ``suggest()`` to
+    print minimal projections, or enable ``apply`` so that ``project()`` rewrites the requests
+    of already observed call sites to those projections.
+    """
+
+    def __init__(self, apply: bool = False) -> None:
+        self.apply = apply
+        self.accessed: defaultdict[str, set[str]] = defaultdict(set)
+
+    def track(self, site: str, rows: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Wraps result rows so that every field read is recorded against ``site``.
+
+        Args:
+            site (str): A stable name for the call site, e.g. ``"alert_router.load_alerts"``.
+            rows (Iterable[Mapping[str, Any]]): The rows returned by a get call.
+
+        Returns:
+            list[dict[str, Any]]: Dict subclasses behaving like the original rows.
+        """
+        accessed = self.accessed[site]
+        return [_TrackedDict(row, accessed) for row in rows]
+
+    def suggest(self, site: str) -> Projection | None:
+        """
+        Returns the projection of the fields read at ``site``, or None if nothing was read.
+
+        Sub-select results read, such as ``hosts``, become ``select*`` parameters with the
+        fields read in their objects; list or object fields that no sub-select returns, such
+        as the ``urls`` of events, stay plain ``output`` fields. Rows or objects read whole
+        fall back to ``"extend"``.
+        """
+        if not (accessed := self.accessed.get(site)):
+            return None
+        fields: set[str] = set()
+        selects: dict[str, set[str]] = {}
+        for entry in accessed:
+            key, nested, field = entry.partition(".")
+            if nested and (select := _select_param(key)) is not None:
+                selects.setdefault(select, set()).update([field] if field else [])
+            else:
+                fields.add(key)
+        return Projection(
+            "extend" if "*" in fields else sorted(fields),
+            **{select: "extend" if not sub or "*" in sub else sorted(sub) for select, sub in selects.items()},
+        )
+
+    def suggestions(self) -> dict[str, Projection]:
+        return {site: projection for site in self.accessed if (projection := self.suggest(site)) is not None}
+
+    def project(self, site: str, data: _GetT) -> _GetT:
+        """Restricts ``data`` to the fields seen at ``site`` when ``apply`` is enabled."""
+        if not self.apply or (projection := self.suggest(site)) is None:
+            return data
+        return projection.apply(data)
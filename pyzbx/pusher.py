@@ -0,0 +1,186 @@
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Any, NamedTuple, Self
+
+from httpx import Client
+
+from .generics import rpc
+from .logger import logger
+
+_STOP = object()
+
+
+class PushError(NamedTuple):
+    value: dict[str, Any]
+    error: str
+
+
+class PushStats:
+    __slots__ = ["sent", "failed", "batches", "_lock"]
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<PushStats sent={self.sent} failed={self.failed} batches={self.batches}>"
+
+    def record(self, sent: int, failed: int) -> None:
+        with self._lock:
+            self.sent += sent
+            self.failed += failed
+            self.batches += 1
+
+
+class HistoryPusher:
+    """Streams item values into Zabbix 7.x with batched ``history.push`` calls.
+
+    Values are queued by ``push()`` and sent in batches of ``batch_size`` values, or after
+    ``flush_interval`` seconds, whichever comes first, with up to ``max_in_flight`` batches
+    in flight. Memory is bounded: once the queue holds ``max_queue`` values ``push()``
+    blocks until the server catches up. Values the server rejects are reported to
+    ``on_error`` and kept in the ``errors`` ring buffer.
+
+    Example:
+        >>> with HistoryPusher(zbx.client) as pusher:
+        ...     for itemid, value, clock in samples:
+        ...         pusher.push({"itemid": itemid, "value": value, "clock": clock})
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_queue: int = 100_000,
+        max_in_flight: int = 4,
+        on_error: Callable[[PushError], None] | None = None,
+        max_errors: int = 1000,
+    ) -> None:
+        """
+        Initializes the pusher and starts its batching thread.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            batch_size (int, optional): Maximum number of values per ``history.push`` call. Defaults to 1000.
+            flush_interval (float, optional): Maximum seconds a value waits for its batch to fill. Defaults to 1.
+            max_queue (int, optional): Number of queued values after which ``push()`` blocks. Defaults to 100000.
+            max_in_flight (int, optional): Number of concurrent ``history.push`` calls. Defaults to 4.
+            on_error (Callable[[PushError], None], optional): Called for every rejected value. Defaults to None.
+            max_errors (int, optional): Number of most recent errors kept in ``errors``. Defaults to 1000.
+        """
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_error = on_error
+        self.stats = PushStats()
+        self.errors: deque[PushError] = deque(maxlen=max_errors)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="pyzbx-push")
+        self._flushing = threading.Event()
+        self._closed = False
+        self._batcher = threading.Thread(target=self._run, name="pyzbx-push-batcher", daemon=True)
+        self._batcher.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def push(self, value: dict[str, Any], timeout: float | None = None) -> None:
+        """
+        Queues a value, blocking while the queue is full.
+
+        Args:
+            value (dict[str, Any]): A ``history.push`` value, e.g. ``{"itemid": 1, "value": 1.5, "clock": ts}``.
+            timeout (float, optional): Maximum seconds to wait for room in the queue. Defaults to None.
+
+        Raises:
+            queue.Full: If there is still no room after ``timeout`` seconds.
+        """
+        if self._closed:
+            msg = "HistoryPusher is closed"
+            raise RuntimeError(msg)
+        self._queue.put(value, timeout=timeout)
+
+    def flush(self) -> None:
+        """Sends the queued values immediately and waits until every batch has been answered."""
+        self._flushing.set()
+        try:
+            self._queue.join()
+        finally:
+            self._flushing.clear()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self._queue.put(_STOP)
+        self._batcher.join()
+        self._pool.shutdown(wait=True)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+            batch = [first]
+            deadline = monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - monotonic()
+                try:
+                    if self._flushing.is_set() or remaining <= 0:
+                        value = self._queue.get_nowait()
+                    else:
+                        # wake up regularly so that flush() does not wait for the whole interval
+                        value = self._queue.get(timeout=min(remaining, 0.05))
+                except queue.Empty:
+                    if self._flushing.is_set() or remaining <= 0:
+                        break
+                    continue
+                if value is _STOP:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(value)
+            # blocks while max_in_flight batches are pending, which in turn fills the queue
+            self._slots.acquire()
+            self._pool.submit(self._send, batch)
+
+    def _send(self, batch: list[dict[str, Any]]) -> None:
+        # every value is marked done whatever happens, or flush() and close() would wait forever
+        try:
+            try:
+                result = rpc(self.client, "history.push", batch)
+                failed = [
+                    PushError(value, entry["error"])
+                    for value, entry in zip(batch, result.get("data", []), strict=False)
+                    if entry.get("error")
+                ]
+            except Exception as e:  # noqa: BLE001
+                logger.warning("history.push of %d values failed: %s", len(batch), e)
+                failed = [PushError(value, str(e)) for value in batch]
+            finally:
+                self._slots.release()
+            self.stats.record(len(batch) - len(failed), len(failed))
+            for error in failed:
+                self.errors.append(error)
+                if self.on_error is not None:
+                    try:
+                        self.on_error(error)
+                    except Exception:  # noqa: BLE001
+                        logger.exception("on_error callback of HistoryPusher failed")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
@@ -0,0 +1,35 @@
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from .simulator import Faults, Inventory, SimulatorServer
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "zabbix_simulator(faults=None, **inventory): the inventory and faults of the zabbix_simulator fixture",
+    )
+
+
+@pytest.fixture()
+def zabbix_simulator(request: pytest.FixtureRequest) -> Iterator[SimulatorServer]:
+    """A running ``SimulatorServer``, configured with the ``zabbix_simulator`` marker of the test.
+
+    Example:
+        >>> @pytest.mark.zabbix_simulator(hosts=100_000, faults=Faults(error_rate=0.01))
+        ... def test_paging(zabbix_simulator):
+        ...     zbx = ZabbixClient(zabbix_simulator.url, token="test")
+    """
+    marker = request.node.get_closest_marker("zabbix_simulator")
+    options = dict(marker.kwargs) if marker else {}
+    faults = options.pop("faults", None) or Faults()
+    with SimulatorServer(Inventory(**options), faults) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            thread.join()
@@ -0,0 +1,345 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import httpx
+
+from .generics import api_url
+
+DEFAULT_REDACTED = frozenset({"password", "passwd", "sessionid", "token", "auth"})
+DEFAULT_MAX_RECORDED = 64 * 1024 * 1024
+_MASK = "***"
+
+
+class Record(NamedTuple):
+    offset: float
+    method: str
+    params: Any
+    status: int
+    elapsed: float
+    response: str
+
+    @property
+    def key(self) -> str:
+        return _request_key(self.method, self.params)
+
+
+def read_records(path: str | Path) -> Iterator[Record]:
+    """Yields the records of a recording file, in recording order."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield Record(*json.loads(line))
+
+
+def redact(value: Any, keys: Collection[str]) -> Any:
+    """Returns ``value`` with the values of ``keys`` replaced, at any depth."""
+    if isinstance(value, dict):
+        return {k: _MASK if k in keys else redact(v, keys) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v, keys) for v in value]
+    return value
+
+
+def _redact_body(method: str, text: str, keys: Collection[str]) -> str:
+    """Masks the values of ``keys`` in a response body, e.g. the ``sessionid`` of ``user.checkAuthentication``."""
+    try:
+        body = json.loads(text)
+    except ValueError:
+        return text
+    redacted = redact(body, keys)
+    if method == "user.login" and isinstance(redacted, dict) and isinstance(redacted.get("result"), str):
+        # the session token
+        redacted["result"] = _MASK
+    return text if redacted == body else json.dumps(redacted, ensure_ascii=False)
+
+
+def _unrecorded(reason: str) -> str:
+    """The body recorded instead of a response that was not kept; replaying it fails the call."""
+    error = {"code": -32000, "message": "Response not recorded.", "data": reason}
+    return json.dumps({"jsonrpc": "2.0", "error": error, "id": None})
+
+
+def _request_key(method: str, params: Any) -> str:
+    return method + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+def _parse_request(content: bytes) -> tuple[str, Any]:
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return "", None
+    if not isinstance(body, dict):
+        return "", body
+    return body.get("method", ""), body.get("params")
+
+
+class _TeeStream(httpx.SyncByteStream):
+    """Passes the body of a response through while keeping a copy of it, up to ``limit`` bytes."""
+
+    def __init__(self, stream: httpx.SyncByteStream, limit: int, on_close: Callable[[bytes | None, str], None]) -> None:
+        self._stream = stream
+        self._limit = limit
+        self._on_close = on_close
+        self._chunks: list[bytes] | None = []
+        self._size = 0
+        self._complete = False
+        self._closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._size += len(chunk)
+            if self._chunks is not None:
+                if self._size > self._limit:
+                    self._chunks = None
+                else:
+                    self._chunks.append(chunk)
+            yield chunk
+        self._complete = True
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._stream.close()
+        finally:
+            if not self._complete:
+                self._on_close(None, f"the client closed the response after {self._size} bytes")
+            elif self._chunks is None:
+                self._on_close(None, f"{self._size} bytes, over the recording limit of {self._limit}")
+            else:
+                self._on_close(b"".join(self._chunks), "")
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """An httpx transport recording every API call it forwards.
+
+    Each call is appended to a gzip compressed JSON lines file as ``[offset, method, params,
+    status, elapsed, response]``, ``offset`` being the seconds since the recording started.
+    Values of the ``redact`` keys are masked in the parameters and in the responses, as is
+    the session token returned by ``user.login``, and HTTP headers are never recorded, so
+    the file holds no credentials.
+
+    Responses are passed to the client as they arrive, so streamed reads and a
+    ``MemoryBudget`` keep working; a copy of the body, up to ``max_recorded`` bytes, is
+    redacted and recorded when the client closes the response. A response over that size,
+    or closed before its end (e.g. aborted by a memory budget), is recorded as a JSON-RPC
+    error instead, since a partial body could not be redacted.
+
+    Example:
+        >>> transport = RecordingTransport("traffic.jsonl.gz")
+        >>> zbx = ZabbixClient(url, token=token, session=httpx.Client(transport=transport))
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        transport: httpx.BaseTransport | None = None,
+        redact: Collection[str] = DEFAULT_REDACTED,
+        redact_response: Callable[[str, str], str] | None = None,
+        max_recorded: int = DEFAULT_MAX_RECORDED,
+    ) -> None:
+        """
+        Opens the recording file for appending.
+
+        Args:
+            path (str | Path): The recording file.
+            transport (httpx.BaseTransport, optional): The transport actually sending the requests.
+                Defaults to ``httpx.HTTPTransport()``.
+            redact (Collection[str], optional): Parameter and response keys masked in the recording. Defaults
+                to password, passwd, sessionid, token and auth.
+            redact_response (Callable[[str, str], str], optional): Called with the method and the response
+                body, returns the body to record. Defaults to None.
+            max_recorded (int, optional): Largest response body kept for the recording, in bytes. Defaults
+                to 64 MiB.
+        """
+        self.transport = transport or httpx.HTTPTransport()
+        self.redact = frozenset(redact)
+        self.redact_response = redact_response
+        self.max_recorded = max_recorded
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        method, params = _parse_request(request.read())
+        started = time.monotonic()
+        response = self.transport.handle_request(request)
+
+        def record(body: bytes | None, reason: str) -> None:
+            elapsed = time.monotonic() - started
+            if body is None:
+                text = _unrecorded(reason)
+            else:
+                # the copy is still encoded as sent, e.g. gzip
+                encoded = httpx.Response(response.status_code, headers=response.headers, content=body)
+                text = _redact_body(method, encoded.read().decode("utf-8", errors="replace"), self.redact)
+                if self.redact_response is not None:
+                    text = self.redact_response(method, text)
+            line = [round(started - self._started, 6), method, redact(params, self.redact)]
+            line += [response.status_code, round(elapsed, 6), text]
+            with self._lock:
+                self._file.write(json.dumps(line, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_TeeStream(response.stream, self.max_recorded, record),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+class _Recordings:
+    """Recorded responses by request; identical requests are answered in recording order, cycling."""
+
+    def __init__(self, path: str | Path, speed: float | None) -> None:
+        self.speed = speed
+        self._records: dict[str, deque[Record]] = defaultdict(deque)
+        self._by_method: dict[str, deque[Record]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for record in read_records(path):
+            self._records[record.key].append(record)
+            self._by_method[record.method].append(record)
+
+    def answer(self, content: bytes) -> tuple[int, bytes]:
+        method, params = _parse_request(content)
+        with self._lock:
+            # requests with masked or changed parameters fall back to the responses of the same method
+            records = self._records.get(_request_key(method, params)) or self._by_method.get(method)
+            if not records:
+                body = {
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32601, "message": "Method not found.", "data": f"No recording of {method}."},
+                    "id": 1,
+                }
+                return httpx.codes.OK, json.dumps(body).encode()
+            record = records[0]
+            records.rotate(-1)
+        if self.speed:
+            time.sleep(record.elapsed / self.speed)
+        return record.status, record.response.encode()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """An httpx transport answering requests from a recording instead of a Zabbix server.
+
+    A request is answered with the recorded response of the same method and parameters,
+    or else of the same method, after the recorded server time divided by ``speed``
+    (``speed=None`` answers immediately).
+
+    Example:
+        >>> client = httpx.Client(base_url=url, transport=ReplayTransport("traffic.jsonl.gz", speed=2))
+    """
+
+    def __init__(self, path: str | Path, speed: float | None = 1.0) -> None:
+        self._recordings = _Recordings(path, speed)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        status, body = self._recordings.answer(request.read())
+        return httpx.Response(status, headers={"Content-Type": "application/json"}, content=body, request=request)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """An HTTP server answering JSON-RPC requests from a recording, see ``ReplayTransport``.
+
+    Example:
+        >>> with ReplayServer("traffic.jsonl.gz", port=8080) as server:
+        ...     threading.Thread(target=server.serve_forever, daemon=True).start()
+        ...     zbx = ZabbixClient("http://127.0.0.1:8080", token="replay")
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str | Path, host: str = "127.0.0.1", port: int = 0, speed: float | None = 1.0) -> None:
+        self.recordings = _Recordings(path, speed)
+        super().__init__((host, port), _ReplayHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+
+    # named by BaseHTTPRequestHandler after the HTTP method
+    def do_POST(self) -> None:  # noqa: N802
+        content = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, body = self.server.recordings.answer(content)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+class PlayResult(NamedTuple):
+    method: str
+    scheduled: float
+    latency: float
+    error: str | None
+
+
+def play(
+    client: httpx.Client,
+    path: str | Path,
+    speed: float | None = 1.0,
+    workers: int = 8,
+    methods: Collection[str] | None = None,
+) -> list[PlayResult]:
+    """
+    Re-issues the calls of a recording against ``client`` to reproduce its load.
+
+    Calls are started at their recorded offsets divided by ``speed`` (``None`` starts
+    them as fast as ``workers`` threads allow) and their latency is measured.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``, or one using a ``ReplayTransport``.
+        path (str | Path): The recording file.
+        speed (float, optional): Time scale of the original schedule. Defaults to 1.
+        workers (int, optional): Maximum number of concurrent calls. Defaults to 8.
+        methods (Collection[str], optional): Only replay these methods, e.g. only the reads. Defaults to None.
+
+    Returns:
+        list[PlayResult]: The latency and error, if any, of every call in recording order.
+    """
+    url = api_url(client)
+    records = [r for r in read_records(path) if r.method and (methods is None or r.method in methods)]
+    started = time.monotonic()
+
+    def _call(record: Record) -> PlayResult:
+        scheduled = record.offset / speed if speed else 0.0
+        if (delay := started + scheduled - time.monotonic()) > 0:
+            time.sleep(delay)
+        sent = time.monotonic()
+        error = None
+        try:
+            payload = {"jsonrpc": "2.0", "method": record.method, "params": record.params, "id": 1}
+            r = client.post(url, json=payload)
+            r.raise_for_status()
+            if isinstance(body := r.json(), dict) and "error" in body:
+                error = str(body["error"].get("data") or body["error"].get("message"))
+        except httpx.HTTPError as e:
+            error = str(e)
+        return PlayResult(record.method, scheduled, time.monotonic() - sent, error)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyzbx-play") as pool:
+        return list(pool.map(_call, records))
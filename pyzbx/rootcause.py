@@ -0,0 +1,365 @@
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import Any, NamedTuple
+
+from httpx import Client
+
+from .generics import chunked, paginate, rpc
+
+# resource types of triggers and hosts as reported by auditlog.get
+_AUDIT_TRIGGER = 13
+_AUDIT_HOST = 4
+_AUDIT_ACTION_DELETE = 2
+_TRIGGER_PARAMS: dict[str, Any] = {
+    "output": ["triggerid"],
+    "selectDependencies": ["triggerid"],
+    "selectHosts": ["hostid"],
+    "templated": False,
+}
+
+
+class BlastRadius(NamedTuple):
+    triggerids: list[int]
+    hostids: list[int]
+
+
+class _Csr(NamedTuple):
+    """Compressed rows: the neighbours of row ``i`` are ``indices[offsets[i]:offsets[i + 1]]``.
+
+    Rows replaced since the build are kept in ``changed`` and shadow the compressed ones;
+    rows past the compressed ones are empty until they are replaced.
+    """
+
+    offsets: array
+    indices: array
+    changed: dict[int, array]
+
+    @classmethod
+    def build(cls, rows: int, pairs: Iterable[tuple[int, int]]) -> "_Csr":
+        """Builds the rows of ``(row, column)`` pairs with a counting sort."""
+        pairs = list(pairs)
+        offsets = array("i", bytes(4 * (rows + 1)))
+        for row, _ in pairs:
+            offsets[row + 1] += 1
+        for i in range(rows):
+            offsets[i + 1] += offsets[i]
+        indices = array("i", bytes(4 * len(pairs)))
+        cursor = array("i", offsets[:-1])
+        for row, column in pairs:
+            indices[cursor[row]] = column
+            cursor[row] += 1
+        return cls(offsets, indices, {})
+
+    def row(self, i: int) -> array:
+        if (changed := self.changed.get(i)) is not None:
+            return changed
+        if i + 1 < len(self.offsets):
+            return self.indices[self.offsets[i] : self.offsets[i + 1]]
+        return array("i")
+
+    def replace(self, i: int, columns: Iterable[int]) -> None:
+        self.changed[i] = array("i", columns)
+
+    def add(self, i: int, column: int) -> None:
+        self.replace(i, [*self.row(i), column])
+
+    def discard(self, i: int, column: int) -> None:
+        self.replace(i, [c for c in self.row(i) if c != column])
+
+
+class TriggerGraph:
+    """Trigger dependencies and trigger hosts as integer-indexed adjacency arrays.
+
+    ``load()`` reads every host trigger with its dependencies and hosts in a few paged
+    ``trigger.get`` calls. Triggers and hosts are numbered by ascending ID and the edges
+    are kept as compressed rows of ``array`` indices in both directions, so root-cause and
+    blast-radius queries only walk integer arrays. ``update()`` and ``sync()`` refetch
+    changed triggers and replace only their rows and the rows of their neighbours; new
+    triggers and hosts are numbered after the others. The arrays are rebuilt once the
+    replaced rows outnumber a quarter of the triggers, so a change costs its degree
+    rather than the size of the graph.
+
+    Example:
+        >>> graph = TriggerGraph(zbx.client)
+        >>> graph.load()
+        >>> graph.root_causes([int(p["objectid"]) for p in zbx.problem.get(ProblemGet(recent=False))])
+    """
+
+    def __init__(self, client: Client, chunk_size: int = 1000) -> None:
+        """
+        Initializes an empty graph.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            chunk_size (int, optional): Number of triggers fetched per get call. Defaults to 1000.
+        """
+        self.client = client
+        self.chunk_size = chunk_size
+        self.last_clock: int | None = None
+        self.triggerids = array("q")
+        self.hostids = array("q")
+        self._build({})
+
+    def __len__(self) -> int:
+        return len(self.triggerids) - len(self._deleted)
+
+    def load(self) -> int:
+        """
+        Reads all host triggers, replacing the graph.
+
+        Returns:
+            int: The number of triggers loaded.
+        """
+        started = int(time.time())
+        rows = _rows(paginate(self.client, "trigger", _TRIGGER_PARAMS, self.chunk_size))
+        self._build(rows)
+        self.last_clock = started
+        return len(rows)
+
+    def update(self, triggerids: Iterable[int]) -> int:
+        """
+        Refetches ``triggerids``; those no longer returned by the server are removed, with
+        the dependencies on them.
+
+        Returns:
+            int: The number of triggers fetched.
+        """
+        changed = {int(triggerid) for triggerid in triggerids}
+        fetched: dict[int, tuple[list[int], list[int]]] = {}
+        for chunk in chunked(sorted(changed), self.chunk_size):
+            fetched.update(_rows(rpc(self.client, "trigger.get", {**_TRIGGER_PARAMS, "triggerids": chunk})))
+        for triggerid in sorted(changed):
+            if triggerid in fetched:
+                self._replace(triggerid, *fetched[triggerid])
+            else:
+                self._remove(triggerid)
+        replaced = sum(len(csr.changed) for csr in self._csrs())
+        if replaced > len(self.triggerids) // 4:
+            self._build(self._rows())
+        return len(fetched)
+
+    def sync(self) -> int:
+        """
+        Applies the trigger changes recorded in ``auditlog.get`` since the last load or sync.
+
+        The triggers of a deleted host are deleted with it without audit entries of their own,
+        so they are refetched too.
+
+        Returns:
+            int: The number of triggers fetched.
+        """
+        if self.last_clock is None:
+            return self.load()
+        entries = rpc(
+            self.client,
+            "auditlog.get",
+            {
+                "output": ["clock", "action", "resourcetype", "resourceid"],
+                "filter": {"resourcetype": [_AUDIT_TRIGGER, _AUDIT_HOST]},
+                "time_from": self.last_clock,
+                "sortfield": "clock",
+                "sortorder": "ASC",
+            },
+        )
+        if not entries:
+            return 0
+        changed = {int(entry["resourceid"]) for entry in entries if int(entry["resourcetype"]) == _AUDIT_TRIGGER}
+        deleted_hosts = [
+            h
+            for entry in entries
+            if int(entry["resourcetype"]) == _AUDIT_HOST and int(entry["action"]) == _AUDIT_ACTION_DELETE
+            if (h := self._find_host(int(entry["resourceid"]))) is not None
+        ]
+        changed.update(self.triggerids[i] for h in deleted_hosts for i in self._host_triggers.row(h))
+        fetched = self.update(changed)
+        self.last_clock = max(int(entry["clock"]) for entry in entries)
+        return fetched
+
+    def dependencies(self, triggerid: int) -> list[int]:
+        """Returns the triggers ``triggerid`` directly depends on."""
+        return [self.triggerids[j] for j in self._depends_on.row(self._index(triggerid))]
+
+    def dependents(self, triggerid: int) -> list[int]:
+        """Returns the triggers directly depending on ``triggerid``."""
+        return [self.triggerids[j] for j in self._dependents.row(self._index(triggerid))]
+
+    def root_causes(self, problem_triggerids: Iterable[int]) -> dict[int, list[int]]:
+        """
+        Finds the root causes of the problems of ``problem_triggerids``.
+
+        A problem is a root cause when none of the triggers it depends on, directly or
+        transitively, is in problem. Every other problem is caused by the root-cause
+        problems found upstream of it.
+
+        Args:
+            problem_triggerids (Iterable[int]): Triggers currently in problem state.
+
+        Returns:
+            dict[int, list[int]]: The root-cause triggers of every problem trigger; root causes map to themselves.
+        """
+        problems = {int(triggerid) for triggerid in problem_triggerids}
+        index = {i: triggerid for triggerid in problems if (i := self._find(triggerid)) is not None}
+        upstream_problem: dict[int, bool] = {}
+        result = {triggerid: [triggerid] for triggerid in problems}
+        for i, triggerid in index.items():
+            roots: set[int] = set()
+            seen = {i}
+            stack = list(self._depends_on.row(i))
+            while stack:
+                j = stack.pop()
+                if j in seen:
+                    continue
+                seen.add(j)
+                if j in index and not self._has_upstream_problem(j, index, upstream_problem):
+                    roots.add(index[j])
+                stack.extend(self._depends_on.row(j))
+            if roots:
+                result[triggerid] = sorted(roots)
+        return result
+
+    def blast_radius(self, hostids: int | Sequence[int]) -> BlastRadius:
+        """
+        Finds the triggers and hosts affected by a failure of ``hostids``.
+
+        These are the triggers of the hosts and every trigger depending on them, directly or
+        transitively, and the hosts of all those triggers.
+
+        Returns:
+            BlastRadius: The affected trigger and host IDs, sorted.
+        """
+        hostids = [hostids] if isinstance(hostids, int) else hostids
+        stack = []
+        for hostid in hostids:
+            if (h := self._find_host(hostid)) is not None:
+                stack.extend(self._host_triggers.row(h))
+        seen: set[int] = set()
+        while stack:
+            i = stack.pop()
+            if i not in seen:
+                seen.add(i)
+                stack.extend(self._dependents.row(i))
+        hosts = {h for i in seen for h in self._trigger_hosts.row(i)}
+        return BlastRadius(sorted(self.triggerids[i] for i in seen), sorted(self.hostids[h] for h in hosts))
+
+    def _has_upstream_problem(self, i: int, problems: dict[int, int], memo: dict[int, bool]) -> bool:
+        if i in memo:
+            return memo[i]
+        memo[i] = False  # dependency cycles are rejected by the server, but do not recurse forever
+        seen = {i}
+        stack = list(self._depends_on.row(i))
+        while stack:
+            j = stack.pop()
+            if j in seen:
+                continue
+            seen.add(j)
+            if j in problems or memo.get(j):
+                memo[i] = True
+                break
+            stack.extend(self._depends_on.row(j))
+        return memo[i]
+
+    def _find(self, triggerid: int) -> int | None:
+        i = _position(self.triggerids, self._sorted_triggers, self._new_triggers, triggerid)
+        return None if i is None or i in self._deleted else i
+
+    def _find_host(self, hostid: int) -> int | None:
+        return _position(self.hostids, self._sorted_hosts, self._new_hosts, hostid)
+
+    def _trigger(self, triggerid: int) -> int:
+        """Returns the index of ``triggerid``, numbering it if it is new."""
+        i = _position(self.triggerids, self._sorted_triggers, self._new_triggers, triggerid)
+        if i is None:
+            i = self._new_triggers[triggerid] = len(self.triggerids)
+            self.triggerids.append(triggerid)
+        self._deleted.discard(i)
+        return i
+
+    def _host(self, hostid: int) -> int:
+        """Returns the index of ``hostid``, numbering it if it is new."""
+        if (h := self._find_host(hostid)) is None:
+            h = self._new_hosts[hostid] = len(self.hostids)
+            self.hostids.append(hostid)
+        return h
+
+    def _replace(self, triggerid: int, dependencies: list[int], hostids: list[int]) -> None:
+        i = self._trigger(triggerid)
+        for csr, reverse, new in (
+            (self._depends_on, self._dependents, {self._trigger(d) for d in dependencies}),
+            (self._trigger_hosts, self._host_triggers, {self._host(h) for h in hostids}),
+        ):
+            old = set(csr.row(i))
+            for j in old - new:
+                reverse.discard(j, i)
+            for j in new - old:
+                reverse.add(j, i)
+            csr.replace(i, sorted(new))
+
+    def _remove(self, triggerid: int) -> None:
+        if (i := self._find(triggerid)) is None:
+            return
+        for csr, reverse in (
+            (self._depends_on, self._dependents),
+            (self._dependents, self._depends_on),
+            (self._trigger_hosts, self._host_triggers),
+        ):
+            for j in csr.row(i):
+                reverse.discard(j, i)
+            csr.replace(i, ())
+        self._deleted.add(i)
+
+    def _csrs(self) -> tuple[_Csr, ...]:
+        return self._depends_on, self._dependents, self._trigger_hosts, self._host_triggers
+
+    def _index(self, triggerid: int) -> int:
+        if (i := self._find(triggerid)) is None:
+            msg = f"Unknown trigger {triggerid}"
+            raise KeyError(msg)
+        return i
+
+    def _rows(self) -> dict[int, tuple[list[int], list[int]]]:
+        ids, hostids = self.triggerids, self.hostids
+        return {
+            ids[i]: ([ids[j] for j in self._depends_on.row(i)], [hostids[h] for h in self._trigger_hosts.row(i)])
+            for i in range(len(ids))
+            if i not in self._deleted
+        }
+
+    def _build(self, rows: dict[int, tuple[list[int], list[int]]]) -> None:
+        triggerids = sorted(set(rows).union(*(deps for deps, _ in rows.values())))
+        hostids = sorted({hostid for _, hosts in rows.values() for hostid in hosts})
+        trigger_index = {triggerid: i for i, triggerid in enumerate(triggerids)}
+        host_index = {hostid: h for h, hostid in enumerate(hostids)}
+        edges = [(trigger_index[t], trigger_index[d]) for t, (deps, _) in rows.items() for d in deps]
+        hosts = [(trigger_index[t], host_index[h]) for t, (_, host_ids) in rows.items() for h in host_ids]
+        self.triggerids = array("q", triggerids)
+        self.hostids = array("q", hostids)
+        self._depends_on = _Csr.build(len(triggerids), edges)
+        self._dependents = _Csr.build(len(triggerids), ((d, t) for t, d in edges))
+        self._trigger_hosts = _Csr.build(len(triggerids), hosts)
+        self._host_triggers = _Csr.build(len(hostids), ((h, t) for t, h in hosts))
+        # triggers and hosts numbered after the build, which are not sorted, and deleted triggers
+        self._sorted_triggers = len(triggerids)
+        self._sorted_hosts = len(hostids)
+        self._new_triggers: dict[int, int] = {}
+        self._new_hosts: dict[int, int] = {}
+        self._deleted: set[int] = set()
+
+
+def _position(ids: array, sorted_ids: int, new_ids: dict[int, int], objectid: int) -> int | None:
+    """Returns the index of ``objectid`` among the first ``sorted_ids`` sorted IDs or the new ones."""
+    i = bisect_left(ids, objectid, 0, sorted_ids)
+    if i < sorted_ids and ids[i] == objectid:
+        return i
+    return new_ids.get(objectid)
+
+
+def _rows(triggers: Iterable[dict[str, Any]]) -> dict[int, tuple[list[int], list[int]]]:
+    return {
+        int(trigger["triggerid"]): (
+            [int(dep["triggerid"]) for dep in trigger.get("dependencies", [])],
+            [int(host["hostid"]) for host in trigger.get("hosts", [])],
+        )
+        for trigger in triggers
+    }
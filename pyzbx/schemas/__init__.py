@@ -1,6 +1,5 @@
 from .action import *
 from .alert import *
-from .api_info import *
 from .audit_log import *
 from .authentication import *
 from .autoregistration import *
@@ -10,6 +9,7 @@ from .correlation import *
 from .dashboard import *
 from .discovery_check import *
 from .discovery_host import *
+from .discovery_service import *
 from .event import *
 from .graph import *
 from .graph_item import *
@@ -22,6 +22,8 @@ from .hostinterface import *
 from .housekeeping import *
 from .icon_map import *
 from .image import *
+from .item import *
+from .item_prototype import *
 from .lld_rule import *
 from .maintenance import *
 from .map import *
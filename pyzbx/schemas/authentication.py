@@ -0,0 +1,12 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class AuthGet(GetModel, CommonGet):
+    ...
+
+
+class AuthUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class AutoRegGet(GetModel, CommonGet):
+    ...
+
+
+class AutoRegUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
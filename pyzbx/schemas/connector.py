@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ConnectorCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ConnectorGet(GetModel, CommonGet):
+    ...
+
+
+class ConnectorUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class CorrelationCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class CorrelationGet(GetModel, CommonGet):
+    ...
+
+
+class CorrelationUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class DashboardCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class DashboardGet(GetModel, CommonGet):
+    ...
+
+
+class DashboardUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
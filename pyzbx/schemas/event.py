@@ -1,5 +1,7 @@
 from typing import TypedDict
 
+from pydantic import BaseModel, ConfigDict
+
 from ._base import GetModel
 from ._common import CommonGet, Tag
 
@@ -51,3 +53,7 @@ class EventGet(GetModel, CommonGet):
     problem_time_from: int | None = None
     problem_time_till: int | None = None
     value: list[int] | int | None = None
+
+
+class EventAcknowledge(BaseModel):
+    model_config = ConfigDict(extra="allow")
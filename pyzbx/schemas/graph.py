@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class GraphCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class GraphGet(GetModel, CommonGet):
+    ...
+
+
+class GraphUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,6 @@
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class GraphItemGet(GetModel, CommonGet):
+    ...
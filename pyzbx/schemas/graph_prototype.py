@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class GraphPrototypeCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class GraphPrototypeGet(GetModel, CommonGet):
+    ...
+
+
+class GraphPrototypeUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -27,7 +27,23 @@ class LogHistory(History):
     value: str
 
 
-class HostoryGet(GetModel, CommonGet):
+class HistoryPushValue(TypedDict, total=False):
+    """A value for ``history.push``, addressed either by ``itemid`` or by ``host`` and ``key``."""
+
+    itemid: int
+    host: str
+    key: str
+    value: float | int | str
+    clock: int
+    ns: int
+
+
+class HistoryPushResult(TypedDict, total=False):
+    itemid: str
+    error: str
+
+
+class HistoryGet(GetModel, CommonGet):
     history: HistoryType = HistoryType.NumUnsigned
     hostids: list[int] | int | None = None
     itemids: list[int] | int | None = None
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class HostCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostGet(GetModel, CommonGet):
+    ...
+
+
+class HostUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostMassAdd(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostMassRemove(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostMassUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostPrototypeCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostPrototypeGet(GetModel, CommonGet):
+    ...
+
+
+class HostPrototypeUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
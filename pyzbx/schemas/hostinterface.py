@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class HostInterfaceCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostInterfaceGet(GetModel, CommonGet):
+    ...
+
+
+class HostInterfaceUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostInterfaceMassAdd(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostInterfaceMassRemove(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class HostInterfaceMassUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class IconMapCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class IconMapGet(GetModel, CommonGet):
+    ...
+
+
+class IconMapUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ImageCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ImageGet(GetModel, CommonGet):
+    ...
+
+
+class ImageUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
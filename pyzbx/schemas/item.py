@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ItemCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ItemGet(GetModel, CommonGet):
+    ...
+
+
+class ItemUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ItemPrototypeCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ItemPrototypeGet(GetModel, CommonGet):
+    ...
+
+
+class ItemPrototypeUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
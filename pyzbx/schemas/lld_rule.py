@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class DiscoveryRuleCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class DiscoveryRuleGet(GetModel, CommonGet):
+    ...
+
+
+class DiscoveryRuleUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class LldRuleCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class LldRuleGet(GetModel, CommonGet):
+    ...
+
+
+class LldRuleUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class MaintenanceCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class MaintenanceGet(GetModel, CommonGet):
+    ...
+
+
+class MaintenanceUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
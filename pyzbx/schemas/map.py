@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class MapCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class MapGet(GetModel, CommonGet):
+    ...
+
+
+class MapUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
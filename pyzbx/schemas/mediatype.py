@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class MediaTypeCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class MediaTypeGet(GetModel, CommonGet):
+    ...
+
+
+class MediaTypeUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ModuleCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ModuleGet(GetModel, CommonGet):
+    ...
+
+
+class ModuleUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ProxyCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ProxyGet(GetModel, CommonGet):
+    ...
+
+
+class ProxyUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class RegularExpressionCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class RegularExpressionGet(GetModel, CommonGet):
+    ...
+
+
+class RegularExpressionUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ReportCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ReportGet(GetModel, CommonGet):
+    ...
+
+
+class ReportUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
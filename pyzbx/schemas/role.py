@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class RoleCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class RoleGet(GetModel, CommonGet):
+    ...
+
+
+class RoleUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
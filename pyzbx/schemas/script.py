@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ScriptCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ScriptGet(GetModel, CommonGet):
+    ...
+
+
+class ScriptUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ServiceCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ServiceGet(GetModel, CommonGet):
+    ...
+
+
+class ServiceUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
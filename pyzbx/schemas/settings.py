@@ -0,0 +1,12 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class SettingsGet(GetModel, CommonGet):
+    ...
+
+
+class SettingsUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
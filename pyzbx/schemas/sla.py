@@ -0,0 +1,51 @@
+from typing import TypedDict
+
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class SlaGetSli(BaseModel):
+    slaid: int
+    period_from: int | None = None
+    period_to: int | None = None
+    periods: int | None = None
+    serviceids: list[int] | int | None = None
+
+
+class SliPeriod(TypedDict):
+    period_from: int
+    period_to: int
+
+
+class SliExcludedDowntime(TypedDict):
+    name: str
+    period_from: int
+    period_to: int
+
+
+class SliValue(TypedDict):
+    uptime: int
+    downtime: int
+    sli: float
+    error_budget: int
+    excluded_downtimes: list[SliExcludedDowntime]
+
+
+class SlaGetSliResult(TypedDict):
+    periods: list[SliPeriod]
+    serviceids: list[int]
+    sli: list[list[SliValue]]
+
+
+class SlaCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class SlaGet(GetModel, CommonGet):
+    ...
+
+
+class SlaUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class TemplateCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateGet(GetModel, CommonGet):
+    ...
+
+
+class TemplateUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateMassAdd(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateMassRemove(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateMassUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class TemplateDashboardCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateDashboardGet(GetModel, CommonGet):
+    ...
+
+
+class TemplateDashboardUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
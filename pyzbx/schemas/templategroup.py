@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class TemplateGroupCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateGroupGet(GetModel, CommonGet):
+    ...
+
+
+class TemplateGroupUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateGroupMassAdd(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateGroupMassRemove(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TemplateGroupMassUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class TokenCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TokenGet(GetModel, CommonGet):
+    ...
+
+
+class TokenUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class TriggerCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TriggerGet(GetModel, CommonGet):
+    ...
+
+
+class TriggerUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class TriggerPrototypeCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class TriggerPrototypeGet(GetModel, CommonGet):
+    ...
+
+
+class TriggerPrototypeUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class UserCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class UserGet(GetModel, CommonGet):
+    ...
+
+
+class UserUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
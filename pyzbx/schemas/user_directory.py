@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class UserDirectoryCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class UserDirectoryGet(GetModel, CommonGet):
+    ...
+
+
+class UserDirectoryUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class UserGroupCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class UserGroupGet(GetModel, CommonGet):
+    ...
+
+
+class UserGroupUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
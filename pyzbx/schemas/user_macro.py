@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class UserMacroCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class UserMacroGet(GetModel, CommonGet):
+    ...
+
+
+class UserMacroUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
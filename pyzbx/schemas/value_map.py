@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class ValueMapCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class ValueMapGet(GetModel, CommonGet):
+    ...
+
+
+class ValueMapUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+
+from ._base import GetModel
+from ._common import CommonGet
+
+
+class WebScenarioCreate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class WebScenarioGet(GetModel, CommonGet):
+    ...
+
+
+class WebScenarioUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
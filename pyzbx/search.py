@@ -0,0 +1,333 @@
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Collection, Iterable
+from typing import Any
+
+from httpx import Client
+
+from .generics import get_pk, paginate, sort_value
+
+# tag operators and evaluation types of the ``tags`` and ``evaltype`` get parameters
+TAG_CONTAINS = 0
+TAG_EQUALS = 1
+TAG_NOT_LIKE = 2
+TAG_NOT_EQUAL = 3
+TAG_EXISTS = 4
+TAG_NOT_EXISTS = 5
+EVALTYPE_AND_OR = 0
+EVALTYPE_OR = 2
+
+# objects indexed by default, with the fields read and the fields searchable
+OBJECTS: dict[str, tuple[list[str], tuple[str, ...]]] = {
+    "host": (["hostid", "host", "name"], ("host", "name")),
+    "item": (["itemid", "hostid", "key_", "name"], ("key_", "name")),
+}
+_PARAMS = frozenset(
+    {
+        "output",
+        "search",
+        "searchByAny",
+        "searchWildcardsEnabled",
+        "startSearch",
+        "excludeSearch",
+        "filter",
+        "tags",
+        "evaltype",
+        "limit",
+        "sortfield",
+        "sortorder",
+        "preservekeys",
+        "countOutput",
+        "selectTags",
+        "hostids",
+        "itemids",
+    }
+)
+
+_IDS_PARAMS = ("hostids", "itemids")
+
+
+class _FieldIndex:
+    """Lower-cased values of one field, sorted for prefix searches and by trigram for substring searches.
+
+    A row may hold several values, e.g. the ``tag:value`` pairs of its tags; ``values[e]``
+    is a value of row ``rows[e]``.
+    """
+
+    __slots__ = ["values", "rows", "_sorted", "_sorted_entries", "_trigrams"]
+
+    def __init__(self, pairs: Iterable[tuple[str, int]]) -> None:
+        pairs = [(value.lower(), row) for value, row in pairs]
+        self.values = [value for value, _ in pairs]
+        self.rows = array("i", (row for _, row in pairs))
+        order = sorted(range(len(pairs)), key=self.values.__getitem__)
+        self._sorted = [self.values[e] for e in order]
+        self._sorted_entries = array("i", order)
+        trigrams: dict[str, array] = {}
+        for e, value in enumerate(self.values):
+            for trigram in {value[i : i + 3] for i in range(len(value) - 2)}:
+                trigrams.setdefault(trigram, array("i")).append(e)
+        self._trigrams = trigrams
+
+    def prefix(self, prefix: str) -> set[int]:
+        return {self.rows[e] for e in self._prefix_entries(prefix)}
+
+    def contains(self, needle: str) -> set[int]:
+        return {self.rows[e] for e in self._candidates(needle) if needle in self.values[e]}
+
+    def wildcard(self, pattern: str) -> set[int]:
+        """Rows with a value matching ``pattern`` as a whole, ``*`` matching any characters."""
+        pieces = pattern.split("*")
+        regex = re.compile(".*".join(map(re.escape, pieces)), re.DOTALL)
+        candidates = self._prefix_entries(pieces[0]) if pieces[0] else self._candidates(max(pieces, key=len))
+        return {self.rows[e] for e in candidates if regex.fullmatch(self.values[e])}
+
+    def _prefix_entries(self, prefix: str) -> Iterable[int]:
+        start = bisect_left(self._sorted, prefix)
+        end = start
+        while end < len(self._sorted) and self._sorted[end].startswith(prefix):
+            end += 1
+        return self._sorted_entries[start:end]
+
+    def _candidates(self, needle: str) -> Iterable[int]:
+        """Entries that may contain ``needle``: those holding its rarest trigram."""
+        if len(needle) < 3:  # noqa: PLR2004
+            return range(len(self.values))
+        return min((self._trigrams.get(needle[i : i + 3], ()) for i in range(len(needle) - 2)), key=len)
+
+
+class _ObjectIndex:
+    __slots__ = ["pk", "rows", "fields", "tags"]
+
+    def __init__(self, pk: str, rows: list[dict[str, Any]], fields: Collection[str]) -> None:
+        rows.sort(key=lambda row: int(row[pk]))
+        self.pk = pk
+        self.rows = rows
+        self.fields = {field: _FieldIndex((row.get(field) or "", i) for i, row in enumerate(rows)) for field in fields}
+        self.fields["tags"] = _FieldIndex(
+            (f"{tag['tag']}:{tag.get('value', '')}", i) for i, row in enumerate(rows) for tag in row.get("tags", [])
+        )
+        # exact tag names, for the ``tags`` parameter
+        self.tags: dict[str, list[tuple[str, int]]] = {}
+        for i, row in enumerate(rows):
+            for tag in row.get("tags", []):
+                self.tags.setdefault(tag["tag"], []).append((tag.get("value", ""), i))
+
+
+class SearchIndex:
+    """In-process search over hosts and items, answering ``search``-style get calls locally.
+
+    ``refresh()`` reads every object with a minimal output in paged get calls and indexes
+    its searchable fields and its tags. ``get(object_name, params)`` takes the same
+    parameters as the server's get method and applies the same semantics: case-insensitive
+    substring matches, ``startSearch`` prefix matches, ``searchWildcardsEnabled`` patterns,
+    ``searchByAny``, ``excludeSearch``, ``filter`` and ``tags`` with ``evaltype``. Prefixes
+    are binary searches over sorted values and substrings are looked up by trigram. A
+    ``tags`` search field matches ``tag:value`` pairs. Queries reload the index once it is
+    older than ``refresh_interval``: a single query reloads it while concurrent ones are
+    still answered from the previous index.
+
+    Example:
+        >>> index = SearchIndex(zbx.client)
+        >>> index.get("host", {"search": {"name": "web"}, "startSearch": True, "limit": 10})
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        objects: Collection[str] = ("host", "item"),
+        refresh_interval: float = 300.0,
+        page_size: int = 10000,
+    ) -> None:
+        """
+        Initializes an empty index; it is loaded on the first query.
+
+        Args:
+            client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+            objects (Collection[str], optional): The objects to index, among ``OBJECTS``. Defaults to hosts and items.
+            refresh_interval (float, optional): Seconds after which a query reloads the index. Defaults to 300.
+            page_size (int, optional): Number of objects read per get call. Defaults to 10000.
+        """
+        self.client = client
+        self.objects = tuple(objects)
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self.refreshed: float | None = None
+        self._indexes: dict[str, _ObjectIndex] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self) -> dict[str, int]:
+        """
+        Reloads every indexed object.
+
+        Returns:
+            dict[str, int]: The number of objects loaded, per object name.
+        """
+        indexes = {}
+        for object_name in self.objects:
+            output, fields = OBJECTS[object_name]
+            params: dict[str, Any] = {"output": output, "selectTags": ["tag", "value"]}
+            if object_name == "item":
+                params["templated"] = False
+            rows = list(paginate(self.client, object_name, params, self.page_size))
+            indexes[object_name] = _ObjectIndex(get_pk(object_name), rows, fields)
+        with self._lock:
+            self._indexes = indexes
+            self.refreshed = time.monotonic()
+        return {object_name: len(index.rows) for object_name, index in indexes.items()}
+
+    def get(self, object_name: str, params: dict[str, Any]) -> Any:
+        """
+        Answers a get call from the index.
+
+        Args:
+            object_name (str): The API object, e.g. ``"host"``.
+            params (dict[str, Any]): The get parameters; besides the search parameters, ``output``,
+                ``limit``, ``sortfield``, ``sortorder``, ``preservekeys`` and ``countOutput``.
+
+        Returns:
+            Any: The result, as the get call would return it.
+
+        Raises:
+            ValueError: If a parameter or a searched field cannot be answered from the index.
+        """
+        if unsupported := set(params) - _PARAMS:
+            msg = f"Parameters not answered by the search index: {sorted(unsupported)}"
+            raise ValueError(msg)
+        if object_name not in self.objects:
+            msg = f"{object_name} objects are not indexed"
+            raise ValueError(msg)
+        _check_fields(object_name, params)
+        self._maybe_refresh()
+        with self._lock:
+            index = self._indexes[object_name]
+        rows = self._select(index, params)
+        if params.get("countOutput"):
+            return str(len(rows))
+        result = [index.rows[i] for i in sorted(rows)]
+        if sortfield := params.get("sortfield"):
+            _sort(result, sortfield, params.get("sortorder"))
+        if limit := params.get("limit"):
+            result = result[: int(limit)]
+        output = params.get("output", "extend")
+        if output != "extend":
+            keep = {*output, "tags"} if params.get("selectTags") else set(output)
+            result = [{key: value for key, value in row.items() if key in keep} for row in result]
+        elif not params.get("selectTags"):
+            result = [{key: value for key, value in row.items() if key != "tags"} for row in result]
+        if params.get("preservekeys"):
+            return {row[index.pk]: row for row in result}
+        return result
+
+    def _select(self, index: _ObjectIndex, params: dict[str, Any]) -> set[int]:
+        rows = self._search(index, params)
+        if (tags := params.get("tags")) is not None:
+            rows &= _match_tags(index, tags, int(params.get("evaltype", EVALTYPE_AND_OR)))
+        for ids in _IDS_PARAMS:
+            if ids in params:
+                accepted = {str(i) for i in (params[ids] if isinstance(params[ids], list) else [params[ids]])}
+                rows = {i for i in rows if index.rows[i].get(ids[:-1]) in accepted}
+        if filters := params.get("filter"):
+            rows = {i for i in rows if _matches_filter(index.rows[i], filters)}
+        return rows
+
+    def _search(self, index: _ObjectIndex, params: dict[str, Any]) -> set[int]:
+        if not (search := params.get("search")):
+            return set(range(len(index.rows)))
+        wildcards = params.get("searchWildcardsEnabled")
+        start = params.get("startSearch")
+        matches = []
+        for field, patterns in search.items():
+            if field not in index.fields:
+                msg = f"Field {field!r} is not indexed"
+                raise ValueError(msg)
+            field_index = index.fields[field]
+            rows: set[int] = set()
+            for pattern in [patterns] if isinstance(patterns, str) else patterns:
+                pattern = pattern.lower()  # noqa: PLW2901
+                if wildcards:
+                    rows |= field_index.wildcard(pattern)
+                else:
+                    rows |= field_index.prefix(pattern) if start else field_index.contains(pattern)
+            matches.append(rows)
+        rows = set.union(*matches) if params.get("searchByAny") else set.intersection(*matches)
+        return set(range(len(index.rows))) - rows if params.get("excludeSearch") else rows
+
+    def _maybe_refresh(self) -> None:
+        if self.refreshed is not None and time.monotonic() - self.refreshed < self.refresh_interval:
+            return
+        # a stale index keeps answering while one query reloads it; without an index, queries wait for it
+        if not self._refresh_lock.acquire(blocking=self.refreshed is None):
+            return
+        try:
+            if self.refreshed is None or time.monotonic() - self.refreshed >= self.refresh_interval:
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+
+def _sort(rows: list[dict[str, Any]], sortfield: str | list[str], sortorder: str | list[str] | None) -> None:
+    """Sorts ``rows`` in place like the server: a list ``sortorder`` gives the order of each field."""
+    fields = [sortfield] if isinstance(sortfield, str) else sortfield
+    orders = sortorder if isinstance(sortorder, list) else [sortorder or "ASC"] * len(fields)
+    # stable sorts from the last field to the first
+    for field, order in reversed(list(zip(fields, orders, strict=False))):
+        rows.sort(key=lambda row, field=field: sort_value(row, field), reverse=order == "DESC")
+
+
+def _check_fields(object_name: str, params: dict[str, Any]) -> None:
+    """Rejects parameters naming fields the index does not read, which would otherwise match nothing."""
+    read = set(OBJECTS[object_name][0])
+    output = params.get("output", "extend")
+    sortfield = params.get("sortfield") or []
+    named = {
+        "filter": set(params.get("filter") or ()),
+        "sortfield": {sortfield} if isinstance(sortfield, str) else set(sortfield),
+        "output": set() if output == "extend" else {output} if isinstance(output, str) else set(output),
+    }
+    for param, fields in named.items():
+        if unknown := fields - read:
+            msg = f"{param} fields not read by the {object_name} index: {sorted(unknown)}"
+            raise ValueError(msg)
+    for ids in _IDS_PARAMS:
+        if ids in params and ids[:-1] not in read:
+            msg = f"{ids} cannot be answered by the {object_name} index, it has no {ids[:-1]} field"
+            raise ValueError(msg)
+
+
+def _match_tags(index: _ObjectIndex, conditions: list[dict[str, Any]], evaltype: int) -> set[int]:
+    everything = set(range(len(index.rows)))
+    by_tag: dict[str, set[int]] = {}
+    for condition in conditions:
+        name = condition["tag"]
+        value = str(condition.get("value", ""))
+        operator = int(condition.get("operator", TAG_CONTAINS))
+        values = index.tags.get(name, [])
+        if operator in (TAG_EXISTS, TAG_NOT_EXISTS):
+            rows = {i for _, i in values}
+        elif operator in (TAG_EQUALS, TAG_NOT_EQUAL):
+            # equality is case-sensitive on the server, like is not
+            rows = {i for v, i in values if v == value}
+        else:
+            rows = {i for v, i in values if value.lower() in v.lower()}
+        if operator in (TAG_NOT_LIKE, TAG_NOT_EQUAL, TAG_NOT_EXISTS):
+            rows = everything - rows
+        # conditions on the same tag name are alternatives, conditions on different names must all hold
+        by_tag.setdefault(name, set()).update(rows)
+    if not by_tag:
+        return everything
+    if evaltype == EVALTYPE_OR:
+        return set.union(*by_tag.values())
+    return set.intersection(*by_tag.values())
+
+
+def _matches_filter(row: dict[str, Any], filters: dict[str, Any]) -> bool:
+    for field, values in filters.items():
+        accepted = {str(v) for v in (values if isinstance(values, list) else [values])}
+        if str(row.get(field)) not in accepted:
+            return False
+    return True
@@ -0,0 +1,322 @@
+import asyncio
+import json
+import re
+import socket
+import struct
+import time
+import zlib
+from collections.abc import Iterable, Mapping
+from typing import Any, NamedTuple, Self
+
+from httpx import Client
+
+from .generics import rpc
+from .logger import logger
+
+ZBX_HEADER = b"ZBXD"
+FLAG_PROTOCOL = 0x01
+FLAG_COMPRESSED = 0x02
+FLAG_LARGE = 0x04
+# payloads above this size need the large packet header with 64 bit lengths
+_MAX_SMALL_PACKET = 0xFFFFFFFF
+DEFAULT_PORT = 10051
+
+_INFO_RE = re.compile(r"processed: (\d+); failed: (\d+); total: (\d+); seconds spent: ([\d.]+)")
+
+
+class SenderValue(NamedTuple):
+    host: str
+    key: str
+    value: Any
+    clock: int | None = None
+    ns: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {"host": self.host, "key": self.key, "value": str(self.value)}
+        if self.clock is not None:
+            data["clock"] = self.clock
+            data["ns"] = self.ns or 0
+        return data
+
+
+class SenderResponse(NamedTuple):
+    processed: int
+    failed: int
+    total: int
+    seconds: float
+    response: str
+
+    @classmethod
+    def parse(cls, body: dict[str, Any]) -> "SenderResponse":
+        if match := _INFO_RE.search(body.get("info", "")):
+            processed, failed, total, seconds = match.groups()
+            return cls(int(processed), int(failed), int(total), float(seconds), body.get("response", ""))
+        return cls(0, 0, 0, 0.0, body.get("response", ""))
+
+    def merge(self, other: "SenderResponse") -> "SenderResponse":
+        responses = (self.response, other.response)
+        # a rejected packet fails the merged response, even if other packets succeeded
+        ok = next((r for r in ("failed", "success") if r in responses), other.response)
+        return SenderResponse(
+            self.processed + other.processed,
+            self.failed + other.failed,
+            self.total + other.total,
+            self.seconds + other.seconds,
+            ok,
+        )
+
+
+EMPTY_RESPONSE = SenderResponse(0, 0, 0, 0.0, "")
+
+
+def pack(data: bytes, compress: bool = False, large: bool = False) -> bytes:
+    """
+    Frames ``data`` with the ``ZBXD`` trapper protocol header.
+
+    Args:
+        data (bytes): The JSON payload.
+        compress (bool, optional): Compress the payload with zlib. Defaults to False.
+        large (bool, optional): Force the large packet header; it is used automatically when needed.
+            Defaults to False.
+
+    Returns:
+        bytes: The header followed by the (compressed) payload.
+    """
+    flags = FLAG_PROTOCOL
+    payload = data
+    reserved = 0
+    if compress:
+        flags |= FLAG_COMPRESSED
+        payload = zlib.compress(data)
+        reserved = len(data)
+    if large or max(len(payload), reserved) > _MAX_SMALL_PACKET:
+        flags |= FLAG_LARGE
+        return ZBX_HEADER + struct.pack("<BQQ", flags, len(payload), reserved) + payload
+    return ZBX_HEADER + struct.pack("<BII", flags, len(payload), reserved) + payload
+
+
+def header_size(flags: int) -> int:
+    """Returns the number of length bytes following the 5 byte ``ZBXD<flags>`` prefix."""
+    return 16 if flags & FLAG_LARGE else 8
+
+
+def unpack(flags: int, lengths: bytes, payload: bytes) -> bytes:
+    """Returns the decompressed payload of a packet given its flags and length bytes."""
+    fmt = "<QQ" if flags & FLAG_LARGE else "<II"
+    _, reserved = struct.unpack(fmt, lengths)
+    if flags & FLAG_COMPRESSED:
+        data = zlib.decompress(payload)
+        if len(data) != reserved:
+            msg = f"Decompressed size {len(data)} does not match header size {reserved}"
+            raise ValueError(msg)
+        return data
+    return payload
+
+
+def _payload_length(flags: int, lengths: bytes) -> int:
+    return struct.unpack("<QQ" if flags & FLAG_LARGE else "<II", lengths)[0]
+
+
+def _check_prefix(prefix: bytes) -> int:
+    if len(prefix) != 5 or prefix[:4] != ZBX_HEADER:  # noqa: PLR2004
+        msg = f"Invalid trapper response header: {prefix!r}"
+        raise ValueError(msg)
+    return prefix[4]
+
+
+def _request(values: Iterable[SenderValue]) -> bytes:
+    body = {"request": "sender data", "data": [value.to_dict() for value in values], "clock": int(time.time())}
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+class ZabbixSender:
+    """Blocking client of the trapper port, for scripts that send values occasionally."""
+
+    def __init__(
+        self, server: str = "127.0.0.1", port: int = DEFAULT_PORT, timeout: float = 10.0, compress: bool = False
+    ) -> None:
+        self.server = server
+        self.port = port
+        self.timeout = timeout
+        self.compress = compress
+
+    def send(self, values: Iterable[SenderValue]) -> SenderResponse:
+        packet = pack(_request(values), compress=self.compress)
+        with socket.create_connection((self.server, self.port), timeout=self.timeout) as sock:
+            sock.sendall(packet)
+            flags = _check_prefix(_recv_exactly(sock, 5))
+            lengths = _recv_exactly(sock, header_size(flags))
+            payload = _recv_exactly(sock, _payload_length(flags, lengths))
+        return SenderResponse.parse(json.loads(unpack(flags, lengths, payload)))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            msg = "Connection closed by the trapper before the response was complete"
+            raise ConnectionError(msg)
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class _Batch:
+    __slots__ = ["pending", "size", "started"]
+
+    def __init__(self) -> None:
+        self.pending: list[SenderValue] = []
+        self.size = 0
+        self.started = time.monotonic()
+
+
+class AsyncSender:
+    """Asynchronous trapper client batching values per destination.
+
+    Values are grouped per destination server or proxy (see ``routes``) and sent when a
+    batch reaches ``batch_size`` values or ``max_bytes`` bytes, or has waited
+    ``flush_interval`` seconds. The trapper answers one request per connection, so each
+    batch uses its own connection; at most ``max_in_flight`` batches are sent at a time.
+    The processed/failed counters of all answers are accumulated in ``totals``.
+
+    Example:
+        >>> async with AsyncSender("zabbix.example.com", routes=routes_from_proxies(zbx.client)) as sender:
+        ...     await sender.send(SenderValue("web01", "app.requests", 42))
+    """
+
+    def __init__(
+        self,
+        server: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        routes: Mapping[str, tuple[str, int]] | None = None,
+        batch_size: int = 250,
+        max_bytes: int = 1024 * 1024,
+        flush_interval: float = 0.2,
+        max_in_flight: int = 8,
+        timeout: float = 10.0,
+        compress: bool = False,
+    ) -> None:
+        """
+        Initializes the sender.
+
+        Args:
+            server (str, optional): Default destination. Defaults to "127.0.0.1".
+            port (int, optional): Port of the default destination. Defaults to 10051.
+            routes (Mapping[str, tuple[str, int]], optional): Destination per host name, e.g. the proxy
+                monitoring the host, as built by ``routes_from_proxies``. Defaults to None.
+            batch_size (int, optional): Maximum number of values per packet. Defaults to 250.
+            max_bytes (int, optional): Maximum approximate payload size per packet. Defaults to 1 MiB.
+            flush_interval (float, optional): Maximum seconds a value waits for its batch to fill. Defaults to 0.2.
+            max_in_flight (int, optional): Maximum number of concurrent connections. Defaults to 8.
+            timeout (float, optional): Connect and response timeout in seconds. Defaults to 10.
+            compress (bool, optional): Compress packets with zlib. Defaults to False.
+        """
+        self.default = (server, port)
+        self.routes = dict(routes or {})
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.compress = compress
+        self.totals = EMPTY_RESPONSE
+        self._batches: dict[tuple[str, int], _Batch] = {}
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._tasks: set[asyncio.Task] = set()
+        self._ticker: asyncio.Task | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def send(self, value: SenderValue) -> None:
+        """Queues ``value`` for its destination, sending the batch once it is full."""
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self._tick())
+        target = self.routes.get(value.host, self.default)
+        batch = self._batches.setdefault(target, _Batch())
+        batch.pending.append(value)
+        batch.size += len(value.host) + len(value.key) + len(str(value.value)) + 64
+        if len(batch.pending) >= self.batch_size or batch.size >= self.max_bytes:
+            await self._submit(target)
+
+    async def flush(self) -> None:
+        """Sends every pending batch and waits for all answers."""
+        for target in list(self._batches):
+            await self._submit(target)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        await self.flush()
+
+    async def send_batch(self, target: tuple[str, int], values: list[SenderValue]) -> SenderResponse:
+        """Sends ``values`` to ``target`` in a single packet and returns the parsed answer."""
+        packet = pack(_request(values), compress=self.compress)
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(*target), self.timeout)
+        try:
+            writer.write(packet)
+            await writer.drain()
+            flags = _check_prefix(await asyncio.wait_for(reader.readexactly(5), self.timeout))
+            lengths = await asyncio.wait_for(reader.readexactly(header_size(flags)), self.timeout)
+            payload = await asyncio.wait_for(reader.readexactly(_payload_length(flags, lengths)), self.timeout)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        return SenderResponse.parse(json.loads(unpack(flags, lengths, payload)))
+
+    async def _submit(self, target: tuple[str, int]) -> None:
+        batch = self._batches.pop(target, None)
+        if not batch or not batch.pending:
+            return
+        await self._slots.acquire()
+        task = asyncio.create_task(self._send(target, batch.pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, target: tuple[str, int], values: list[SenderValue]) -> None:
+        try:
+            response = await self.send_batch(target, values)
+            self.totals = self.totals.merge(response)
+            if response.failed:
+                logger.warning("trapper %s:%s rejected %d of %d values", *target, response.failed, response.total)
+        except (OSError, ValueError, TimeoutError, asyncio.IncompleteReadError) as e:
+            logger.warning("sending %d values to %s:%s failed: %s", len(values), *target, e)
+            self.totals = self.totals.merge(SenderResponse(0, len(values), len(values), 0.0, "failed"))
+        finally:
+            self._slots.release()
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            now = time.monotonic()
+            for target, batch in list(self._batches.items()):
+                if now - batch.started >= self.flush_interval:
+                    await self._submit(target)
+
+
+def routes_from_proxies(client: Client, port: int = DEFAULT_PORT) -> dict[str, tuple[str, int]]:
+    """
+    Maps host names to the trapper address of the proxy monitoring them, from ``proxy.get``.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        port (int, optional): Port used when a proxy does not report one. Defaults to 10051.
+
+    Returns:
+        dict[str, tuple[str, int]]: Destinations for ``AsyncSender(routes=...)``. Hosts monitored by
+        the server itself are not included and use the sender's default destination.
+    """
+    proxies = rpc(client, "proxy.get", {"output": ["proxyid", "address", "port"], "selectHosts": ["host"]})
+    routes: dict[str, tuple[str, int]] = {}
+    for proxy in proxies:
+        if not proxy.get("address"):
+            continue
+        address = (proxy["address"], int(proxy.get("port") or port))
+        routes.update({host["host"]: address for host in proxy.get("hosts", [])})
+    return routes
@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .exceptions import EmptyResponseError, ZabbixAPIError
+from .generics import _parse_response
+from .logger import logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# error data of requests made with a session that expired or was logged out
+_EXPIRED_MESSAGES = ("session terminated", "not authorised", "not authorized")
+_MAX_ERROR_SIZE = 4096
+
+
+def default_cache_path() -> Path:
+    """Returns ``$XDG_CACHE_HOME/pyzbx/sessions.json``, or ``~/.cache/pyzbx/sessions.json``."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pyzbx" / "sessions.json"
+
+
+class TokenCache:
+    """Session tokens shared by the processes of one user in a JSON file.
+
+    Reads and writes hold an exclusive ``flock`` on ``<path>.lock`` (on platforms without
+    ``fcntl`` only the process is protected). The file is written atomically with mode
+    ``0600``, whatever the umask or the mode of an older file, so it is readable by its owner only.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+
+    @contextmanager
+    def locked(self) -> Iterator[dict[str, Any]]:
+        """Holds the file lock and yields the cache content; changes are written back on exit."""
+        self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        with os.fdopen(os.open(self._lock_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                data = self._read()
+                before = dict(data)
+                yield data
+                if data != before:
+                    self._write(data)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, data: dict[str, Any]) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        if hasattr(os, "fchmod"):
+            # the mode of os.open only applies to a new file, a leftover one keeps its own
+            os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        tmp.replace(self.path)
+
+
+class SessionManager(httpx.Auth):
+    """Logs in with a username and password and keeps the session valid.
+
+    Used as the ``auth`` of the HTTP session, it adds the session token to every request.
+    Tokens are reused across processes through a ``TokenCache``, so short-lived jobs skip
+    ``user.login``; a token not verified for ``check_interval`` seconds is checked (and its
+    session extended) with ``user.checkAuthentication`` before use. An API call failing
+    because the session expired (see ``rpc``) triggers a single re-login through ``renew``
+    while concurrent callers wait for it, and is then retried once. Responses are not read
+    here, so streamed responses are not buffered.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        cache: TokenCache | None = None,
+        check_interval: float = 300.0,
+        logout_on_close: bool | None = None,
+    ) -> None:
+        """
+        Initializes the manager; no request is sent until ``open``.
+
+        Args:
+            url (str): The API endpoint URL.
+            username (str): The username.
+            password (str): The password.
+            cache (TokenCache, optional): Cache shared with other processes. Defaults to None.
+            check_interval (float, optional): Seconds after which a token is verified before use. Defaults to 300.
+            logout_on_close (bool, optional): Log out on ``close``. Defaults to True without a cache, False with one,
+                so that other processes can keep using the cached session.
+        """
+        self.url = url
+        self.username = username
+        self.password = password
+        self.cache = cache
+        self.check_interval = check_interval
+        self.logout_on_close = cache is None if logout_on_close is None else logout_on_close
+        self.token: str | None = None
+        self.checked = 0.0
+        self._key = f"{username}@{url}"
+        self._client: httpx.Client | None = None
+        self._lock = threading.Lock()
+
+    def open(self, client: httpx.Client) -> str:
+        """
+        Returns a valid token, from the cache if possible, logging in otherwise.
+
+        Args:
+            client (httpx.Client): Session used for the login, check and logout requests.
+
+        Returns:
+            str: The session token.
+        """
+        self._client = client
+        with self._lock:
+            self._refresh(None)
+        return self.token
+
+    def close(self) -> None:
+        """Logs out if ``logout_on_close`` is set, removing the token from the cache."""
+        with self._lock:
+            if self.token is None or not self.logout_on_close or self._client is None:
+                return
+            try:
+                self._call("user.logout", [], self.token)
+            except (httpx.HTTPError, ZabbixAPIError, EmptyResponseError) as e:
+                logger.warning("logout of %s failed: %s", self.username, e)
+            if self.cache is not None:
+                with self.cache.locked() as data:
+                    if data.get(self._key, {}).get("token") == self.token:
+                        del data[self._key]
+            self.token = None
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        request.headers["Authorization"] = f"Bearer {self.valid_token()}"
+        yield request
+
+    def valid_token(self) -> str:
+        """Returns the session token, verified first if it was not for ``check_interval`` seconds."""
+        if time.time() - self.checked >= self.check_interval:
+            with self._lock:
+                if time.time() - self.checked >= self.check_interval:
+                    self._refresh(None)
+        return self.token
+
+    def renew(self, expired: str) -> str:
+        """Returns a valid token after a request sent with ``expired`` failed because its session expired."""
+        with self._lock:
+            # only the first caller seeing the expired token logs in again, the others reuse its token
+            if self.token == expired:
+                logger.info("session of %s expired, logging in again", self.username)
+                self._refresh(expired)
+        return self.token
+
+    def _refresh(self, expired: str | None) -> None:
+        """Finds a valid token; ``expired`` is a token known to be invalid. Called with ``_lock`` held."""
+        if self.cache is None:
+            if expired is not None or self.token is None or not self._check(self.token):
+                self.token = self._login()
+            self.checked = time.time()
+            return
+        with self.cache.locked() as data:
+            entry = data.get(self._key, {})
+            token, checked = entry.get("token"), entry.get("checked", 0.0)
+            # another process may already have replaced the expired token
+            if not token or token == expired:
+                token = None
+            elif time.time() - checked >= self.check_interval:
+                token = token if self._check(token) else None
+                checked = time.time()
+            if token is None:
+                token, checked = self._login(), time.time()
+            self.token, self.checked = token, checked
+            data[self._key] = {"token": token, "checked": checked}
+
+    def _check(self, token: str) -> bool:
+        try:
+            self._call("user.checkAuthentication", {"sessionid": token})
+        except ZabbixAPIError:
+            return False
+        return True
+
+    def _login(self) -> str:
+        logger.debug("logging in to %s as %s", self.url, self.username)
+        return self._call("user.login", {"username": self.username, "password": self.password})
+
+    def _call(self, method: str, params: Any, token: str | None = None) -> Any:
+        headers = {"Content-Type": "application/json-rpc"}
+        if token is not None:
+            headers["Authorization"] = f"Bearer {token}"
+        payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
+        # auth=None: these requests must not go through this manager again
+        return _parse_response(self._client.post(self.url, json=payload, headers=headers, auth=None))
+
+
+def is_expired_response(response: httpx.Response) -> bool:
+    """Returns whether a read response is an API error reporting an expired or unknown session."""
+    content = response.content
+    # error responses are small, do not decode every result to look for one
+    if response.status_code != httpx.codes.OK or len(content) > _MAX_ERROR_SIZE or b'"error"' not in content:
+        return False
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return False
+    error = body.get("error") if isinstance(body, dict) else None
+    return isinstance(error, dict) and is_expired_error(error.get("data"))
+
+
+def is_expired_error(data: Any) -> bool:
+    """Returns whether the ``data`` of an API error reports an expired or unknown session."""
+    data = str(data or "").lower()
+    return any(message in data for message in _EXPIRED_MESSAGES)
@@ -0,0 +1,221 @@
+import contextvars
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from httpx import Client
+
+from .deadline import Deadline
+from .exceptions import DeadlineExceededError
+from .executor import DEFAULT_MAX_WORKERS
+from .explain import TIME_SERIES_OBJECTS, largest_id_filter, merge_results, part_params
+from .generics import get_pk, rpc
+from .logger import logger
+
+
+class ShardTuner:
+    """Picks the number of IDs per shard from the observed response times of one object type.
+
+    The time per ID is tracked as an EWMA over the shards sent so far; the shard size is
+    the number of IDs answered in about ``target_seconds``, moving by at most a factor of
+    two per observation and staying within ``min_size`` and ``max_size``.
+    """
+
+    def __init__(
+        self,
+        initial: int = 5000,
+        min_size: int = 500,
+        max_size: int = 50000,
+        target_seconds: float = 2.0,
+        alpha: float = 0.3,
+    ) -> None:
+        """
+        Initializes the tuner.
+
+        Args:
+            initial (int, optional): Shard size used until a response has been timed. Defaults to 5000.
+            min_size (int, optional): Smallest shard size. Defaults to 500.
+            max_size (int, optional): Largest shard size. Defaults to 50000.
+            target_seconds (float, optional): Desired response time of one shard. Defaults to 2.
+            alpha (float, optional): Weight of the newest sample in the EWMA. Defaults to 0.3.
+        """
+        self.size = initial
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.alpha = alpha
+        self.seconds_per_id = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<ShardTuner size={self.size} seconds_per_id={self.seconds_per_id:.2e}>"
+
+    def observe(self, ids: int, elapsed: float) -> None:
+        """Records that a shard of ``ids`` IDs was answered in ``elapsed`` seconds."""
+        if ids <= 0:
+            return
+        sample = elapsed / ids
+        with self._lock:
+            if self.seconds_per_id == 0:
+                self.seconds_per_id = sample
+            else:
+                self.seconds_per_id = self.alpha * sample + (1 - self.alpha) * self.seconds_per_id
+            wanted = int(self.target_seconds / self.seconds_per_id) if self.seconds_per_id else self.max_size
+            wanted = min(max(wanted, self.size // 2), self.size * 2)
+            self.size = min(max(wanted, self.min_size), self.max_size)
+
+
+_tuners: dict[str, ShardTuner] = {}
+_tuners_lock = threading.Lock()
+
+
+def get_tuner(object_name: str) -> ShardTuner:
+    """Returns the process-wide tuner of ``object_name``, shared by all clients."""
+    with _tuners_lock:
+        if object_name not in _tuners:
+            _tuners[object_name] = ShardTuner()
+        return _tuners[object_name]
+
+
+def shard_filter(object_name: str, params: dict[str, Any]) -> str | None:
+    """Returns the ID filter of ``params`` to split, if it is longer than the current shard size."""
+    id_filter = largest_id_filter(params)
+    if id_filter is None or len(params[id_filter]) <= get_tuner(object_name).size:
+        return None
+    return id_filter
+
+
+def iter_sharded_get(
+    client: Client,
+    object_name: str,
+    params: dict[str, Any],
+    id_filter: str | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Iterator[tuple[int, Any]]:
+    """
+    Runs a get call with its largest ID filter split into shards, yielding results as shards complete.
+
+    Shards are cut one at a time with the current size of the object's ``ShardTuner``, so
+    the size adapts during the call; at most ``max_workers`` shards are in flight. When a
+    shard fails or the active deadline expires, the remaining shards are cancelled.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        object_name (str): The API object, e.g. ``"item"``.
+        params (dict[str, Any]): The get parameters.
+        id_filter (str, optional): The ID filter to split. Defaults to the longest one.
+        max_workers (int, optional): Maximum number of shards fetched concurrently. Defaults to 8.
+
+    Returns:
+        Iterator[tuple[int, Any]]: The position of each shard and its result, in completion order.
+    """
+    id_filter = id_filter or largest_id_filter(params)
+    ids = params[id_filter]
+    tuner = get_tuner(object_name)
+    method = f"{object_name}.get"
+
+    def _fetch(shard: list[Any]) -> Any:
+        started = time.monotonic()
+        result = rpc(client, method, {**params, id_filter: shard})
+        tuner.observe(len(shard), time.monotonic() - started)
+        return result
+
+    offset = 0
+    position = 0
+    # a child deadline, so that a failed shard cancels the other shards of this call only
+    scope = Deadline()
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pyzbx-shard")
+    pending: dict[Future, int] = {}
+    try:
+        while offset < len(ids) or pending:
+            while offset < len(ids) and len(pending) < max_workers:
+                shard = ids[offset : offset + tuner.size]
+                with scope:
+                    pending[pool.submit(contextvars.copy_context().run, _fetch, shard)] = position
+                offset += len(shard)
+                position += 1
+            done, _ = wait(pending, timeout=scope.wait_timeout(), return_when=FIRST_COMPLETED)
+            if not done:
+                msg = f"Deadline exceeded with {len(pending)} shards of {method} in flight"
+                # raised here so that the handler below cancels the shards in flight
+                raise DeadlineExceededError(msg)  # noqa: TRY301
+            for future in done:
+                yield pending.pop(future), future.result()
+    except BaseException:
+        scope.cancel()
+        raise
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    logger.debug("%s split into %d shards of %s, %r", method, position, id_filter, tuner)
+
+
+def sharded_get(
+    client: Client,
+    object_name: str,
+    params: dict[str, Any],
+    id_filter: str | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Any:
+    """
+    Runs a get call with its largest ID filter split into shards and merges the results.
+
+    The merged result has the shape of a single call, see ``explain.merge_results``: rows
+    found by several shards are returned once, and ``sortfield``, ``limit`` and
+    ``preservekeys`` are applied again over all shards. With ``countOutput``, ``limit`` is
+    dropped, the shards return the IDs of the matching objects and their distinct IDs are
+    counted, as an object may match several shards, e.g. a trigger of several hosts.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        object_name (str): The API object, e.g. ``"item"``.
+        params (dict[str, Any]): The get parameters.
+        id_filter (str, optional): The ID filter to split. Defaults to the longest one.
+        max_workers (int, optional): Maximum number of shards fetched concurrently. Defaults to 8.
+
+    Returns:
+        Any: The result, as a single get call would return it.
+
+    Raises:
+        DeadlineExceededError: If the active deadline expired; ``partial`` holds the merged result
+            of the shards that completed.
+    """
+    count = bool(params.get("countOutput"))
+    if count:
+        merge_params = _count_params(object_name, params)
+        shard_params = merge_params
+    else:
+        merge_params = params
+        shard_params = part_params(object_name, params)
+    results: dict[int, Any] = {}
+    try:
+        for position, result in iter_sharded_get(client, object_name, shard_params, id_filter, max_workers):
+            results[position] = result
+    except DeadlineExceededError as e:
+        e.partial = _merge(object_name, merge_params, results, count)
+        raise
+    return _merge(object_name, merge_params, results, count)
+
+
+def _count_params(object_name: str, params: dict[str, Any]) -> dict[str, Any]:
+    # a count is not limited, a limit would only cut the rows of every shard
+    params = {key: value for key, value in params.items() if key != "limit"}
+    if object_name in TIME_SERIES_OBJECTS:
+        # values of one item are counted by a single shard, the counts add up
+        return params
+    params = {
+        key: value
+        for key, value in params.items()
+        if not key.startswith("select") and key not in ("countOutput", "sortfield", "sortorder", "preservekeys")
+    }
+    return {**params, "output": [get_pk(object_name)]}
+
+
+def _merge(object_name: str, params: dict[str, Any], results: dict[int, Any], count: bool) -> Any:
+    ordered = [results[position] for position in sorted(results)]
+    if not count:
+        return merge_results(object_name, params, ordered)
+    if object_name in TIME_SERIES_OBJECTS:
+        return str(sum(int(result) for result in ordered))
+    return str(len(merge_results(object_name, params, ordered)))
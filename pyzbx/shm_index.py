@@ -0,0 +1,219 @@
+import contextlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from hashlib import blake2b
+from pathlib import Path
+
+from httpx import Client
+
+from .generics import chunked, paginate
+from .logger import logger
+
+MAGIC = b"PZBXIDX1"
+_HEADER = struct.Struct("<8sQ")
+
+
+def key_hash(namespace: str, name: str) -> int:
+    """Returns the 64 bit hash the entries of the index are sorted by."""
+    return int.from_bytes(blake2b(f"{namespace}\0{name}".encode(), digest_size=8).digest(), "little")
+
+
+def write_index(path: str | Path, entries: Iterable[tuple[str, str, int]]) -> int:
+    """
+    Writes an index file and atomically replaces ``path`` with it.
+
+    The file holds, after a header, the 64 bit hashes of the keys in ascending order, the
+    IDs, the offsets of the keys and the keys themselves, so that readers can binary
+    search it in place. Integers are little-endian whatever the platform.
+
+    Args:
+        path (str | Path): The index file.
+        entries (Iterable[tuple[str, str, int]]): ``(namespace, name, id)`` entries, e.g. ``("host", "web01", 10084)``.
+
+    Returns:
+        int: The number of entries written.
+    """
+    path = Path(path)
+    rows = sorted(
+        (key_hash(namespace, name), f"{namespace}\0{name}".encode(), int(id_)) for namespace, name, id_ in entries
+    )
+    offsets = [0]
+    for _, key, _ in rows:
+        offsets.append(offsets[-1] + len(key))
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(rows)))
+        f.write(struct.pack(f"<{len(rows)}Q", *(h for h, _, _ in rows)))
+        f.write(struct.pack(f"<{len(rows)}q", *(id_ for _, _, id_ in rows)))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.writelines(key for _, key, _ in rows)
+        f.flush()
+        os.fsync(f.fileno())
+    # readers still mapping the previous file keep a consistent view until they reopen
+    tmp.replace(path)
+    return len(rows)
+
+
+def refresh_index(client: Client, path: str | Path, page_size: int = 10000) -> int:
+    """
+    Rebuilds the index from ``host.get`` and ``item.get``.
+
+    Namespaces: ``host`` (technical name to hostid), ``hostname`` (visible name to hostid)
+    and ``item`` (``"<host>:<key_>"`` to itemid).
+
+    Returns:
+        int: The number of entries written.
+    """
+    hosts = {
+        int(host["hostid"]): host
+        for host in paginate(client, "host", {"output": ["hostid", "host", "name"]}, page_size)
+    }
+    entries: list[tuple[str, str, int]] = []
+    for hostid, host in hosts.items():
+        entries.append(("host", host["host"], hostid))
+        entries.append(("hostname", host["name"], hostid))
+    for chunk in chunked(sorted(hosts), page_size):
+        params = {"output": ["itemid", "hostid", "key_"], "hostids": chunk}
+        entries.extend(
+            ("item", f"{hosts[int(item['hostid'])]['host']}:{item['key_']}", int(item["itemid"]))
+            for item in paginate(client, "item", params, page_size)
+        )
+    return write_index(path, entries)
+
+
+def refresh_forever(
+    client: Client, path: str | Path, interval: float = 300.0, stop: threading.Event | None = None
+) -> None:
+    """Runs ``refresh_index`` every ``interval`` seconds until ``stop`` is set, in the single refresher process."""
+    stop = stop or threading.Event()
+    while True:
+        try:
+            started = time.monotonic()
+            count = refresh_index(client, path)
+            logger.info("index %s rebuilt with %d entries in %.1fs", path, count, time.monotonic() - started)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("rebuilding index %s failed, readers keep the previous one: %s", path, e)
+        if stop.wait(interval):
+            return
+
+
+class SharedIdIndex:
+    """Read-only view of an index file shared by all the worker processes of a host.
+
+    The file is memory-mapped, so every worker shares the same pages of the page cache and
+    lookups binary search the mapping without copying it. At most every ``check_interval``
+    seconds a lookup checks whether the refresher replaced the file and remaps it. The
+    file is little-endian: on a big-endian host the integer columns are read into a private,
+    byte-swapped copy instead of being shared.
+
+    Example:
+        >>> index = SharedIdIndex("/dev/shm/pyzbx.idx")
+        >>> index.get("host", "web01")
+        10084
+    """
+
+    def __init__(self, path: str | Path, check_interval: float = 1.0) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mmap: mmap.mmap | None = None
+        self._views: tuple[memoryview, ...] = ()
+        self._count = 0
+        self._inode: tuple[int, int] | None = None
+        self._checked = 0.0
+        self._closed = False
+        self._open()
+
+    def __len__(self) -> int:
+        self._maybe_reopen()
+        return self._count
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return self.get(*key) is not None
+
+    def get(self, namespace: str, name: str) -> int | None:
+        """
+        Returns the ID of ``name`` in ``namespace``, or None.
+
+        Raises:
+            ValueError: If the index is closed.
+        """
+        self._maybe_reopen()
+        # a concurrent reopen swaps all views at once, keep a consistent set
+        if not (views := self._views):
+            msg = f"The index {self.path} is closed"
+            raise ValueError(msg)
+        hashes, ids, offsets, keys = views
+        h = key_hash(namespace, name)
+        key = f"{namespace}\0{name}".encode()
+        i = bisect_left(hashes, h)
+        while i < len(hashes) and hashes[i] == h:
+            if keys[offsets[i] : offsets[i + 1]] == key:
+                return ids[i]
+            i += 1
+        return None
+
+    def get_many(self, namespace: str, names: Iterable[str]) -> dict[str, int]:
+        """Returns the IDs of the ``names`` found in ``namespace``."""
+        return {name: id_ for name in names if (id_ := self.get(namespace, name)) is not None}
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._release()
+
+    def _maybe_reopen(self) -> None:
+        now = time.monotonic()
+        if self._closed or now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        stat = self.path.stat()
+        if (stat.st_dev, stat.st_ino) != self._inode:
+            self._open()
+
+    def _open(self) -> None:
+        with self._lock, self.path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count = _HEADER.unpack_from(mapped)
+            if magic != MAGIC:
+                mapped.close()
+                msg = f"{self.path} is not a pyzbx ID index"
+                raise ValueError(msg)
+            view = memoryview(mapped)
+            start = _HEADER.size
+            # the previous mapping is unmapped once the lookups still reading it drop their views
+            self._views = (
+                _column(view[start : start + 8 * count], "Q"),
+                _column(view[start + 8 * count : start + 16 * count], "q"),
+                _column(view[start + 16 * count : start + 24 * count + 8], "Q"),
+                view[start + 24 * count + 8 :],
+            )
+            self._count = count
+            self._mmap = mapped
+            self._inode = (stat.st_dev, stat.st_ino)
+            self._checked = time.monotonic()
+
+    def _release(self) -> None:
+        self._views = ()
+        self._count = 0
+        if self._mmap is not None:
+            with contextlib.suppress(BufferError):
+                self._mmap.close()
+            self._mmap = None
+
+
+def _column(view: memoryview, typecode: str) -> memoryview | array:
+    """The 64 bit little-endian integers of ``view``, in place on little-endian hosts."""
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    column = array(typecode, view.tobytes())
+    column.byteswap()
+    return column
@@ -0,0 +1,494 @@
+import contextlib
+import json
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Collection, Iterator, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from typing import Any, NamedTuple, TypeVar
+
+from .exceptions import ZabbixAPIError
+from .generics import sort_value
+
+HOST_BASE = 10001
+ITEM_BASE = 100001
+TRIGGER_BASE = 20001
+FLOAT = 0
+UNSIGNED = 3
+
+_MASK = (1 << 64) - 1
+_PUBLIC_METHODS = frozenset({"apiinfo.version", "user.login", "user.checkAuthentication"})
+_SESSION_TERMINATED = "Session terminated, re-login, please."
+
+_T = TypeVar("_T")
+_Rows = Callable[[bool], Iterator[dict[str, Any]]]
+
+
+class Faults(NamedTuple):
+    """Faults injected by a ``SimulatorServer``; probabilities apply to every call."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    bandwidth: int | None = None
+    session_ttl: float | None = None
+    expire_rate: float = 0.0
+    seed: int = 0
+
+
+class Inventory:
+    """A deterministic synthetic Zabbix inventory, generated lazily.
+
+    Nothing is stored: hosts, items, history values and events are computed from their IDs
+    and ``seed``, so the same parameters always answer the same data and an inventory of
+    100k hosts and 10M items costs no memory until a call returns it. IDs encode their
+    position (``hostid = HOST_BASE + h``, ``itemid = ITEM_BASE + h * items_per_host + k``),
+    so ID filters are answered without scanning.
+
+    Every item has a value every ``item_delay`` seconds from ``start`` to now; every host
+    has one trigger raising a problem every ``event_interval`` seconds, recovered after a
+    quarter to three quarters of the interval.
+    """
+
+    def __init__(
+        self,
+        hosts: int = 1000,
+        items_per_host: int = 100,
+        seed: int = 0,
+        start: int | None = None,
+        item_delay: int = 60,
+        event_interval: int = 3600,
+        version: str = "7.0.0",
+    ) -> None:
+        """
+        Initializes an inventory.
+
+        Args:
+            hosts (int, optional): Number of hosts. Defaults to 1000.
+            items_per_host (int, optional): Number of items of every host. Defaults to 100.
+            seed (int, optional): Seed of the generated names, values and events. Defaults to 0.
+            start (int, optional): Time of the first history value and event. Defaults to yesterday, 00:00 UTC.
+            item_delay (int, optional): Seconds between two values of an item. Defaults to 60.
+            event_interval (int, optional): Seconds between two problems of a host. Defaults to 3600.
+            version (str, optional): Version answered by ``apiinfo.version``. Defaults to "7.0.0".
+        """
+        self.hosts = hosts
+        self.items_per_host = items_per_host
+        self.seed = seed
+        self.start = start if start is not None else int(time.time()) // 86400 * 86400 - 86400
+        self.item_delay = item_delay
+        self.event_interval = event_interval
+        self.version = version
+        self._methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "host.get": self.host_get,
+            "item.get": self.item_get,
+            "history.get": self.history_get,
+            "event.get": self.event_get,
+            "problem.get": self.problem_get,
+        }
+
+    def __repr__(self) -> str:
+        return f"<Inventory hosts={self.hosts} items={self.hosts * self.items_per_host} seed={self.seed}>"
+
+    def call(self, method: str, params: dict[str, Any]) -> Any:
+        """Answers a get call; raises ``ZabbixAPIError`` for unknown methods."""
+        if method not in self._methods:
+            raise ZabbixAPIError(-32601, "Method not found.", f'Incorrect API "{method}".')
+        return self._methods[method](params)
+
+    def host(self, h: int) -> dict[str, Any]:
+        return {
+            "hostid": str(HOST_BASE + h),
+            "host": f"sim-{h:06d}",
+            "name": f"Simulated host {h:06d}",
+            "status": "1" if self._mix(1, h) % 100 == 0 else "0",
+            "description": "",
+        }
+
+    def item(self, h: int, k: int) -> dict[str, Any]:
+        itemid = ITEM_BASE + h * self.items_per_host + k
+        lastclock = self._last_clock(itemid, int(time.time()))
+        value_type = self._value_type(k)
+        return {
+            "itemid": str(itemid),
+            "hostid": str(HOST_BASE + h),
+            "name": f"Metric {k}",
+            "key_": f"sim.metric[{k}]",
+            "value_type": str(value_type),
+            "delay": f"{self.item_delay}s",
+            "status": "0",
+            "units": "",
+            "lastclock": str(lastclock),
+            "lastvalue": self._value(itemid, value_type, lastclock) if lastclock >= self.start else "0",
+        }
+
+    def host_get(self, params: dict[str, Any]) -> Any:
+        def rows(reverse: bool) -> Iterator[dict[str, Any]]:
+            for h in _ordered(self._host_indexes(params), reverse):
+                yield self.host(h)
+
+        return _select(rows, params, "hostid", ("hostid", "host", "name"))
+
+    def item_get(self, params: dict[str, Any]) -> Any:
+        def rows(reverse: bool) -> Iterator[dict[str, Any]]:
+            for h, k in self._item_indexes(params, reverse):
+                yield self.item(h, k)
+
+        return _select(rows, params, "itemid", ("itemid",))
+
+    def history_get(self, params: dict[str, Any]) -> Any:
+        value_type = int(params.get("history", UNSIGNED))
+        now = int(time.time())
+        time_from = max(int(params.get("time_from", self.start)), self.start)
+        time_till = min(int(params.get("time_till", now)), now)
+        delay = self.item_delay
+        # items are sorted by phase, so that walking the steps yields values in clock order
+        itemids = (ITEM_BASE + h * self.items_per_host + k for h, k in self._item_indexes(params))
+        items = sorted(
+            (self._phase(itemid), itemid)
+            for itemid in itemids
+            if self._value_type((itemid - ITEM_BASE) % self.items_per_host) == value_type
+        )
+
+        def rows(reverse: bool) -> Iterator[dict[str, Any]]:
+            first = max((time_from - self.start) // delay - 1, 0)
+            last = (time_till - self.start) // delay
+            for step in _ordered(range(first, last + 1), reverse):
+                for phase, itemid in _ordered(items, reverse):
+                    clock = self.start + step * delay + phase
+                    if time_from <= clock <= time_till:
+                        value = self._value(itemid, value_type, clock)
+                        yield {"itemid": str(itemid), "clock": str(clock), "value": value, "ns": "0"}
+
+        return _select(rows, params, "itemid", ("clock",))
+
+    def event_get(self, params: dict[str, Any]) -> Any:
+        now = int(time.time())
+        time_from = max(int(params.get("time_from", self.start)), self.start)
+        time_till = min(int(params.get("time_till", now)), now)
+        interval = self.event_interval
+        if "eventids" in params:
+            cycles = {}
+            for eventid in _ids(params["eventids"]):
+                cycle, h = divmod((eventid - 1) // 2, self.hosts)
+                if eventid > 0:
+                    cycles.setdefault(cycle, set()).add(h)
+            hosts = set(self._host_indexes(params))
+            selected = [(cycle, sorted(hosts.intersection(hs))) for cycle, hs in sorted(cycles.items())]
+        else:
+            hosts = self._host_indexes(params)
+            first = max((time_from - self.start) // interval - 1, 0)
+            last = max((time_till - self.start) // interval, -1)
+            selected = [(cycle, hosts) for cycle in range(first, last + 1)]
+        eventids = set(_ids(params["eventids"])) if "eventids" in params else None
+
+        def rows(reverse: bool) -> Iterator[dict[str, Any]]:
+            for cycle, cycle_hosts in _ordered(selected, reverse):
+                for h in _ordered(cycle_hosts, reverse):
+                    for event in _ordered(self._events(cycle, h, now, params), reverse):
+                        if time_from <= int(event["clock"]) <= time_till and (
+                            eventids is None or int(event["eventid"]) in eventids
+                        ):
+                            yield event
+
+        return _select(rows, params, "eventid", ("eventid",))
+
+    def problem_get(self, params: dict[str, Any]) -> Any:
+        now = int(time.time())
+        eventids = set(_ids(params["eventids"])) if "eventids" in params else None
+
+        def rows(reverse: bool) -> Iterator[dict[str, Any]]:
+            for h in _ordered(self._host_indexes(params), reverse):
+                cycle = (now - self.start - self._mix(2, h) % self.event_interval) // self.event_interval
+                if cycle < 0:
+                    continue
+                events = self._events(cycle, h, now, params)
+                # a recovered problem also has its recovery event
+                if len(events) != 1 or (eventids is not None and int(events[0]["eventid"]) not in eventids):
+                    continue
+                problem = events[0]
+                if int(params.get("time_from", 0)) <= int(problem["clock"]) <= int(params.get("time_till", now)):
+                    yield {**problem, "r_clock": "0", "suppressed": "0"}
+
+        return _select(rows, params, "eventid", ("eventid",))
+
+    def _events(self, cycle: int, h: int, now: int, params: dict[str, Any]) -> list[dict[str, Any]]:
+        """The problem event of ``h`` in ``cycle`` and its recovery event, those that happened before ``now``."""
+        interval = self.event_interval
+        clock = self.start + cycle * interval + self._mix(2, h) % interval
+        if clock > now:
+            return []
+        recovered = clock + interval // 4 + self._mix(3, h, cycle) % (interval // 2)
+        eventid = 2 * (cycle * self.hosts + h) + 1
+        common = {"source": "0", "object": "0", "objectid": str(TRIGGER_BASE + h), "ns": "0", "acknowledged": "0"}
+        if "selectHosts" in params:
+            common["hosts"] = [{"hostid": str(HOST_BASE + h)}]
+        name = f"High load on sim-{h:06d}"
+        problem = {
+            "eventid": str(eventid),
+            **common,
+            "clock": str(clock),
+            "value": "1",
+            "name": name,
+            "severity": str(self._mix(4, h) % 6),
+            "r_eventid": str(eventid + 1) if recovered <= now else "0",
+            "c_eventid": "0",
+        }
+        if recovered > now:
+            return [problem]
+        recovery = {
+            "eventid": str(eventid + 1),
+            **common,
+            "clock": str(recovered),
+            "value": "0",
+            "name": name,
+            "severity": "0",
+            "r_eventid": "0",
+            "c_eventid": "0",
+        }
+        return [problem, recovery]
+
+    def _host_indexes(self, params: dict[str, Any]) -> Sequence[int]:
+        indexes: Sequence[int] = range(self.hosts)
+        if "hostids" in params:
+            indexes = sorted({h for hostid in _ids(params["hostids"]) if 0 <= (h := hostid - HOST_BASE) < self.hosts})
+        if "objectids" in params:
+            triggers = {
+                t for triggerid in _ids(params["objectids"]) if 0 <= (t := triggerid - TRIGGER_BASE) < self.hosts
+            }
+            indexes = [h for h in indexes if h in triggers]
+        return indexes
+
+    def _item_indexes(self, params: dict[str, Any], reverse: bool = False) -> Iterator[tuple[int, int]]:
+        if "itemids" in params:
+            hosts = set(self._host_indexes(params)) if "hostids" in params else None
+            for itemid in sorted({i for i in _ids(params["itemids"]) if i >= ITEM_BASE}, reverse=reverse):
+                h, k = divmod(itemid - ITEM_BASE, self.items_per_host)
+                if h < self.hosts and (hosts is None or h in hosts):
+                    yield h, k
+            return
+        keys = _ordered(range(self.items_per_host), reverse)
+        for h in _ordered(self._host_indexes(params), reverse):
+            for k in keys:
+                yield h, k
+
+    def _value_type(self, k: int) -> int:
+        return FLOAT if k % 2 == 0 else UNSIGNED
+
+    def _value(self, itemid: int, value_type: int, clock: int) -> str:
+        noise = self._mix(5, itemid, clock)
+        if value_type == FLOAT:
+            return f"{(noise % 100000) / 1000:.3f}"
+        return str(noise % 1000)
+
+    def _phase(self, itemid: int) -> int:
+        return self._mix(6, itemid) % self.item_delay
+
+    def _last_clock(self, itemid: int, now: int) -> int:
+        phase = self._phase(itemid)
+        return self.start + phase + (now - self.start - phase) // self.item_delay * self.item_delay
+
+    def _mix(self, *values: int) -> int:
+        # a splitmix64 style hash: fast, and stable across processes unlike hash()
+        h = self.seed & _MASK
+        for value in values:
+            h = ((h ^ value) + 0x9E3779B97F4A7C15) & _MASK
+            h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+            h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK
+            h ^= h >> 31
+        return h
+
+
+class SimulatorServer(ThreadingHTTPServer):
+    """A local JSON-RPC server answering from an ``Inventory``, with fault injection.
+
+    Besides the get methods of the inventory, it answers ``apiinfo.version``,
+    ``user.login``, ``user.logout`` and ``user.checkAuthentication``. Sessions of
+    ``user.login`` expire after ``faults.session_ttl`` seconds or, with probability
+    ``faults.expire_rate``, on any call; other bearer tokens are accepted as API tokens.
+    ``calls`` counts the calls per method.
+
+    Example:
+        >>> with SimulatorServer(Inventory(hosts=100_000), Faults(latency=0.05, error_rate=0.01)) as server:
+        ...     threading.Thread(target=server.serve_forever, daemon=True).start()
+        ...     zbx = ZabbixClient(server.url, username="Admin", password="zabbix")
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        inventory: Inventory | None = None,
+        faults: Faults | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.inventory = inventory or Inventory()
+        self.faults = faults or Faults()
+        self.calls: Counter[str] = Counter()
+        self._sessions: dict[str, float] = {}
+        self._random = random.Random(self.faults.seed)  # noqa: S311
+        self._lock = threading.Lock()
+        super().__init__((host, port), _SimulatorHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def answer(self, content: bytes, authorization: str | None) -> tuple[int, bytes]:
+        """Returns the HTTP status and body answering a request, after the injected latency."""
+        faults = self.faults
+        with self._lock:
+            delay = faults.latency + self._random.uniform(0, faults.jitter)
+            failed = self._random.random() < faults.error_rate
+            expire = self._random.random() < faults.expire_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return faults.error_status, b"Service Unavailable"
+        try:
+            request = json.loads(content)
+            method, params = request["method"], request.get("params") or {}
+        except (ValueError, KeyError, TypeError):
+            return 200, _dumps({"jsonrpc": "2.0", "error": {"code": -32700, "message": "Parse error."}, "id": None})
+        with self._lock:
+            self.calls[method] += 1
+        try:
+            result = self._call(method, params, _bearer(authorization), expire)
+        except ZabbixAPIError as e:
+            error = {"code": e.code, "message": e.message, "data": e.data}
+            return 200, _dumps({"jsonrpc": "2.0", "error": error, "id": request.get("id")})
+        return 200, _dumps({"jsonrpc": "2.0", "result": result, "id": request.get("id")})
+
+    def _call(self, method: str, params: Any, token: str | None, expire: bool) -> Any:
+        if method == "apiinfo.version":
+            return self.inventory.version
+        if method == "user.login":
+            token = secrets.token_hex(16)
+            with self._lock:
+                self._sessions[token] = time.monotonic()
+            return token
+        if method == "user.checkAuthentication":
+            sessionid = params.get("sessionid") or params.get("token")
+            if not self._valid(sessionid, expire=False):
+                raise ZabbixAPIError(-32602, "Invalid params.", _SESSION_TERMINATED)
+            return {"userid": "1", "username": "Admin", "sessionid": sessionid}
+        if method not in _PUBLIC_METHODS and not self._valid(token, expire):
+            raise ZabbixAPIError(-32602, "Invalid params.", _SESSION_TERMINATED if token else "Not authorized.")
+        if method == "user.logout":
+            with self._lock:
+                self._sessions.pop(token, None)
+            return True
+        return self.inventory.call(method, params)
+
+    def _valid(self, token: str | None, expire: bool) -> bool:
+        if not token:
+            return False
+        with self._lock:
+            if token not in self._sessions:
+                return True  # an API token
+            ttl = self.faults.session_ttl
+            if expire or (ttl is not None and time.monotonic() - self._sessions[token] > ttl):
+                del self._sessions[token]
+                return False
+            return True
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    server: SimulatorServer
+
+    # the handler method name is set by BaseHTTPRequestHandler
+    def do_POST(self) -> None:  # noqa: N802
+        content = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, body = self.server.answer(content, self.headers.get("Authorization"))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # clients may abort a response, e.g. over a memory budget
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            if (bandwidth := self.server.faults.bandwidth) is None:
+                self.wfile.write(body)
+                return
+            # a slow body: the server answers at once but trickles the bytes
+            chunk = max(bandwidth // 10, 1)
+            for offset in range(0, len(body), chunk):
+                self.wfile.write(body[offset : offset + chunk])
+                self.wfile.flush()
+                time.sleep(chunk / bandwidth)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+def serve(inventory: Inventory, faults: Faults, host: str = "127.0.0.1", port: int = 8080) -> None:
+    """Runs a ``SimulatorServer`` until interrupted."""
+    with SimulatorServer(inventory, faults, host, port) as server, contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+
+
+def _select(rows: _Rows, params: dict[str, Any], pk: str, natural: Collection[str]) -> Any:
+    """Applies ``filter``, ``countOutput``, ``sortfield``, ``limit``, ``output`` and ``preservekeys`` to ``rows``.
+
+    ``rows(reverse)`` yields the rows in ascending (or descending) order of the ``natural``
+    fields, so that sorting on them streams and ``limit`` stops the generation early.
+    """
+    sortfield = params.get("sortfield") or []
+    sortfields = [sortfield] if isinstance(sortfield, str) else list(sortfield)
+    sortorder = params.get("sortorder") or "ASC"
+    # a single order applies to every field, a list gives the order of each field
+    orders = [sortorder] * len(sortfields) if isinstance(sortorder, str) else list(sortorder)
+    descending = [i < len(orders) and orders[i] == "DESC" for i in range(len(sortfields))]
+    streamed = not sortfields or (len(sortfields) == 1 and sortfields[0] in natural)
+    selected: Iterator[dict[str, Any]] = rows(streamed and bool(descending) and descending[0])
+    if filters := {
+        key: {str(v) for v in (values if isinstance(values, list) else [values])}
+        for key, values in (params.get("filter") or {}).items()
+    }:
+        selected = (row for row in selected if all(str(row.get(key)) in values for key, values in filters.items()))
+    if params.get("countOutput"):
+        return str(sum(1 for _ in selected))
+    if not streamed:
+        ordered = list(selected)
+        # stable sorts from the last field to the first
+        for field, reverse in reversed(list(zip(sortfields, descending, strict=True))):
+            ordered.sort(key=lambda row, field=field: sort_value(row, field), reverse=reverse)
+        selected = iter(ordered)
+    if limit := params.get("limit"):
+        selected = islice(selected, int(limit))
+    output = params.get("output", "extend")
+    fields = None
+    if output != "extend":
+        fields = set(output if isinstance(output, list) else [output])
+        fields.update(key[len("select") :].lower() for key in params if key.startswith("select"))
+    # rows are keyed by their primary key even when the output leaves it out
+    if params.get("preservekeys"):
+        return {row[pk]: _project(row, fields) for row in selected}
+    return [_project(row, fields) for row in selected]
+
+
+def _project(row: dict[str, Any], fields: set[str] | None) -> dict[str, Any]:
+    return row if fields is None else {key: value for key, value in row.items() if key in fields}
+
+
+def _ordered(values: Sequence[_T], reverse: bool) -> Sequence[_T]:
+    return values[::-1] if reverse else values
+
+
+def _ids(values: Any) -> list[int]:
+    return [int(value) for value in (values if isinstance(values, list) else [values])]
+
+
+def _bearer(authorization: str | None) -> str | None:
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return None
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
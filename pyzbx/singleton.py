@@ -1,3 +1,4 @@
+import weakref
 from collections.abc import Callable
 from typing import ParamSpec, TypeVar
 
@@ -10,7 +11,9 @@ def singleton(cls: type[T]) -> Callable[..., T]:
     Returns a function that can be used as a decorator to make ``cls`` a singleton.
 
     The decorator takes the same arguments as ``cls`` and returns an instance of ``cls``.
-    Subsequent calls to the decorator will return the same instance.
+    Subsequent calls with the same arguments return the same instance as long as it is
+    referenced, so API objects of two clients in one process never share an HTTP session.
+    Instances of ``cls`` must support weak references.
 
     Args:
         cls: The class to make a singleton.
@@ -18,14 +21,15 @@ def singleton(cls: type[T]) -> Callable[..., T]:
     Returns:
         A function that can be used as a decorator to make ``cls`` a singleton.
     """
-    instances: dict[type[T], T] = {}
+    instances: weakref.WeakValueDictionary[tuple, T] = weakref.WeakValueDictionary()
 
     def get_instance(*args: P.args, **kwargs: P.kwargs) -> T:
         """
         Returns an instance of ``cls``.
 
-        If an instance of ``cls`` has not been created, a new one will be created using
-        ``cls(*args, **kwargs)``. Subsequent calls will return the same instance.
+        If no instance of ``cls`` was created with these arguments, or it was garbage collected,
+        a new one is created using ``cls(*args, **kwargs)``. Subsequent calls will return the
+        same instance.
 
         Args:
             *args: The positional arguments to pass to ``cls``.
@@ -34,8 +38,10 @@ def singleton(cls: type[T]) -> Callable[..., T]:
         Returns:
             An instance of ``cls``.
         """
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
+        key = (*args, *sorted(kwargs.items()))
+        instance = instances.get(key)
+        if instance is None:
+            instance = instances[key] = cls(*args, **kwargs)
+        return instance
 
     return get_instance
@@ -0,0 +1,178 @@
+import json
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from httpx import Client
+
+from .executor import DEFAULT_MAX_WORKERS, run_concurrently
+from .generics import rpc
+
+DEFAULT_WINDOW = 30 * 86400
+METRICS = ("uptime", "downtime", "error_budget", "sli")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS windows (
+    slaid INTEGER NOT NULL,
+    serviceids TEXT NOT NULL,
+    window_from INTEGER NOT NULL,
+    window_to INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (slaid, serviceids, window_from, window_to)
+);
+"""
+
+
+class SliCache:
+    """``sla.getsli`` results of time windows whose periods are all closed.
+
+    The SLI of a closed period never changes, so such a window is only fetched once.
+    The cache lives in memory by default or in a SQLite file shared between runs.
+    """
+
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def get(self, slaid: int, serviceids: str, window: tuple[int, int]) -> dict[str, Any] | None:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT result FROM windows WHERE slaid = ? AND serviceids = ? AND window_from = ? AND window_to = ?",
+                (slaid, serviceids, *window),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, slaid: int, serviceids: str, window: tuple[int, int], result: dict[str, Any]) -> None:
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO windows VALUES (?, ?, ?, ?, ?)",
+                (slaid, serviceids, *window, json.dumps(result, separators=(",", ":"))),
+            )
+
+
+class SliMatrix:
+    """The SLI of the services of one SLA over consecutive periods, as flat arrays.
+
+    ``periods`` holds ``period_from, period_to`` pairs and every metric array
+    (``uptime``, ``downtime``, ``error_budget``, ``sli``) holds one value per period and
+    service, row-major by period; services without a value in a period hold NaN.
+    """
+
+    __slots__ = ["slaid", "periods", "serviceids", "uptime", "downtime", "error_budget", "sli", "_columns"]
+
+    def __init__(self, slaid: int, periods: array, serviceids: array) -> None:
+        self.slaid = slaid
+        self.periods = periods
+        self.serviceids = serviceids
+        size = len(periods) // 2 * len(serviceids)
+        for metric in METRICS:
+            setattr(self, metric, array("d", [math.nan]) * size)
+        self._columns = {serviceid: i for i, serviceid in enumerate(serviceids)}
+
+    def __repr__(self) -> str:
+        return f"<SliMatrix sla={self.slaid} periods={len(self)} services={len(self.serviceids)}>"
+
+    def __len__(self) -> int:
+        return len(self.periods) // 2
+
+    def offset(self, period: int, serviceid: int) -> int:
+        """Returns the index of the value of ``serviceid`` in the ``period``-th period in the metric arrays."""
+        return period * len(self.serviceids) + self._columns[serviceid]
+
+    def value(self, metric: str, period: int, serviceid: int) -> float:
+        """Returns ``metric`` of ``serviceid`` in the ``period``-th period."""
+        return getattr(self, metric)[self.offset(period, serviceid)]
+
+    def series(self, metric: str, serviceid: int) -> list[float]:
+        """Returns ``metric`` of ``serviceid`` for every period."""
+        column = self._columns[serviceid]
+        values = getattr(self, metric)
+        return [values[i * len(self.serviceids) + column] for i in range(len(self))]
+
+
+def get_sli(
+    client: Client,
+    slaids: Sequence[int],
+    period_from: int,
+    period_to: int,
+    serviceids: Sequence[int] | None = None,
+    window: int = DEFAULT_WINDOW,
+    cache: SliCache | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> dict[int, SliMatrix]:
+    """
+    Computes the SLI of many SLAs over a long time range with concurrent ``sla.getsli`` calls.
+
+    The range is cut into windows of ``window`` seconds aligned on multiples of
+    ``window``, so that repeated reports request the same windows; one call is made per
+    SLA and window, and windows that ended before now are served from ``cache`` once
+    fetched. Periods crossing a window boundary are returned once.
+
+    Args:
+        client (httpx.Client): The HTTP session of a ``ZabbixClient``.
+        slaids (Sequence[int]): The SLAs.
+        period_from (int): Start of the range, inclusive.
+        period_to (int): End of the range, exclusive.
+        serviceids (Sequence[int], optional): Restrict the SLI to these services. Defaults to all services.
+        window (int, optional): Seconds covered by one call; must hold at most 100 periods. Defaults to 30 days.
+        cache (SliCache, optional): Cache of closed windows. Defaults to None.
+        max_workers (int, optional): Maximum number of concurrent calls. Defaults to 8.
+
+    Returns:
+        dict[int, SliMatrix]: The SLI of each SLA.
+    """
+    services_key = ",".join(map(str, sorted(serviceids))) if serviceids is not None else ""
+    windows = [
+        (max(start, period_from), min(start + window, period_to))
+        for start in range(period_from - period_from % window, period_to, window)
+    ]
+    now = int(time.time())
+    results: dict[tuple[int, tuple[int, int]], dict[str, Any]] = {}
+    calls = []
+    for slaid in slaids:
+        for w in windows:
+            if cache is not None and (cached := cache.get(slaid, services_key, w)) is not None:
+                results[slaid, w] = cached
+            else:
+                params: dict[str, Any] = {"slaid": slaid, "period_from": w[0], "period_to": w[1]}
+                if serviceids is not None:
+                    params["serviceids"] = list(serviceids)
+                calls.append((slaid, w, params))
+    fetched = run_concurrently(rpc, [(client, "sla.getsli", params) for _, _, params in calls], max_workers)
+    for (slaid, w, _), result in zip(calls, fetched, strict=True):
+        results[slaid, w] = result
+        periods = result.get("periods", [])
+        if cache is not None and w[1] <= now and all(int(p["period_to"]) <= now for p in periods):
+            cache.put(slaid, services_key, w, result)
+    return {slaid: _merge(slaid, [results[slaid, w] for w in windows]) for slaid in slaids}
+
+
+def _merge(slaid: int, results: list[dict[str, Any]]) -> SliMatrix:
+    rows: dict[int, tuple[int, dict[int, dict[str, Any]]]] = {}
+    serviceids: dict[int, None] = {}
+    for result in results:
+        ids = [int(serviceid) for serviceid in result.get("serviceids", [])]
+        serviceids.update(dict.fromkeys(ids))
+        for period, values in zip(result.get("periods", []), result.get("sli", []), strict=False):
+            start = int(period["period_from"])
+            if start not in rows:
+                rows[start] = (int(period["period_to"]), dict(zip(ids, values, strict=False)))
+    periods = array("q")
+    for start in sorted(rows):
+        periods.extend((start, rows[start][0]))
+    matrix = SliMatrix(slaid, periods, array("q", serviceids))
+    for i, start in enumerate(sorted(rows)):
+        for serviceid, value in rows[start][1].items():
+            offset = matrix.offset(i, serviceid)
+            for metric in METRICS:
+                getattr(matrix, metric)[offset] = float(value[metric])
+    return matrix
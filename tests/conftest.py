@@ -0,0 +1 @@
+pytest_plugins = ["pyzbx.pytest_plugin"]
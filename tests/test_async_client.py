@@ -0,0 +1,75 @@
+import asyncio
+import math
+from array import array
+
+import httpx
+import pytest
+
+from pyzbx.async_client import ProcessDecoder, arpc, decode_response, to_columns
+from pyzbx.deadline import Deadline
+from pyzbx.exceptions import DeadlineExceededError, ZabbixAPIError
+from pyzbx.simulator import HOST_BASE, ITEM_BASE, Faults, SimulatorServer
+
+
+def test_to_columns() -> None:
+    rows = [
+        {"itemid": "1", "lastvalue": "1.5", "name": "CPU"},
+        {"itemid": "2", "lastvalue": None, "name": None},
+        {"itemid": "3", "lastvalue": ""},
+    ]
+    columns = to_columns(rows, {"itemid": "q", "lastvalue": "d", "name": "s", "units": "s"})
+    assert columns["itemid"] == array("q", [1, 2, 3])
+    assert columns["lastvalue"][0] == 1.5
+    assert math.isnan(columns["lastvalue"][1])
+    assert math.isnan(columns["lastvalue"][2])
+    assert columns["name"] == ["CPU", "", ""]
+    assert columns["units"] == ["", "", ""]
+
+
+@pytest.mark.parametrize("result", ["3", {"1": {"itemid": "1"}}])
+def test_to_columns_rejects_other_results(result: object) -> None:
+    with pytest.raises(TypeError, match="list of rows"):
+        to_columns(result, {"itemid": "q"})  # type: ignore[arg-type]
+
+
+def test_decode_response_errors() -> None:
+    body = b'{"jsonrpc":"2.0","error":{"code":-32602,"message":"Invalid params.","data":"No permissions."},"id":1}'
+    with pytest.raises(ZabbixAPIError, match="No permissions"):
+        decode_response(body)
+
+
+@pytest.mark.zabbix_simulator(hosts=4, items_per_host=3)
+def test_arpc_decodes_inline_and_in_workers(zabbix_simulator: SimulatorServer) -> None:
+    async def run() -> tuple[object, object, object]:
+        decoder = ProcessDecoder(threshold=0, max_workers=1)
+        async with httpx.AsyncClient(
+            base_url=f"{zabbix_simulator.url}/api_jsonrpc.php", headers={"Authorization": "Bearer test"}
+        ) as client:
+            try:
+                rows = await arpc(client, "item.get", {"output": ["itemid", "hostid"]})
+                columns = await arpc(
+                    client, "item.get", {"output": ["itemid", "hostid"]}, decoder=decoder, columns={"itemid": "q"}
+                )
+                count = await arpc(client, "host.get", {"countOutput": True}, decoder=decoder)
+            finally:
+                decoder.close()
+        return rows, columns, count
+
+    rows, columns, count = asyncio.run(run())
+    assert len(rows) == 12
+    assert rows[0] == {"itemid": str(ITEM_BASE), "hostid": str(HOST_BASE)}
+    assert columns == {"itemid": array("q", range(ITEM_BASE, ITEM_BASE + 12))}
+    assert count == "4"
+
+
+@pytest.mark.zabbix_simulator(hosts=4, items_per_host=3, faults=Faults(latency=0.2))
+def test_arpc_deadline(zabbix_simulator: SimulatorServer) -> None:
+    async def run() -> None:
+        async with httpx.AsyncClient(
+            base_url=f"{zabbix_simulator.url}/api_jsonrpc.php", headers={"Authorization": "Bearer test"}
+        ) as client:
+            with Deadline(0.05):
+                await arpc(client, "host.get", {"output": ["hostid"]})
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(run())
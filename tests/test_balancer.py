@@ -0,0 +1,74 @@
+import json
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from pyzbx.balancer import BalancedTransport
+from pyzbx.generics import rpc
+
+
+class _Frontend:
+    """A mock frontend answering every call, after ``delay`` seconds, with ``status``."""
+
+    def __init__(self, name: str, delay: float = 0.0, status: int = 200) -> None:
+        self.name = name
+        self.delay = delay
+        self.status = status
+        self.calls: Counter[str] = Counter()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        self.calls[payload["method"]] += 1
+        time.sleep(self.delay)
+        if self.status != 200:
+            return httpx.Response(self.status, text="Service Unavailable")
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": self.name, "id": payload["id"]})
+
+
+def _client(*frontends: _Frontend, readmit_after: float = 30.0) -> httpx.Client:
+    transports = iter([httpx.MockTransport(frontend) for frontend in frontends])
+    transport = BalancedTransport(
+        [f"http://fe{i}/api_jsonrpc.php" for i in range(len(frontends))],
+        readmit_after=readmit_after,
+        transport_factory=lambda: next(transports),
+    )
+    return httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=transport)
+
+
+def test_lowest_latency_endpoint_is_preferred() -> None:
+    slow, fast = _Frontend("slow", delay=0.02), _Frontend("fast")
+    with _client(slow, fast) as client:
+        answers = Counter(rpc(client, "host.get", {}) for _ in range(20))
+    # the first calls measure both endpoints, the EWMA then keeps to the fast one
+    assert answers["fast"] >= 18
+    assert slow.calls["host.get"] <= 2
+
+
+def test_failing_endpoint_is_ejected_and_reads_are_retried() -> None:
+    down, up = _Frontend("down", status=503), _Frontend("up")
+    with _client(down, up) as client:
+        assert [rpc(client, "host.get", {}) for _ in range(5)] == ["up"] * 5
+        transport = client._transport  # noqa: SLF001
+        assert not transport.endpoints[0].healthy
+        assert down.calls["host.get"] == 1
+
+
+def test_writes_are_not_retried() -> None:
+    down, up = _Frontend("down", status=503), _Frontend("up")
+    with _client(down, up) as client, pytest.raises(httpx.HTTPStatusError):
+        rpc(client, "host.create", {})
+    assert down.calls["host.create"] == 1
+    assert up.calls["host.create"] == 0
+
+
+def test_ejected_endpoint_is_tried_again_half_open() -> None:
+    flaky, up = _Frontend("flaky", status=503), _Frontend("up", delay=0.01)
+    with _client(flaky, up, readmit_after=0.05) as client:
+        assert rpc(client, "host.get", {}) == "up"
+        assert rpc(client, "host.get", {}) == "up"
+        flaky.status = 200
+        time.sleep(0.06)
+        assert rpc(client, "host.get", {}) == "flaky"
+        assert client._transport.endpoints[0].healthy  # noqa: SLF001
@@ -0,0 +1,104 @@
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from pyzbx.budget import MemoryBudget, current_budget, set_client_budget
+from pyzbx.exceptions import MemoryBudgetExceededError
+from pyzbx.generics import ZbxGenericGet, rpc
+from pyzbx.session import SessionManager
+from pyzbx.simulator import HOST_BASE, ITEM_BASE, Faults, SimulatorServer
+
+pytestmark = pytest.mark.zabbix_simulator(hosts=100, items_per_host=50)
+
+
+class Get(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+@pytest.fixture()
+def client(zabbix_simulator: SimulatorServer) -> Iterator[httpx.Client]:
+    with httpx.Client(base_url=zabbix_simulator.url, headers={"Authorization": "Bearer test"}) as client:
+        yield client
+
+
+def test_large_get_is_paged(client: httpx.Client, zabbix_simulator: SimulatorServer) -> None:
+    items = ZbxGenericGet(client, "item")
+    output = ["itemid", "hostid", "name", "key_"]
+    expected = items.get(Get(output=output))
+    zabbix_simulator.calls.clear()
+    with MemoryBudget(16 * 1024 * 1024, 128 * 1024):
+        assert items.get(Get(output=output)) == expected
+    assert zabbix_simulator.calls["item.get"] > 2
+
+
+def test_paged_get_keeps_sort_limit_and_preservekeys(client: httpx.Client) -> None:
+    params = {
+        "output": ["itemid", "name"],
+        "hostids": [HOST_BASE + h for h in range(100)],
+        "sortfield": "itemid",
+        "sortorder": "DESC",
+        "limit": 3000,
+        "preservekeys": True,
+    }
+    expected = rpc(client, "item.get", params)
+    with MemoryBudget(16 * 1024 * 1024, 128 * 1024):
+        result = ZbxGenericGet(client, "item").get(Get(**params))
+    assert result == expected
+    assert next(iter(result)) == str(ITEM_BASE + 100 * 50 - 1)
+
+
+def test_over_budget_fails_before_fetching(client: httpx.Client, zabbix_simulator: SimulatorServer) -> None:
+    zabbix_simulator.calls.clear()
+    with MemoryBudget(100_000), pytest.raises(MemoryBudgetExceededError, match="iterate") as e:
+        ZbxGenericGet(client, "item").get(Get(output="extend"))
+    assert e.value.limit == 100_000
+    # only the countOutput preflight was sent
+    assert zabbix_simulator.calls["item.get"] == 1
+
+
+def test_small_limit_skips_preflight(client: httpx.Client, zabbix_simulator: SimulatorServer) -> None:
+    zabbix_simulator.calls.clear()
+    with MemoryBudget(100_000):
+        assert len(ZbxGenericGet(client, "item").get(Get(output=["itemid"], limit=10))) == 10
+    assert zabbix_simulator.calls["item.get"] == 1
+
+
+def test_ids_over_response_size_fail_before_fetching(client: httpx.Client) -> None:
+    with MemoryBudget(16 * 1024 * 1024, 16 * 1024), pytest.raises(MemoryBudgetExceededError, match="IDs"):
+        ZbxGenericGet(client, "item").get(Get(output=["itemid", "name"]))
+
+
+def test_large_response_is_aborted(client: httpx.Client) -> None:
+    with MemoryBudget(100_000) as budget, pytest.raises(MemoryBudgetExceededError) as e:
+        rpc(client, "item.get", {"output": "extend"})
+    assert e.value.limit == budget.response_bytes
+    assert e.value.size > budget.response_bytes
+
+
+def test_client_budget_and_nesting(client: httpx.Client) -> None:
+    set_client_budget(client, 100_000)
+    try:
+        with pytest.raises(MemoryBudgetExceededError):
+            rpc(client, "item.get", {"output": "extend"})
+        with MemoryBudget(10**9, 10**9) as budget:
+            assert current_budget(client) is budget
+            assert len(rpc(client, "item.get", {"output": "extend"})) == 5000
+            with MemoryBudget(10**10) as inner:
+                assert inner.max_bytes == 10**9
+    finally:
+        set_client_budget(client, None)
+    assert current_budget(client) is None
+
+
+@pytest.mark.zabbix_simulator(hosts=10, items_per_host=10, faults=Faults(session_ttl=0.2))
+def test_expired_session_is_renewed(zabbix_simulator: SimulatorServer) -> None:
+    with httpx.Client(base_url=zabbix_simulator.url) as client:
+        client.auth = SessionManager(zabbix_simulator.url, "Admin", "zabbix", check_interval=3600)
+        client.auth.open(client)
+        time.sleep(0.3)
+        with MemoryBudget(10**7):
+            assert len(rpc(client, "item.get", {"output": ["itemid"]})) == 100
+    assert zabbix_simulator.calls["user.login"] >= 2
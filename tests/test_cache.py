@@ -0,0 +1,168 @@
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from pyzbx.cache import InventoryCache
+
+
+class _Zabbix:
+    """A mock frontend holding a small inventory and its audit log.
+
+    Host 101 is in group 1 and linked to template 20, whose item 2001 it inherits as item 1001;
+    host 102 is in groups 1 and 2.
+    """
+
+    def __init__(self) -> None:
+        self.groups = {1: {"groupid": "1", "name": "Linux"}, 2: {"groupid": "2", "name": "Databases"}}
+        self.templates = {20: {"templateid": "20", "host": "Template OS"}}
+        self.hosts = {
+            101: {"hostid": "101", "host": "web01", "groups": [1], "templates": [20]},
+            102: {"hostid": "102", "host": "db01", "groups": [1, 2], "templates": []},
+        }
+        self.items = {
+            1001: {"itemid": "1001", "hostid": "101", "key_": "system.cpu.load", "templateid": "2001"},
+            1002: {"itemid": "1002", "hostid": "101", "key_": "web.page", "templateid": "0"},
+            1003: {"itemid": "1003", "hostid": "102", "key_": "db.size", "templateid": "0"},
+            2001: {"itemid": "2001", "hostid": "20", "key_": "system.cpu.load", "templateid": "0"},
+        }
+        self.audit: list[dict[str, str]] = []
+        self.calls: Counter[str] = Counter()
+
+    def log(self, clock: int, action: int, resourcetype: int, resourceid: int) -> None:
+        entry = {"clock": clock, "action": action, "resourcetype": resourcetype, "resourceid": resourceid}
+        self.audit.append({key: str(value) for key, value in entry.items()})
+
+    def delete_template(self, templateid: int) -> None:
+        """Deletes a template, with the items its hosts inherited from it, like the server does."""
+        del self.templates[templateid]
+        inherited = {str(i) for i, item in self.items.items() if item["hostid"] == str(templateid)}
+        self.items = {
+            i: item
+            for i, item in self.items.items()
+            if item["hostid"] != str(templateid) and item["templateid"] not in inherited
+        }
+        for host in self.hosts.values():
+            host["templates"] = [t for t in host["templates"] if t != templateid]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        method, params = payload["method"], payload["params"]
+        self.calls[method] += 1
+        result = getattr(self, method.replace(".get", ""))(params)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+    def hostgroup(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return [g for i, g in self.groups.items() if i in params.get("groupids", self.groups)]
+
+    def template(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return [t for i, t in self.templates.items() if i in params.get("templateids", self.templates)]
+
+    def host(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        assert params["selectHostGroups"] == ["groupid"]
+        assert params["selectParentTemplates"] == ["templateid"]
+        return [
+            {
+                "hostid": host["hostid"],
+                "host": host["host"],
+                "hostgroups": [{"groupid": str(g)} for g in host["groups"]],
+                "parentTemplates": [{"templateid": str(t)} for t in host["templates"]],
+            }
+            for i, host in self.hosts.items()
+            if i in params.get("hostids", self.hosts)
+        ]
+
+    def item(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        items = [item for i, item in self.items.items() if i in params.get("itemids", self.items)]
+        if "hostids" in params:
+            items = [item for item in items if int(item["hostid"]) in params["hostids"]]
+        if params.get("templated") is False:
+            items = [item for item in items if int(item["hostid"]) not in self.templates]
+        return items
+
+    def auditlog(self, params: dict[str, Any]) -> list[dict[str, str]]:
+        return [entry for entry in self.audit if int(entry["clock"]) >= params["time_from"]]
+
+
+@pytest.fixture()
+def zabbix() -> _Zabbix:
+    return _Zabbix()
+
+
+@pytest.fixture()
+def cache(zabbix: _Zabbix, tmp_path: Path) -> InventoryCache:
+    client = httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(zabbix))
+    cache = InventoryCache(client, tmp_path / "inventory.db", chunk_size=1, clock_overlap=0)
+    assert cache.sync() == 2 + 1 + 2 + 3
+    return cache
+
+
+def _ids(objects: Any, pk: str) -> list[int]:
+    return [int(obj[pk]) for obj in objects]
+
+
+def test_full_load(cache: InventoryCache, tmp_path: Path) -> None:
+    assert cache.last_clock is not None
+    assert _ids(cache.all("hostgroup"), "groupid") == [1, 2]
+    assert _ids(cache.all("template"), "templateid") == [20]
+    assert _ids(cache.all("host"), "hostid") == [101, 102]
+    # items of templates are not cached
+    assert _ids(cache.all("item"), "itemid") == [1001, 1002, 1003]
+    assert _ids(cache.children("item", 101), "itemid") == [1001, 1002]
+    assert cache.get("host", 102)["hostgroups"] == [{"groupid": "1"}, {"groupid": "2"}]  # type: ignore[index]
+    cache.close()
+    # the next run warm starts from the file
+    with InventoryCache(cache.client, tmp_path / "inventory.db") as warm:
+        assert warm.count("item") == 3
+        assert warm.sync() == 0
+
+
+def test_incremental_update(cache: InventoryCache, zabbix: _Zabbix) -> None:
+    clock = cache.last_clock + 1  # type: ignore[operator]
+    zabbix.items[1002]["key_"] = "web.page.perf"
+    zabbix.items[1004] = {"itemid": "1004", "hostid": "102", "key_": "db.connections", "templateid": "0"}
+    zabbix.items[2001]["key_"] = "system.cpu.load[all]"
+    for itemid in (1002, 1004, 2001):
+        zabbix.log(clock, 1, 15, itemid)
+    zabbix.calls.clear()
+    assert cache.sync() == 2
+    assert zabbix.calls["host.get"] == 0
+    assert cache.get("item", 1002)["key_"] == "web.page.perf"  # type: ignore[index]
+    assert _ids(cache.children("item", 102), "itemid") == [1003, 1004]
+    # an audited change of a template item does not cache it
+    assert cache.get("item", 2001) is None
+    assert cache.last_clock == clock
+
+
+def test_host_delete_removes_its_items(cache: InventoryCache, zabbix: _Zabbix) -> None:
+    del zabbix.hosts[102]
+    del zabbix.items[1003]
+    zabbix.log(cache.last_clock + 1, 2, 4, 102)  # type: ignore[operator]
+    assert cache.sync() == 0
+    assert _ids(cache.all("host"), "hostid") == [101]
+    assert _ids(cache.all("item"), "itemid") == [1001, 1002]
+
+
+def test_group_delete_refetches_its_hosts(cache: InventoryCache, zabbix: _Zabbix) -> None:
+    del zabbix.groups[2]
+    zabbix.hosts[102]["groups"] = [1]
+    zabbix.log(cache.last_clock + 1, 2, 14, 2)  # type: ignore[operator]
+    zabbix.calls.clear()
+    assert cache.sync() == 1
+    assert zabbix.calls["item.get"] == 0
+    assert _ids(cache.all("hostgroup"), "groupid") == [1]
+    assert cache.get("host", 102)["hostgroups"] == [{"groupid": "1"}]  # type: ignore[index]
+
+
+def test_template_delete_removes_inherited_items(cache: InventoryCache, zabbix: _Zabbix) -> None:
+    zabbix.delete_template(20)
+    zabbix.log(cache.last_clock + 1, 2, 30, 20)  # type: ignore[operator]
+    # the host and its remaining item are read again
+    assert cache.sync() == 2
+    assert cache.count("template") == 0
+    assert cache.get("host", 101)["parentTemplates"] == []  # type: ignore[index]
+    assert _ids(cache.children("item", 101), "itemid") == [1002]
+    assert _ids(cache.children("item", 102), "itemid") == [1003]
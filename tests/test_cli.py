@@ -0,0 +1,93 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pyzbx import cli
+from pyzbx.simulator import ITEM_BASE, SimulatorServer
+
+START = 1_700_000_000 // 86400 * 86400
+
+
+def _export(server: SimulatorServer, output: Path) -> int:
+    return cli.main(
+        [
+            "--url",
+            server.url,
+            "--token",
+            "test",
+            "export-history",
+            "--items",
+            f"{ITEM_BASE},{ITEM_BASE + 1},{ITEM_BASE + 2}",
+            f"{ITEM_BASE + 3}",
+            "--from",
+            str(START),
+            "--till",
+            str(START + 3599),
+            "--output",
+            str(output),
+            "--window",
+            "600",
+            "--workers",
+            "2",
+            "--rows-per-file",
+            "25",
+        ]
+    )
+
+
+def _rows(output: Path) -> list[tuple[str, ...]]:
+    rows = []
+    for part in output.glob("part-*.csv"):
+        with part.open(newline="") as f:
+            rows.extend(tuple(row) for row in list(csv.reader(f))[1:])
+    return sorted(rows)
+
+
+@pytest.mark.zabbix_simulator(hosts=1, items_per_host=4, start=START)
+def test_export_history(zabbix_simulator: SimulatorServer, tmp_path: Path) -> None:
+    assert _export(zabbix_simulator, tmp_path) == 0
+    rows = _rows(tmp_path)
+    # 4 items with a value every minute for an hour
+    assert len(rows) == 240
+    assert {row[0] for row in rows} == {str(ITEM_BASE + k) for k in range(4)}
+    assert {path.name.split("-")[1] for path in tmp_path.glob("part-*")} == {"float", "uint"}
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert len(state["done"]) == 24
+    assert sorted(state["parts"]) == sorted(path.name for path in tmp_path.glob("part-*"))
+
+
+@pytest.mark.zabbix_simulator(hosts=1, items_per_host=4, start=START)
+def test_interrupted_export_resumes(
+    zabbix_simulator: SimulatorServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _export(zabbix_simulator, tmp_path / "full")
+    expected = _rows(tmp_path / "full")
+
+    fetch = cli._fetch  # noqa: SLF001
+    fetched = 0
+
+    def interrupted(*args: Any) -> list[dict[str, Any]]:
+        nonlocal fetched
+        fetched += 1
+        if fetched > 14:
+            raise KeyboardInterrupt
+        return fetch(*args)
+
+    output = tmp_path / "resumed"
+    monkeypatch.setattr(cli, "_fetch", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        _export(zabbix_simulator, output)
+    monkeypatch.setattr(cli, "_fetch", fetch)
+    done = json.loads((output / "state.json").read_text())["done"]
+    assert 0 < len(done) < 24
+    # an uncommitted part file of the interrupted run
+    (output / "part-float-09999.csv").write_text("itemid,clock,ns,value\n1,2,3,4\n")
+
+    zabbix_simulator.calls.clear()
+    assert _export(zabbix_simulator, output) == 0
+    assert zabbix_simulator.calls["history.get"] == 24 - len(done)
+    assert _rows(output) == expected
+    assert not (output / "part-float-09999.csv").exists()
@@ -0,0 +1,116 @@
+import json
+import stat
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from pyzbx import schemas as sc
+from pyzbx.budget import MemoryBudget
+from pyzbx.client import ZabbixClient
+from pyzbx.exceptions import MemoryBudgetExceededError
+from pyzbx.generics import rpc
+from pyzbx.simulator import SimulatorServer
+
+
+@pytest.mark.zabbix_simulator(hosts=3, items_per_host=2)
+def test_sessions_are_not_cached_by_default(zabbix_simulator: SimulatorServer) -> None:
+    for _ in range(2):
+        with ZabbixClient(zabbix_simulator.url, "Admin", "zabbix") as client:
+            assert client.post("", json={"jsonrpc": "2.0", "method": "host.get", "params": {}, "id": 1}).is_success
+    assert zabbix_simulator.calls["user.login"] == 2
+    assert zabbix_simulator.calls["user.logout"] == 2
+
+
+@pytest.mark.zabbix_simulator(hosts=3, items_per_host=2)
+def test_token_cache(zabbix_simulator: SimulatorServer, tmp_path: Path) -> None:
+    path = tmp_path / "sessions.json"
+    # a cache file left readable by others is tightened when written
+    path.write_text("{}")
+    path.chmod(0o644)
+    for _ in range(2):
+        zbx = ZabbixClient(zabbix_simulator.url, "Admin", "zabbix", token_cache=path)
+        assert len(zbx.host.get(sc.HostGet(output=["hostid"]))) == 3
+        zbx.close()
+    assert zabbix_simulator.calls["user.login"] == 1
+    assert zabbix_simulator.calls["user.logout"] == 0
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert stat.S_IMODE(path.with_name("sessions.json.lock").stat().st_mode) == 0o600
+
+
+@pytest.mark.zabbix_simulator(hosts=3, items_per_host=2)
+def test_clients_do_not_share_api_objects(zabbix_simulator: SimulatorServer) -> None:
+    first = ZabbixClient(zabbix_simulator.url, token="first")  # noqa: S106
+    second = ZabbixClient(zabbix_simulator.url, token="second")  # noqa: S106
+    assert first.host is first.host
+    assert first.host.client is first.client
+    assert second.host.client is second.client
+    first.close()
+    assert len(second.host.get(sc.HostGet(output=["hostid"]))) == 3
+    second.close()
+
+
+@pytest.mark.zabbix_simulator(hosts=3, items_per_host=2)
+def test_url_list_is_balanced(zabbix_simulator: SimulatorServer) -> None:
+    # nothing listens on port 9 of the loopback: the first frontend is down
+    urls = ["http://127.0.0.1:9", zabbix_simulator.url]
+    zbx = ZabbixClient(urls, token="test", health_check_interval=None)  # noqa: S106
+    assert zbx.urls == [f"{url}/api_jsonrpc.php" for url in urls]
+    assert [len(zbx.host.get(sc.HostGet(output=["hostid"]))) for _ in range(3)] == [3, 3, 3]
+    assert zabbix_simulator.calls["host.get"] == 3
+    assert not zbx.transport.endpoints[0].healthy
+    zbx.close()
+    with httpx.Client() as session, pytest.raises(ValueError, match="session"):
+        ZabbixClient(urls, token="test", session=session)  # noqa: S106
+
+
+@pytest.mark.zabbix_simulator(hosts=100, items_per_host=50)
+def test_memory_budget_applies_to_every_call(zabbix_simulator: SimulatorServer) -> None:
+    with ZabbixClient(zabbix_simulator.url, token="test") as client:  # noqa: S106
+        expected = rpc(client, "item.get", {"output": ["itemid", "name"]})
+    zbx = ZabbixClient(zabbix_simulator.url, token="test", memory_budget=100_000)  # noqa: S106
+    with pytest.raises(MemoryBudgetExceededError):
+        zbx.item.get(sc.ItemGet(output="extend"))
+    zbx.close()
+    budget = MemoryBudget(16 * 1024 * 1024, 128 * 1024)
+    zbx = ZabbixClient(zabbix_simulator.url, token="test", memory_budget=budget)  # noqa: S106
+    zabbix_simulator.calls.clear()
+    assert zbx.item.get(sc.ItemGet(output=["itemid", "name"])) == expected
+    # a countOutput preflight, then pages of at most 128 KiB
+    assert zabbix_simulator.calls["item.get"] > 2
+    zbx.close()
+
+
+def _mock_client(result: Any, requests: list[dict[str, Any]]) -> ZabbixClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        requests.append(payload)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    return ZabbixClient("http://zabbix", token="test", session=session)  # noqa: S106
+
+
+def test_sla_getsli() -> None:
+    result = {"periods": [{"period_from": 0, "period_to": 86400}], "serviceids": [1], "sli": [[{"sli": 99.9}]]}
+    requests: list[dict[str, Any]] = []
+    zbx = _mock_client(result, requests)
+    assert zbx.sla.getsli(sc.SlaGetSli(slaid=3, periods=1, serviceids=[1])) == result
+    zbx.close()
+    assert requests[0]["method"] == "sla.getsli"
+    assert requests[0]["params"] == {"slaid": 3, "periods": 1, "serviceids": [1]}
+
+
+def test_history_push() -> None:
+    result = {"response": "success", "data": [{"itemid": "1"}, {"error": "No permissions to referred object."}]}
+    requests: list[dict[str, Any]] = []
+    zbx = _mock_client(result, requests)
+    values: list[sc.HistoryPushValue] = [
+        {"itemid": 1, "value": 1.5, "clock": 1700000000, "ns": 0},
+        {"host": "web", "key": "trap", "value": "up"},
+    ]
+    assert zbx.history.push(values) == result
+    zbx.close()
+    assert requests[0]["method"] == "history.push"
+    assert requests[0]["params"] == values
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import pytest
+
+from pyzbx.deadline import Deadline, current_deadline
+from pyzbx.exceptions import DeadlineExceededError, OperationCancelledError, ZabbixAPIError
+from pyzbx.executor import run_concurrently
+from pyzbx.generics import rpc
+
+
+class _Frontend:
+    """A mock frontend echoing ``params["n"]`` after ``params["delay"]`` seconds, or failing on ``"fail"``."""
+
+    def __init__(self) -> None:
+        self.started: list[int] = []
+        self.answered: list[int] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        params = payload["params"]
+        with self._lock:
+            self.started.append(params["n"])
+        time.sleep(params.get("delay", 0))
+        with self._lock:
+            self.answered.append(params["n"])
+        if params.get("fail"):
+            error = {"code": -32500, "message": "Application error.", "data": "No permissions."}
+            return httpx.Response(200, json={"jsonrpc": "2.0", "error": error, "id": payload["id"]})
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": params["n"], "id": payload["id"]})
+
+
+@pytest.fixture()
+def frontend() -> _Frontend:
+    return _Frontend()
+
+
+@pytest.fixture()
+def client(frontend: _Frontend) -> Iterator[httpx.Client]:
+    transport = httpx.MockTransport(frontend)
+    with httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=transport) as client:
+        yield client
+
+
+def _calls(client: httpx.Client, *delays: float, **params: Any) -> list[tuple[Any, ...]]:
+    return [(client, "host.get", {"n": n, "delay": delay, **params}) for n, delay in enumerate(delays)]
+
+
+def test_deadline_nesting() -> None:
+    with Deadline(10) as outer:
+        with Deadline(60) as inner:
+            assert current_deadline() is inner
+            assert inner.expires_at == outer.expires_at
+            assert inner.timeout(30).read <= 10
+            outer.cancel()
+            assert inner.cancelled
+            with pytest.raises(OperationCancelledError, match="host.get cancelled"):
+                inner.check("host.get")
+        assert current_deadline() is outer
+    assert current_deadline() is None
+    unlimited = Deadline()
+    assert unlimited.wait_timeout() is None
+    assert unlimited.timeout(5).read == 5
+
+
+def test_rpc_is_refused_once_cancelled_or_expired(client: httpx.Client, frontend: _Frontend) -> None:
+    with Deadline(0), pytest.raises(DeadlineExceededError, match="before host.get"):
+        rpc(client, "host.get", {"n": 0})
+    with Deadline() as deadline:
+        deadline.cancel()
+        with pytest.raises(OperationCancelledError):
+            rpc(client, "host.get", {"n": 1})
+    assert frontend.started == []
+
+
+def test_results_in_order(client: httpx.Client) -> None:
+    assert run_concurrently(rpc, _calls(client, 0.03, 0.01, 0.02, 0), max_workers=4) == [0, 1, 2, 3]
+    assert run_concurrently(rpc, _calls(client, 0, 0), max_workers=1) == [0, 1]
+    assert run_concurrently(rpc, []) == []
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_partial_results_at_the_deadline(client: httpx.Client, max_workers: int) -> None:
+    with Deadline(0.15), pytest.raises(DeadlineExceededError) as excinfo:
+        run_concurrently(rpc, _calls(client, 0, 0.01, 0.5, 0), max_workers=max_workers)
+    if max_workers == 1:
+        # the slow call is not interrupted (the mock transport has no timeout), the next one is refused
+        assert excinfo.value.partial == [0, 1, 2, None]
+    else:
+        assert excinfo.value.partial == [0, 1, None, 3]
+
+
+def test_requests_in_flight_are_not_interrupted(client: httpx.Client, frontend: _Frontend) -> None:
+    def two_calls(n: int) -> int:
+        rpc(client, "host.get", {"n": n, "delay": 0.2})
+        return rpc(client, "host.get", {"n": n + 10})
+
+    started = time.monotonic()
+    with Deadline(0.05), pytest.raises(DeadlineExceededError) as excinfo:
+        run_concurrently(two_calls, [(0,), (1,)])
+    # the deadline is reported on time, while the requests sent keep running
+    assert time.monotonic() - started < 0.15
+    assert excinfo.value.partial == [None, None]
+    assert frontend.answered == []
+    time.sleep(0.3)
+    assert sorted(frontend.answered) == [0, 1]
+    # the calls in flight were refused their next request
+    assert sorted(frontend.started) == [0, 1]
+
+
+def test_failure_cancels_siblings(client: httpx.Client, frontend: _Frontend) -> None:
+    calls = [(client, "host.get", {"n": 0, "fail": True}), *_calls(client, *[0.05] * 8)[1:]]
+    with pytest.raises(ZabbixAPIError, match="No permissions"):
+        run_concurrently(rpc, calls, max_workers=2)
+    time.sleep(0.1)
+    # the call started next to the failing one completes, the queued ones never start, but for
+    # one a worker may have picked up before the failure was seen
+    assert len(frontend.started) <= 3
@@ -0,0 +1,64 @@
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from pyzbx.explain import Strategy, execute, explain
+from pyzbx.generics import paginate, rpc
+from pyzbx.simulator import HOST_BASE, ITEM_BASE, SimulatorServer
+
+
+@pytest.fixture()
+def client(zabbix_simulator: SimulatorServer) -> Iterator[httpx.Client]:
+    with httpx.Client(base_url=zabbix_simulator.url, headers={"Authorization": "Bearer test"}) as client:
+        yield client
+
+
+@pytest.mark.zabbix_simulator(hosts=200, items_per_host=50)
+def test_id_sharding_sorts_merged_rows(client: httpx.Client) -> None:
+    params = {"output": ["itemid", "name"], "hostids": [HOST_BASE + h for h in range(200)], "sortfield": "name"}
+    plan = explain(client, "item", params, max_rows=1000)
+    assert plan.strategy == Strategy.ID_SHARDING
+    assert execute(client, plan) == rpc(client, "item.get", params)
+
+
+@pytest.mark.zabbix_simulator(hosts=200, items_per_host=50)
+def test_limit_pages_the_first_ids(client: httpx.Client) -> None:
+    params = {
+        "output": "extend",
+        "hostids": [HOST_BASE + h for h in range(200)],
+        "sortfield": "itemid",
+        "sortorder": "DESC",
+        "limit": 3000,
+    }
+    plan = explain(client, "item", params, max_rows=1000)
+    assert plan.strategy == Strategy.KEYSET_PAGING
+    result = execute(client, plan)
+    assert [row["itemid"] for row in result] == [row["itemid"] for row in rpc(client, "item.get", params)]
+    assert result[0]["itemid"] == str(ITEM_BASE + 200 * 50 - 1)
+
+
+@pytest.mark.zabbix_simulator(hosts=20, items_per_host=100)
+def test_keyset_paging_with_preservekeys(client: httpx.Client) -> None:
+    params = {"output": ["itemid", "name"], "preservekeys": True}
+    plan = explain(client, "item", params, max_rows=1000)
+    assert plan.strategy == Strategy.KEYSET_PAGING
+    assert execute(client, plan) == rpc(client, "item.get", params)
+
+
+@pytest.mark.zabbix_simulator(hosts=2, items_per_host=4, item_delay=600)
+def test_time_sharding(client: httpx.Client) -> None:
+    now = int(time.time())
+    params = {"history": 0, "time_from": now - 86400, "sortfield": "clock", "sortorder": "DESC", "limit": 50}
+    plan = explain(client, "history", params, max_rows=20)
+    assert plan.strategy == Strategy.TIME_SHARDING
+    assert execute(client, plan) == rpc(client, "history.get", params)
+
+
+@pytest.mark.zabbix_simulator(hosts=2, items_per_host=4)
+def test_history_is_not_paged(client: httpx.Client) -> None:
+    with pytest.raises(ValueError, match="no primary key"):
+        next(paginate(client, "history", {"history": 0}))
+    plan = explain(client, "history", {"history": 0}, max_rows=10)
+    assert plan.strategy == Strategy.SINGLE
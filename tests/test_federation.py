@@ -0,0 +1,63 @@
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+
+from pyzbx.federation import ZabbixFederation
+
+
+def _server(problems: list[dict[str, str]], calls: list[dict[str, Any]]) -> SimpleNamespace:
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        params = payload["params"]
+        calls.append({**params, "timeout": request.extensions["timeout"]})
+        if params.get("countOutput"):
+            return httpx.Response(200, json={"jsonrpc": "2.0", "result": str(len(problems)), "id": payload["id"]})
+        rows = sorted(problems, key=lambda p: int(p["eventid"]), reverse=params.get("sortorder") == "DESC")
+        if limit := params.get("limit"):
+            rows = rows[:limit]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": rows, "id": payload["id"]})
+
+    client = httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(handler), timeout=7)
+    return SimpleNamespace(client=client)
+
+
+def test_sort_key_the_server_cannot_sort_by() -> None:
+    calls: list[dict[str, Any]] = []
+    eu = _server([{"eventid": "1", "clock": "300"}, {"eventid": "2", "clock": "100"}], calls)
+    us = _server([{"eventid": "3", "clock": "200"}, {"eventid": "4", "clock": "50"}], calls)
+    federation = ZabbixFederation({"eu": eu, "us": us})
+    result = federation.problem.get({"limit": 3}, sort_key="clock", reverse=True)
+    assert [row["eventid"] for row in result.rows] == ["1", "3", "2"]
+    assert all("limit" not in params and "sortfield" not in params for params in calls)
+
+
+def test_sort_key_pushed_down_and_limited_after_the_merge() -> None:
+    calls: list[dict[str, Any]] = []
+    eu = _server([{"eventid": "1"}, {"eventid": "4"}], calls)
+    us = _server([{"eventid": "2"}, {"eventid": "3"}], calls)
+    result = ZabbixFederation({"eu": eu, "us": us}).problem.get({"limit": 2}, sort_key="eventid")
+    assert [(row["eventid"], row["zabbix_server"]) for row in result.rows] == [("1", "eu"), ("2", "us")]
+    assert all(params["sortfield"] == "eventid" and params["limit"] == 2 for params in calls)
+
+
+def test_client_timeout_applies_without_a_federation_timeout() -> None:
+    calls: list[dict[str, Any]] = []
+    ZabbixFederation({"eu": _server([{"eventid": "1"}], calls)}).problem.get({})
+    ZabbixFederation({"eu": _server([{"eventid": "1"}], calls)}, timeout=2).problem.get({})
+    assert [params["timeout"]["read"] for params in calls] == [7, 2]
+
+
+def test_counts_are_summed() -> None:
+    calls: list[dict[str, Any]] = []
+    eu = _server([{"eventid": "1"}, {"eventid": "4"}], calls)
+    us = _server([{"eventid": "2"}], calls)
+    federation = ZabbixFederation({"eu": eu, "us": us})
+    result = federation.problem.get({"countOutput": True})
+    assert result == ([], {}, 3)
+    with pytest.raises(ValueError, match="countOutput"):
+        list(federation.problem.iter_get({"countOutput": True}))
+    with pytest.raises(ValueError, match="preservekeys"):
+        federation.problem.get({"preservekeys": True})
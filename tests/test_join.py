@@ -0,0 +1,83 @@
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from pyzbx.join import JoinPlanner
+
+EVENTS = [
+    {"eventid": "1", "source": "0", "object": "0", "objectid": "20001"},
+    # an internal event about an item, its objectid is not a trigger
+    {"eventid": "2", "source": "3", "object": "4", "objectid": "20001"},
+]
+TRIGGERS = {"20001": {"triggerid": "20001", "description": "High load", "hosts": [{"hostid": "10001"}]}}
+HOSTS = {"10001": {"hostid": "10001", "host": "web-1"}}
+
+
+def _fields(row: dict[str, Any], output: Any) -> dict[str, Any]:
+    return dict(row) if output == "extend" else {k: v for k, v in row.items() if k in output}
+
+
+def _client(calls: list[tuple[str, dict[str, Any]]]) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        method, params = payload["method"], payload["params"]
+        calls.append((method, params))
+        output = params.get("output", "extend")
+        if method == "event.get" and params.get("countOutput"):
+            result = str(len(EVENTS))
+        elif method == "event.get":
+            result = [_fields(e, output) for e in EVENTS]
+        elif method == "trigger.get":
+            result = [
+                {**_fields(TRIGGERS[i], output), "hosts": TRIGGERS[i]["hosts"]}
+                if "selectHosts" in params
+                else _fields(TRIGGERS[i], output)
+                for i in params["triggerids"]
+                if i in TRIGGERS
+            ]
+        else:
+            result = [_fields(HOSTS[i], output) for i in params["hostids"] if i in HOSTS]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+    return httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(handler))
+
+
+def test_only_trigger_events_are_joined() -> None:
+    calls: list[tuple[str, dict[str, Any]]] = []
+    with _client(calls) as client:
+        rows = JoinPlanner(client).get(
+            "event", {"output": ["eventid"], "selectHosts": ["host"], "selectRelatedObject": ["description"]}
+        )
+    assert rows == [
+        {"eventid": "1", "hosts": [{"host": "web-1"}], "relatedObject": {"description": "High load"}},
+        {"eventid": "2", "hosts": [], "relatedObject": []},
+    ]
+    assert calls[0][1]["output"] == ["eventid", "object", "objectid", "source"]
+
+
+def test_count_output() -> None:
+    with _client([]) as client:
+        rows = JoinPlanner(client).get("event", {"output": ["eventid"], "selectHosts": "count"})
+    assert rows == [{"eventid": "1", "hosts": "1"}, {"eventid": "2", "hosts": "0"}]
+
+
+def test_preservekeys_rekeys_joined_rows() -> None:
+    calls: list[tuple[str, dict[str, Any]]] = []
+    with _client(calls) as client:
+        rows = JoinPlanner(client).get("event", {"output": ["source"], "selectHosts": ["host"], "preservekeys": True})
+    assert rows == {"1": {"source": "0", "hosts": [{"host": "web-1"}]}, "2": {"source": "3", "hosts": []}}
+    assert "preservekeys" not in calls[0][1]
+
+
+def test_count_output_skips_the_joins() -> None:
+    calls: list[tuple[str, dict[str, Any]]] = []
+    with _client(calls) as client:
+        assert JoinPlanner(client).get("event", {"countOutput": True, "selectHosts": ["host"]}) == "2"
+    assert calls == [("event.get", {"countOutput": True})]
+
+
+def test_trigger_relations_reject_other_events() -> None:
+    with _client([]) as client, pytest.raises(ValueError, match="source 0, object 0"):
+        JoinPlanner(client).get("event", {"output": ["eventid"], "source": 3, "object": 4, "selectHosts": ["host"]})
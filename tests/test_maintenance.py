@@ -0,0 +1,48 @@
+import json
+import time
+
+import httpx
+
+from pyzbx.maintenance import ONE_TIME, TAG_OPERATOR_EQUALS, MaintenanceIndex
+
+NOW = int(time.time())
+
+
+def _maintenance(maintenanceid: str, hostid: str, tags: list[dict[str, str]]) -> dict:
+    return {
+        "maintenanceid": maintenanceid,
+        "name": f"m{maintenanceid}",
+        "maintenance_type": "0",
+        "active_since": str(NOW - 3600),
+        "active_till": str(NOW + 3600),
+        "tags_evaltype": "0",
+        "tags": tags,
+        "hosts": [{"hostid": hostid}],
+        "hostgroups": [],
+        "timeperiods": [{"timeperiod_type": str(ONE_TIME), "start_date": str(NOW - 600), "period": "1200"}],
+    }
+
+
+def _client() -> httpx.Client:
+    maintenances = [
+        _maintenance("1", "10001", []),
+        _maintenance("2", "10002", [{"tag": "service", "operator": str(TAG_OPERATOR_EQUALS), "value": "db"}]),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": maintenances, "id": payload["id"]})
+
+    return httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(handler))
+
+
+def test_tag_limited_maintenance_does_not_cover_the_host() -> None:
+    with _client() as client:
+        index = MaintenanceIndex(client)
+        assert index.in_maintenance(10001, NOW)
+        assert not index.in_maintenance(10002, NOW)
+        assert index.in_maintenance(10002, NOW, problem_tags=[{"tag": "service", "value": "db"}])
+        assert not index.in_maintenance(10002, NOW, problem_tags=[{"tag": "service", "value": "web"}])
+        assert index.hosts_in_maintenance(NOW) == [10001]
+        [window] = index.windows(10002, NOW)
+        assert window.tags == (("service", TAG_OPERATOR_EQUALS, "db"),)
@@ -0,0 +1,61 @@
+import json
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from pyzbx.budget import MemoryBudget
+from pyzbx.deadline import Deadline
+from pyzbx.exceptions import DeadlineExceededError, MemoryBudgetExceededError
+from pyzbx.prepared import PreparedQuery
+from pyzbx.simulator import HOST_BASE, Faults, SimulatorServer
+
+
+@pytest.fixture()
+def client(zabbix_simulator: SimulatorServer) -> Iterator[httpx.Client]:
+    with httpx.Client(base_url=zabbix_simulator.url, headers={"Authorization": "Bearer test"}) as client:
+        yield client
+
+
+def test_body_splices_variables() -> None:
+    client = httpx.Client()
+    query = PreparedQuery(client, "host.get", {"output": ["hostid"], "limit": 5}, ("hostids", "limit"))
+    assert json.loads(query.body(hostids=[1, 2])) == {
+        "jsonrpc": "2.0",
+        "method": "host.get",
+        "id": 1,
+        "params": {"output": ["hostid"], "hostids": [1, 2], "limit": 5},
+    }
+    assert json.loads(query.body(limit=1))["params"] == {"output": ["hostid"], "limit": 1}
+    with pytest.raises(TypeError, match="groupids"):
+        query.body(groupids=[1])
+    empty = PreparedQuery(client, "host.get", {}, ("hostids",))
+    assert json.loads(empty.body())["params"] == {}
+    client.close()
+
+
+@pytest.mark.zabbix_simulator(hosts=10, items_per_host=2)
+def test_call(client: httpx.Client) -> None:
+    query = PreparedQuery(client, "host.get", {"output": ["hostid"]}, ("hostids",))
+    assert query(hostids=[HOST_BASE + 3]) == [{"hostid": str(HOST_BASE + 3)}]
+
+
+@pytest.mark.zabbix_simulator(hosts=10, items_per_host=2, faults=Faults(latency=0.2))
+def test_deadline(client: httpx.Client, zabbix_simulator: SimulatorServer) -> None:
+    query = PreparedQuery(client, "host.get", {"output": ["hostid"]}, ("hostids",))
+    # the timeout of the call is clamped to the time left
+    with Deadline(0.05), pytest.raises(DeadlineExceededError):
+        query(hostids=[HOST_BASE])
+    # an expired deadline refuses the call before it is sent
+    zabbix_simulator.calls.clear()
+    with Deadline(0), pytest.raises(DeadlineExceededError):
+        query(hostids=[HOST_BASE])
+    assert zabbix_simulator.calls["host.get"] == 0
+
+
+@pytest.mark.zabbix_simulator(hosts=100, items_per_host=50)
+def test_memory_budget(client: httpx.Client) -> None:
+    query = PreparedQuery(client, "item.get", {"output": "extend"}, ("hostids",))
+    assert len(query(hostids=[HOST_BASE])) == 50
+    with MemoryBudget(50_000), pytest.raises(MemoryBudgetExceededError, match="item.get"):
+        query()
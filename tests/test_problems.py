@@ -0,0 +1,157 @@
+import json
+from collections import Counter
+from typing import Any
+
+import httpx
+
+from pyzbx.problems import ProblemView
+
+# trigger -> hosts, host -> groups
+TRIGGER_HOSTS = {1: [101], 2: [102], 3: [101, 103]}
+HOST_GROUPS = {101: [11], 102: [12], 103: [11, 12]}
+
+
+class _Zabbix:
+    """A mock frontend holding trigger events; ``problem.get`` answers the problems not resolved yet."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self.calls: Counter[str] = Counter()
+
+    def problem(self, triggerid: int, severity: int = 3, tags: tuple[tuple[str, str], ...] = ()) -> int:
+        eventid = len(self.events) + 1
+        self.events.append(
+            {
+                "eventid": str(eventid),
+                "objectid": str(triggerid),
+                "clock": str(1_700_000_000 + eventid),
+                "name": f"problem {eventid}",
+                "severity": str(severity),
+                "value": "1",
+                "r_eventid": "0",
+                "acknowledged": "0",
+                "suppressed": "0",
+                "tags": [{"tag": tag, "value": value} for tag, value in tags],
+            }
+        )
+        return eventid
+
+    def recover(self, *eventids: int) -> None:
+        """Resolves ``eventids``, which must be problems of one trigger, with one recovery event."""
+        recovery = len(self.events) + 1
+        problems = [self.events[eventid - 1] for eventid in eventids]
+        for problem in problems:
+            problem["r_eventid"] = str(recovery)
+        self.events.append({**problems[0], "eventid": str(recovery), "value": "0", "r_eventid": "0", "tags": []})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        method, params = payload["method"], payload["params"]
+        self.calls[method] += 1
+        if method == "event.get":
+            result = self._events(params)
+        elif method == "problem.get":
+            result = [e for e in self.events if e["value"] == "1" and e["r_eventid"] == "0"]
+            if "eventids" in params:
+                result = [e for e in result if int(e["eventid"]) in params["eventids"]]
+            result = [_output(e, params["output"]) for e in result]
+        elif method == "trigger.get":
+            result = [
+                {"triggerid": str(t), "hosts": [{"hostid": str(h)} for h in TRIGGER_HOSTS[t]]}
+                for t in params["triggerids"]
+            ]
+        else:
+            result = [
+                {"hostid": str(h), "hostgroups": [{"groupid": str(g)} for g in HOST_GROUPS[h]]}
+                for h in params["hostids"]
+            ]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+    def _events(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        if params["sortorder"] == "DESC":
+            return [_output(e, params["output"]) for e in self.events[::-1][: params["limit"]]]
+        events = [e for e in self.events if int(e["eventid"]) >= params["eventid_from"]]
+        return [_output(e, params["output"]) for e in events[: params["limit"]]]
+
+
+def _output(event: dict[str, Any], output: list[str]) -> dict[str, Any]:
+    return {key: value for key, value in event.items() if key in output or key == "tags"}
+
+
+def _view(zabbix: _Zabbix, page_size: int = 1000) -> ProblemView:
+    client = httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(zabbix))
+    return ProblemView(client, sync_interval=3600, page_size=page_size)
+
+
+def test_load() -> None:
+    zabbix = _Zabbix()
+    first = zabbix.problem(1, severity=4, tags=(("service", "payments"),))
+    zabbix.recover(zabbix.problem(2))
+    third = zabbix.problem(3)
+    view = _view(zabbix, page_size=1)
+    assert view.load() == 2
+    assert view.watermark == 4
+    assert [p.eventid for p in view.query()] == [first, third]
+    problem = view.get(first)
+    assert problem is not None
+    assert problem.hostids == (101,)
+    assert problem.groupids == (11,)
+    assert problem.tags == (("service", "payments"),)
+    assert view.get(third).groupids == (11, 12)  # type: ignore[union-attr]
+    assert view.counts("host") == {101: 2, 103: 1}
+
+
+def test_sync_adds_problems_and_applies_recoveries() -> None:
+    zabbix = _Zabbix()
+    view = _view(zabbix)
+    view.load()
+    assert len(view) == 0
+    # several open problems on one trigger, only some of them resolved by a recovery event
+    first, second, third = zabbix.problem(1), zabbix.problem(1), zabbix.problem(1)
+    other = zabbix.problem(2)
+    assert view.sync() == 4
+    assert [p.eventid for p in view.query(triggerids=[1])] == [first, second, third]
+    zabbix.recover(first, third)
+    assert view.sync() == 1
+    assert [p.eventid for p in view.query()] == [second, other]
+    assert view.counts("trigger") == {1: 1, 2: 1}
+    # a problem raised and resolved between two syncs is never added
+    zabbix.recover(zabbix.problem(2))
+    zabbix.recover(other)
+    assert view.sync() == 3
+    assert [p.eventid for p in view.query()] == [second]
+    assert view.sync() == 0
+
+
+def test_sync_pages_past_the_watermark() -> None:
+    zabbix = _Zabbix()
+    view = _view(zabbix, page_size=3)
+    view.load()
+    eventids = [zabbix.problem(1 + i % 3) for i in range(10)]
+    zabbix.calls.clear()
+    assert view.sync() == 10
+    # 3 + 3 + 3 + 1 events
+    assert zabbix.calls["event.get"] == 4
+    assert view.watermark == eventids[-1]
+    assert [p.eventid for p in view.query()] == eventids
+    zabbix.calls.clear()
+    assert view.sync() == 0
+    assert zabbix.calls["event.get"] == 1
+
+
+def test_query_intersects_indexes() -> None:
+    zabbix = _Zabbix()
+    payments = zabbix.problem(1, severity=4, tags=(("service", "payments"), ("team", "core")))
+    zabbix.problem(1, severity=2, tags=(("service", "payments"),))
+    web = zabbix.problem(2, severity=4, tags=(("service", "web"),))
+    shared = zabbix.problem(3, severity=5, tags=(("service", "payments"),))
+    view = _view(zabbix)
+    view.load()
+    assert [p.eventid for p in view.query(groupids=[11], severities=[4, 5])] == [payments, shared]
+    assert [p.eventid for p in view.query(groupids=[12], severities=[4, 5])] == [web, shared]
+    assert [p.eventid for p in view.query(severities=[4], tags=[("service", "payments")])] == [payments]
+    assert [p.eventid for p in view.query(tags=[("service", "payments"), ("team", None)])] == [payments]
+    assert [p.eventid for p in view.query(hostids=[103], tags=[("service", None)])] == [shared]
+    assert view.query(groupids=[12], tags=[("service", "payments"), ("team", "core")]) == []
+    assert view.query(tags=[("owner", None)]) == []
+    assert view.query(severities=[]) == []
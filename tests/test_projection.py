@@ -0,0 +1,35 @@
+from pyzbx.projection import FieldTracker
+
+ROWS = [{"eventid": "1", "name": "High load", "clock": "0", "hosts": [{"hostid": "10001", "name": "web-1"}]}]
+
+
+def test_suggest_maps_sub_selects() -> None:
+    tracker = FieldTracker()
+    for row in tracker.track("site", ROWS):
+        assert "name" in row
+        names = [host["name"] for host in row["hosts"]]
+    assert names == ["web-1"]
+    projection = tracker.suggest("site")
+    assert projection is not None
+    assert projection.params() == {"output": ["name"], "selectHosts": ["name"]}
+
+
+def test_whole_row_reads_fall_back_to_extend() -> None:
+    tracker = FieldTracker()
+    for site, read in [("dict", dict), ("unpack", lambda row: {**row}), ("items", lambda row: dict(row.items()))]:
+        [row] = tracker.track(site, ROWS)
+        assert read(row)["eventid"] == "1"
+        projection = tracker.suggest(site)
+        assert projection is not None
+        assert projection.params() == {"output": "extend", "selectHosts": "extend"}
+
+
+def test_list_fields_without_a_sub_select_stay_output_fields() -> None:
+    rows = [{**ROWS[0], "urls": [{"name": "Runbook", "url": "https://wiki/runbook"}]}]
+    tracker = FieldTracker()
+    for row in tracker.track("site", rows):
+        assert [url["url"] for url in row["urls"]] == ["https://wiki/runbook"]
+        assert row["hosts"]
+    projection = tracker.suggest("site")
+    assert projection is not None
+    assert projection.params() == {"output": ["urls"], "selectHosts": "extend"}
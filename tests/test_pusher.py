@@ -0,0 +1,37 @@
+import json
+
+import httpx
+
+from pyzbx.pusher import HistoryPusher, PushError
+
+
+def _client(errors: dict[int, str]) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        values = json.loads(request.content)["params"]
+        data = [{"error": errors[v["itemid"]]} if v["itemid"] in errors else {"itemid": v["itemid"]} for v in values]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": {"response": "success", "data": data}, "id": 1})
+
+    return httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(handler))
+
+
+def test_push_batches_and_errors() -> None:
+    seen: list[PushError] = []
+    with HistoryPusher(_client({3: "No permissions"}), batch_size=2, on_error=seen.append) as pusher:
+        for itemid in range(5):
+            pusher.push({"itemid": itemid, "value": 1, "clock": 0})
+        pusher.flush()
+        assert pusher.stats.sent == 4
+        assert pusher.stats.failed == 1
+    assert seen == [PushError({"itemid": 3, "value": 1, "clock": 0}, "No permissions")]
+
+
+def test_failing_callback_does_not_block_flush() -> None:
+    def on_error(error: PushError) -> None:
+        raise RuntimeError(error.error)
+
+    pusher = HistoryPusher(_client({1: "rejected"}), batch_size=10, flush_interval=0.01, on_error=on_error)
+    pusher.push({"itemid": 1, "value": 1, "clock": 0})
+    pusher.push({"itemid": 2, "value": 1, "clock": 0})
+    pusher.close()
+    assert pusher.stats.failed == 1
+    assert len(pusher.errors) == 1
@@ -0,0 +1,90 @@
+import gzip
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from pyzbx.budget import MemoryBudget
+from pyzbx.exceptions import MemoryBudgetExceededError
+from pyzbx.generics import rpc
+from pyzbx.recording import RecordingTransport, ReplayTransport, read_records
+from pyzbx.simulator import HOST_BASE, SimulatorServer
+
+SECRETS = ("s3cr3t", "0424bd59b807674191e7d77572075f33", "a5ec4b2cd5b7df4d7cfcc3bd4cc7d2dd")
+RESULTS = {
+    "user.login": SECRETS[1],
+    "user.checkAuthentication": {"userid": "1", "username": "Admin", "sessionid": SECRETS[1]},
+    "token.generate": [{"tokenid": "1", "token": SECRETS[2]}],
+    "host.get": [{"hostid": "10084", "host": "Zabbix server"}],
+}
+
+
+def _server(request: httpx.Request) -> httpx.Response:
+    method = json.loads(request.content)["method"]
+    return httpx.Response(200, json={"jsonrpc": "2.0", "result": RESULTS[method], "id": 1})
+
+
+def test_recording_holds_no_credentials(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.jsonl.gz"
+    transport = RecordingTransport(path, transport=httpx.MockTransport(_server))
+    calls = [
+        ("user.login", {"username": "Admin", "password": SECRETS[0]}),
+        ("user.checkAuthentication", {"sessionid": SECRETS[1]}),
+        ("token.generate", ["1"]),
+        ("host.get", {"output": ["host"]}),
+    ]
+    with httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=transport) as client:
+        for method, params in calls:
+            response = client.post("", json={"jsonrpc": "2.0", "method": method, "params": params, "id": 1})
+            # the caller still gets the real response
+            assert response.json()["result"] == RESULTS[method]
+    transport.close()
+    with gzip.open(path, "rt") as f:
+        content = f.read()
+    assert not any(secret in content for secret in SECRETS)
+    records = list(read_records(path))
+    assert [record.method for record in records] == [method for method, _ in calls]
+    # unredacted responses are recorded as received
+    assert json.loads(records[-1].response)["result"] == RESULTS["host.get"]
+
+    with httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=ReplayTransport(path, speed=None)) as client:
+        payload = {"jsonrpc": "2.0", "method": "host.get", "params": {"output": ["host"]}, "id": 1}
+        assert client.post("", json=payload).json()["result"] == RESULTS["host.get"]
+
+
+def test_compressed_response_is_recorded_decoded(tmp_path: Path) -> None:
+    def server(_: httpx.Request) -> httpx.Response:
+        body = gzip.compress(json.dumps({"jsonrpc": "2.0", "result": RESULTS["host.get"], "id": 1}).encode())
+        return httpx.Response(200, headers={"Content-Encoding": "gzip"}, content=body)
+
+    path = tmp_path / "traffic.jsonl.gz"
+    transport = RecordingTransport(path, transport=httpx.MockTransport(server))
+    with httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=transport) as client:
+        payload = {"jsonrpc": "2.0", "method": "host.get", "params": {}, "id": 1}
+        assert client.post("", json=payload).json()["result"] == RESULTS["host.get"]
+    transport.close()
+    assert json.loads(next(read_records(path)).response)["result"] == RESULTS["host.get"]
+
+
+@pytest.mark.zabbix_simulator(hosts=100, items_per_host=50)
+def test_streamed_and_aborted_responses(tmp_path: Path, zabbix_simulator: SimulatorServer) -> None:
+    path = tmp_path / "traffic.jsonl.gz"
+    transport = RecordingTransport(path, max_recorded=100_000)
+    with httpx.Client(
+        base_url=f"{zabbix_simulator.url}/api_jsonrpc.php",
+        headers={"Authorization": "Bearer test"},
+        transport=transport,
+    ) as client:
+        assert rpc(client, "host.get", {"output": ["hostid"], "limit": 1}) == [{"hostid": str(HOST_BASE)}]
+        # over the recording limit, still answered to the client
+        assert len(rpc(client, "item.get", {"output": ["itemid"]})) == 5000
+        # aborted by the memory budget while it was received
+        with MemoryBudget(10_000_000, 50_000), pytest.raises(MemoryBudgetExceededError):
+            rpc(client, "item.get", {"output": "extend"})
+    transport.close()
+    records = list(read_records(path))
+    assert [record.method for record in records] == ["host.get", "item.get", "item.get"]
+    assert json.loads(records[0].response)["result"] == [{"hostid": str(HOST_BASE)}]
+    assert "over the recording limit" in json.loads(records[1].response)["error"]["data"]
+    assert "closed the response" in json.loads(records[2].response)["error"]["data"]
@@ -0,0 +1,145 @@
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from pyzbx.rootcause import BlastRadius, TriggerGraph
+
+# triggerid -> (dependencies, hostids): an uplink trigger on host 1 that the triggers of
+# hosts 2 and 3 depend on, and trigger 40 on both hosts 2 and 3
+TRIGGERS = {
+    11: ([], [1]),
+    21: ([11], [2]),
+    22: ([21], [2]),
+    31: ([11], [3]),
+    32: ([], [3]),
+    40: ([22], [2, 3]),
+}
+
+
+class _Zabbix:
+    """A mock frontend answering ``trigger.get`` from ``triggers`` and ``auditlog.get`` from ``audit``."""
+
+    def __init__(self, triggers: dict[int, tuple[list[int], list[int]]]) -> None:
+        self.triggers = dict(triggers)
+        self.audit: list[dict[str, str]] = []
+
+    def log(self, clock: int, action: int, resourcetype: int, resourceid: int) -> None:
+        entry = {"clock": clock, "action": action, "resourcetype": resourcetype, "resourceid": resourceid}
+        self.audit.append({key: str(value) for key, value in entry.items()})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        params = payload["params"]
+        if payload["method"] == "auditlog.get":
+            result: list[dict[str, Any]] = [e for e in self.audit if int(e["clock"]) >= params["time_from"]]
+        else:
+            result = [
+                {
+                    "triggerid": str(triggerid),
+                    "dependencies": [{"triggerid": str(d)} for d in self.triggers[triggerid][0]],
+                    "hosts": [{"hostid": str(h)} for h in self.triggers[triggerid][1]],
+                }
+                for triggerid in params.get("triggerids", sorted(self.triggers))
+                if triggerid in self.triggers
+            ]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+
+def _graph(zabbix: _Zabbix) -> TriggerGraph:
+    client = httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(zabbix))
+    graph = TriggerGraph(client, chunk_size=2)
+    graph.load()
+    return graph
+
+
+def _same(graph: TriggerGraph, zabbix: _Zabbix) -> bool:
+    """Whether ``graph`` holds what a fresh load would."""
+    return graph._rows() == _graph(zabbix)._rows()  # noqa: SLF001
+
+
+def test_load() -> None:
+    graph = _graph(_Zabbix(TRIGGERS))
+    assert len(graph) == 6
+    assert graph.dependencies(22) == [21]
+    assert graph.dependents(11) == [21, 31]
+    with pytest.raises(KeyError, match="99"):
+        graph.dependencies(99)
+
+
+def test_root_causes() -> None:
+    zabbix = _Zabbix(TRIGGERS)
+    graph = _graph(zabbix)
+    assert graph.root_causes([11, 21, 22, 40, 32]) == {11: [11], 21: [11], 22: [11], 40: [11], 32: [32]}
+    # without the uplink in problem, the first problem downstream of it is the root cause
+    assert graph.root_causes([22, 40, 31]) == {22: [22], 40: [22], 31: [31]}
+    # two independent root causes upstream of one problem, and a trigger the graph does not know
+    zabbix.triggers[40] = ([22, 32], [2, 3])
+    graph.update([40])
+    assert graph.root_causes([22, 32, 40, 99]) == {22: [22], 32: [32], 40: [22, 32], 99: [99]}
+
+
+def test_blast_radius() -> None:
+    graph = _graph(_Zabbix(TRIGGERS))
+    assert graph.blast_radius(1) == BlastRadius([11, 21, 22, 31, 40], [1, 2, 3])
+    assert graph.blast_radius([3]) == BlastRadius([31, 32, 40], [2, 3])
+    assert graph.blast_radius([2, 99]) == BlastRadius([21, 22, 40], [2, 3])
+    assert graph.blast_radius(99) == BlastRadius([], [])
+
+
+def test_update_replaces_rows_in_place() -> None:
+    # enough unrelated triggers that a few changes do not rebuild the arrays
+    zabbix = _Zabbix({**TRIGGERS, **{100 + i: ([], [9]) for i in range(200)}})
+    graph = _graph(zabbix)
+    offsets = graph._depends_on.offsets  # noqa: SLF001
+    zabbix.triggers[22] = ([11], [2, 4])
+    zabbix.triggers[50] = ([40], [5])
+    del zabbix.triggers[31]
+    assert graph.update([22, 50, 31]) == 2
+    assert graph._depends_on.offsets is offsets  # noqa: SLF001
+    assert len(graph) == 206
+    assert graph.dependents(11) == [21, 22]
+    assert graph.dependents(40) == [50]
+    assert graph.blast_radius(1) == BlastRadius([11, 21, 22, 40, 50], [1, 2, 3, 4, 5])
+    assert graph.root_causes([11, 50]) == {11: [11], 50: [11]}
+    with pytest.raises(KeyError):
+        graph.dependencies(31)
+    assert _same(graph, zabbix)
+    # a trigger that was removed can come back
+    zabbix.triggers[31] = ([21], [3])
+    graph.update([31])
+    assert graph.dependents(21) == [31]
+    assert _same(graph, zabbix)
+
+
+def test_update_rebuilds_after_many_changes() -> None:
+    zabbix = _Zabbix(TRIGGERS)
+    graph = _graph(zabbix)
+    zabbix.triggers[32] = ([31], [3])
+    graph.update([32])
+    assert not graph._depends_on.changed  # noqa: SLF001
+    assert list(graph.triggerids) == sorted(TRIGGERS)
+    assert graph.dependencies(32) == [31]
+    assert _same(graph, zabbix)
+
+
+def test_sync_removes_triggers_of_deleted_hosts() -> None:
+    zabbix = _Zabbix(TRIGGERS)
+    graph = _graph(zabbix)
+    clock = graph.last_clock + 1  # type: ignore[operator]
+    # deleting host 2 deletes its triggers, and trigger 40 that also uses items of host 2
+    for triggerid in (21, 22, 40):
+        del zabbix.triggers[triggerid]
+    zabbix.log(clock, 2, 4, 2)
+    # an unrelated host update is ignored
+    zabbix.log(clock, 1, 4, 3)
+    zabbix.triggers[32] = ([11], [3])
+    zabbix.log(clock, 1, 13, 32)
+    assert graph.sync() == 1
+    assert graph.last_clock == clock
+    assert len(graph) == 3
+    assert graph.dependents(11) == [31, 32]
+    assert graph.blast_radius(2) == BlastRadius([], [])
+    assert graph.blast_radius(1) == BlastRadius([11, 31, 32], [1, 3])
+    assert _same(graph, zabbix)
@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from pyzbx.generics import rpc
+from pyzbx.search import TAG_CONTAINS, TAG_EQUALS, TAG_NOT_EQUAL, SearchIndex
+from pyzbx.simulator import HOST_BASE, SimulatorServer
+
+
+@pytest.fixture()
+def index(zabbix_simulator: SimulatorServer) -> Iterator[SearchIndex]:
+    with httpx.Client(base_url=zabbix_simulator.url, headers={"Authorization": "Bearer test"}) as client:
+        yield SearchIndex(client)
+
+
+@pytest.mark.zabbix_simulator(hosts=20, items_per_host=5)
+def test_search_by_host(index: SearchIndex) -> None:
+    items = index.get("item", {"hostids": [HOST_BASE + 3], "output": ["itemid", "hostid"]})
+    assert len(items) == 5
+    assert {item["hostid"] for item in items} == {str(HOST_BASE + 3)}
+
+
+@pytest.mark.zabbix_simulator(hosts=20, items_per_host=5)
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"filter": {"status": "0"}},
+        {"sortfield": ["name", "clock"]},
+        {"output": ["hostid", "description"]},
+        {"itemids": ["100001"]},
+    ],
+)
+def test_fields_not_indexed_are_rejected(index: SearchIndex, params: dict) -> None:
+    with pytest.raises(ValueError, match="index"):
+        index.get("host", params)
+
+
+@pytest.mark.zabbix_simulator(hosts=5, items_per_host=4)
+def test_sortorder_per_field(index: SearchIndex) -> None:
+    params = {"output": ["itemid", "hostid"], "sortfield": ["hostid", "itemid"], "sortorder": ["DESC", "ASC"]}
+    assert index.get("item", params) == rpc(index.client, "item.get", params)
+
+
+HOSTS = [
+    {"hostid": "1", "host": "a", "name": "a", "tags": [{"tag": "env", "value": "Prod"}]},
+    {"hostid": "2", "host": "b", "name": "b", "tags": [{"tag": "env", "value": "prod"}]},
+]
+
+
+class _Hosts:
+    """Answers host.get with ``HOSTS``; while ``gate`` is clear, the calls of a reload wait for it."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        self.calls += 1
+        self.gate.wait(5)
+        ids = payload["params"].get("hostids")
+        result = [host for host in HOSTS if ids is None or int(host["hostid"]) in ids]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+
+def _hosts_index(hosts: _Hosts, refresh_interval: float = 300.0) -> SearchIndex:
+    client = httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(hosts))
+    return SearchIndex(client, objects=("host",), refresh_interval=refresh_interval)
+
+
+@pytest.mark.parametrize(
+    ("operator", "value", "hostids"),
+    [(TAG_EQUALS, "prod", ["2"]), (TAG_NOT_EQUAL, "prod", ["1"]), (TAG_CONTAINS, "PROD", ["1", "2"])],
+)
+def test_tag_equality_is_case_sensitive(operator: int, value: str, hostids: list[str]) -> None:
+    index = _hosts_index(_Hosts())
+    params = {"output": ["hostid"], "tags": [{"tag": "env", "value": value, "operator": operator}]}
+    assert [host["hostid"] for host in index.get("host", params)] == hostids
+
+
+def test_stale_index_answers_while_one_query_reloads_it() -> None:
+    hosts = _Hosts()
+    index = _hosts_index(hosts, refresh_interval=0.05)
+    assert index.get("host", {"countOutput": True}) == "2"
+    loaded = hosts.calls
+    time.sleep(0.06)
+    hosts.gate.clear()
+    reload = threading.Thread(target=index.get, args=("host", {"countOutput": True}))
+    reload.start()
+    while hosts.calls == loaded:
+        time.sleep(0.001)
+    # answered from the previous index without waiting for the reload, which is not started twice
+    assert index.get("host", {"countOutput": True}) == "2"
+    hosts.gate.set()
+    reload.join()
+    assert hosts.calls == 2 * loaded
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import socketserver
+import struct
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from pyzbx.sender import (
+    FLAG_COMPRESSED,
+    FLAG_LARGE,
+    ZBX_HEADER,
+    AsyncSender,
+    SenderResponse,
+    SenderValue,
+    ZabbixSender,
+    header_size,
+    pack,
+    unpack,
+)
+
+
+class _Trapper(socketserver.BaseRequestHandler):
+    """Answers like a trapper; values of host ``rejected`` make the whole packet fail."""
+
+    def handle(self) -> None:
+        prefix = self._read(5)
+        lengths = self._read(header_size(prefix[4]))
+        size = struct.unpack("<QQ" if prefix[4] & FLAG_LARGE else "<II", lengths)[0]
+        values = json.loads(unpack(prefix[4], lengths, self._read(size)))["data"]
+        if any(value["host"] == "rejected" for value in values):
+            body = {"response": "failed", "info": "invalid data"}
+        else:
+            n = len(values)
+            body = {"response": "success", "info": f"processed: {n}; failed: 0; total: {n}; seconds spent: 0.000100"}
+        # answer with the large packet header, as a server may for big answers
+        self.request.sendall(pack(json.dumps(body).encode(), large=True))
+
+    def _read(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            if not (chunk := self.request.recv(size - len(data))):
+                raise ConnectionError
+            data += chunk
+        return data
+
+
+@pytest.fixture()
+def trapper() -> Iterator[tuple[str, int]]:
+    with socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Trapper) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server.server_address
+        server.shutdown()
+
+
+@pytest.mark.parametrize(("compress", "large"), [(False, False), (True, False), (False, True), (True, True)])
+def test_pack_unpack(compress: bool, large: bool) -> None:
+    data = b'{"request":"sender data","data":[]}' * 10
+    packet = pack(data, compress=compress, large=large)
+    assert packet[:4] == ZBX_HEADER
+    flags = packet[4]
+    assert bool(flags & FLAG_COMPRESSED) == compress
+    assert bool(flags & FLAG_LARGE) == large
+    lengths = packet[5 : 5 + header_size(flags)]
+    assert unpack(flags, lengths, packet[5 + header_size(flags) :]) == data
+
+
+def test_merge_keeps_failed() -> None:
+    ok = SenderResponse(2, 0, 2, 0.1, "success")
+    failed = SenderResponse(0, 1, 1, 0.0, "failed")
+    assert ok.merge(failed).response == "failed"
+    assert failed.merge(ok).response == "failed"
+    assert ok.merge(ok) == SenderResponse(4, 0, 4, 0.2, "success")
+
+
+def test_blocking_sender(trapper: tuple[str, int]) -> None:
+    response = ZabbixSender(*trapper, compress=True).send([SenderValue("web01", "app.requests", 42)])
+    assert response.response == "success"
+    assert response.processed == 1
+
+
+def test_async_sender(trapper: tuple[str, int]) -> None:
+    async def run() -> SenderResponse:
+        async with AsyncSender(*trapper, batch_size=2, flush_interval=0.01) as sender:
+            for i in range(4):
+                await sender.send(SenderValue("web01", "app.requests", i))
+            await sender.send(SenderValue("rejected", "app.requests", 0))
+        return sender.totals
+
+    totals = asyncio.run(run())
+    assert totals.processed == 4
+    assert totals.response == "failed"
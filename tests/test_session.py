@@ -0,0 +1,32 @@
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from pyzbx.generics import api_url, rpc
+from pyzbx.session import SessionManager
+from pyzbx.simulator import Faults, SimulatorServer
+
+
+@pytest.fixture()
+def client(zabbix_simulator: SimulatorServer) -> Iterator[httpx.Client]:
+    with httpx.Client(base_url=zabbix_simulator.url) as client:
+        client.auth = SessionManager(zabbix_simulator.url, "Admin", "zabbix", check_interval=3600)
+        client.auth.open(client)
+        yield client
+
+
+@pytest.mark.zabbix_simulator(hosts=10, items_per_host=10, faults=Faults(session_ttl=0.2))
+def test_expired_session_is_renewed(client: httpx.Client, zabbix_simulator: SimulatorServer) -> None:
+    time.sleep(0.3)
+    assert len(rpc(client, "item.get", {"output": ["itemid"]})) == 100
+    assert zabbix_simulator.calls["user.login"] == 2
+
+
+@pytest.mark.zabbix_simulator(hosts=10, items_per_host=10)
+def test_streamed_response_is_not_buffered(client: httpx.Client) -> None:
+    payload = {"jsonrpc": "2.0", "method": "item.get", "params": {"output": ["itemid"]}, "id": 1}
+    with client.stream("POST", api_url(client), json=payload) as r:
+        assert not r.is_stream_consumed
+        assert b"".join(r.iter_bytes())
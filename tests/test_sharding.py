@@ -0,0 +1,59 @@
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from pyzbx.generics import rpc
+from pyzbx.sharding import get_tuner, sharded_get
+from pyzbx.simulator import HOST_BASE, ITEM_BASE, SimulatorServer
+
+
+@pytest.fixture()
+def client(zabbix_simulator: SimulatorServer) -> Iterator[httpx.Client]:
+    with httpx.Client(base_url=zabbix_simulator.url, headers={"Authorization": "Bearer test"}) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def _small_shards(monkeypatch: pytest.MonkeyPatch) -> None:
+    tuner = get_tuner("item")
+    for attribute in ("size", "min_size", "max_size"):
+        monkeypatch.setattr(tuner, attribute, 50)
+
+
+@pytest.mark.zabbix_simulator(hosts=200, items_per_host=50)
+@pytest.mark.parametrize("preservekeys", [False, True])
+def test_sorted_limited_get_matches_single_call(client: httpx.Client, preservekeys: bool) -> None:
+    params = {
+        "output": ["itemid", "name"],
+        "hostids": [HOST_BASE + h for h in range(200)],
+        "sortfield": "itemid",
+        "sortorder": "DESC",
+        "limit": 30,
+        "preservekeys": preservekeys,
+    }
+    expected = rpc(client, "item.get", params)
+    result = sharded_get(client, "item", params)
+    assert result == expected
+    assert len(result) == 30
+    first = next(iter(result)) if preservekeys else result[0]["itemid"]
+    assert first == str(ITEM_BASE + 200 * 50 - 1)
+
+
+@pytest.mark.zabbix_simulator(hosts=10, items_per_host=50)
+def test_list_sortfield(client: httpx.Client) -> None:
+    itemids = [ITEM_BASE + i for i in range(500)]
+    params = {"output": ["itemid"], "itemids": itemids, "sortfield": ["name", "itemid"], "sortorder": "DESC"}
+    result = sharded_get(client, "item", params)
+    assert result == rpc(client, "item.get", params)
+    assert set(result[0]) == {"itemid"}
+
+
+@pytest.mark.zabbix_simulator(hosts=10, items_per_host=50)
+def test_count_output_counts_distinct_objects(client: httpx.Client) -> None:
+    itemids = [ITEM_BASE + i for i in range(100)]
+    # every item is asked for twice, by two different shards
+    params = {"itemids": itemids + itemids, "countOutput": True}
+    assert sharded_get(client, "item", params) == "100"
+    # a limit does not cut the rows a count is taken from
+    assert sharded_get(client, "item", {**params, "limit": 30}) == "100"
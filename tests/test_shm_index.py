@@ -0,0 +1,68 @@
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from pyzbx.shm_index import SharedIdIndex, refresh_index, write_index
+from pyzbx.simulator import HOST_BASE, ITEM_BASE, SimulatorServer
+
+ENTRIES = [("host", "web01", 10084), ("host", "db01", 10085), ("hostname", "Web server", 10084)]
+
+
+def test_write_and_read(tmp_path: Path) -> None:
+    path = tmp_path / "ids.idx"
+    assert write_index(path, ENTRIES) == 3
+    index = SharedIdIndex(path)
+    assert len(index) == 3
+    assert index.get("host", "web01") == 10084
+    assert index.get("hostname", "Web server") == 10084
+    assert index.get("hostname", "web01") is None
+    assert ("host", "db01") in index
+    assert index.get_many("host", ["db01", "mail01"]) == {"db01": 10085}
+    index.close()
+
+
+def test_replaced_file_is_reopened(tmp_path: Path) -> None:
+    path = tmp_path / "ids.idx"
+    write_index(path, ENTRIES)
+    index = SharedIdIndex(path, check_interval=0.01)
+    views = index._views  # noqa: SLF001
+    # the refresher swaps the file atomically, readers never see a partial one
+    write_index(path, [*ENTRIES, ("host", "mail01", 10086)])
+    assert not list(tmp_path.glob(".*.tmp"))
+    assert index.get("host", "mail01") is None
+    time.sleep(0.02)
+    assert index.get("host", "mail01") == 10086
+    assert len(index) == 4
+    # lookups that still hold the previous mapping keep a consistent view
+    assert sorted(views[1]) == [10084, 10084, 10085]
+    index.close()
+
+
+def test_closed_index(tmp_path: Path) -> None:
+    path = tmp_path / "ids.idx"
+    write_index(path, ENTRIES)
+    index = SharedIdIndex(path, check_interval=0)
+    index.close()
+    with pytest.raises(ValueError, match="closed"):
+        index.get("host", "web01")
+
+
+def test_not_an_index(tmp_path: Path) -> None:
+    path = tmp_path / "ids.idx"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError, match="not a pyzbx ID index"):
+        SharedIdIndex(path)
+
+
+@pytest.mark.zabbix_simulator(hosts=3, items_per_host=2)
+def test_refresh_index(zabbix_simulator: SimulatorServer, tmp_path: Path) -> None:
+    path = tmp_path / "ids.idx"
+    with httpx.Client(base_url=zabbix_simulator.url, headers={"Authorization": "Bearer test"}) as client:
+        assert refresh_index(client, path, page_size=2) == 3 * 2 + 3 * 2
+    index = SharedIdIndex(path)
+    assert index.get("host", "sim-000001") == HOST_BASE + 1
+    assert index.get("hostname", "Simulated host 000002") == HOST_BASE + 2
+    assert index.get("item", "sim-000001:sim.metric[1]") == ITEM_BASE + 3
+    index.close()
@@ -0,0 +1,63 @@
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from pyzbx.exceptions import ZabbixAPIError
+from pyzbx.generics import paginate, rpc
+from pyzbx.simulator import HOST_BASE, ITEM_BASE, Faults, SimulatorServer
+
+
+@pytest.fixture()
+def client(zabbix_simulator: SimulatorServer) -> Iterator[httpx.Client]:
+    with httpx.Client(base_url=zabbix_simulator.url, headers={"Authorization": "Bearer test"}) as client:
+        yield client
+
+
+@pytest.mark.zabbix_simulator(hosts=30, items_per_host=20)
+def test_paging_returns_every_item_once(client: httpx.Client) -> None:
+    itemids = [row["itemid"] for row in paginate(client, "item", {"output": ["itemid"]}, page_size=70)]
+    assert itemids == [str(ITEM_BASE + i) for i in range(600)]
+
+
+@pytest.mark.zabbix_simulator(hosts=5, items_per_host=4)
+def test_sort_orders_per_field_and_keys_without_pk(client: httpx.Client) -> None:
+    params = {"output": ["hostid", "itemid"], "sortfield": ["hostid", "itemid"], "sortorder": ["ASC", "DESC"]}
+    rows = rpc(client, "item.get", params)
+    assert [row["itemid"] for row in rows[:4]] == [str(ITEM_BASE + i) for i in (3, 2, 1, 0)]
+    assert rows[4]["hostid"] == str(HOST_BASE + 1)
+    hosts = rpc(client, "host.get", {"output": ["name"], "preservekeys": True, "limit": 2})
+    assert list(hosts) == [str(HOST_BASE), str(HOST_BASE + 1)]
+    assert all(set(host) == {"name"} for host in hosts.values())
+
+
+@pytest.mark.zabbix_simulator(hosts=5, faults=Faults(error_rate=0.5, seed=1))
+def test_error_rate(client: httpx.Client, zabbix_simulator: SimulatorServer) -> None:
+    statuses = []
+    for _ in range(40):
+        try:
+            rpc(client, "host.get", {"output": ["hostid"]})
+        except httpx.HTTPStatusError as e:
+            statuses.append(e.response.status_code)
+    assert 0 < len(statuses) < 40
+    assert set(statuses) == {zabbix_simulator.faults.error_status}
+
+
+@pytest.mark.zabbix_simulator(hosts=5, faults=Faults(latency=0.05))
+def test_latency(client: httpx.Client) -> None:
+    start = time.monotonic()
+    rpc(client, "host.get", {"output": ["hostid"]})
+    assert time.monotonic() - start >= 0.05
+
+
+@pytest.mark.zabbix_simulator(hosts=5, faults=Faults(session_ttl=0.1))
+def test_session_expiry(zabbix_simulator: SimulatorServer) -> None:
+    with httpx.Client(base_url=zabbix_simulator.url) as client:
+        token = rpc(client, "user.login", {"username": "Admin", "password": "zabbix"})
+        client.headers["Authorization"] = f"Bearer {token}"
+        assert rpc(client, "host.get", {"countOutput": True}) == "5"
+        time.sleep(0.2)
+        with pytest.raises(ZabbixAPIError) as e:
+            rpc(client, "host.get", {"countOutput": True})
+    assert "Session terminated" in str(e.value.data)
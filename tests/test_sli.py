@@ -0,0 +1,76 @@
+import json
+import math
+import time
+from collections import Counter
+from typing import Any
+
+import httpx
+
+from pyzbx.sli import SliCache, get_sli
+
+DAY = 86400
+# aligned on the windows of the tests, and an even day
+START = 1_700_000_000 // (10 * DAY) * 10 * DAY
+
+
+class _Sla:
+    """Answers ``sla.getsli`` with daily periods; service 2 has no value on odd days."""
+
+    def __init__(self) -> None:
+        self.calls: Counter[tuple[int, int, int]] = Counter()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        params = payload["params"]
+        self.calls[params["slaid"], params["period_from"], params["period_to"]] += 1
+        first = params["period_from"] // DAY * DAY
+        periods = [{"period_from": s, "period_to": s + DAY} for s in range(first, params["period_to"], DAY)]
+        sli = [[self._value(p["period_from"], 1), self._value(p["period_from"], 2)] for p in periods]
+        for row, period in zip(sli, periods, strict=True):
+            if period["period_from"] // DAY % 2:
+                row.pop()
+        result = {"periods": periods, "serviceids": [1, 2], "sli": sli}
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+    @staticmethod
+    def _value(start: int, serviceid: int) -> dict[str, Any]:
+        return {"uptime": start, "downtime": serviceid, "error_budget": 0, "sli": 99.0 + serviceid / 10}
+
+
+def _client(sla: _Sla) -> httpx.Client:
+    return httpx.Client(base_url="http://zabbix/api_jsonrpc.php", transport=httpx.MockTransport(sla))
+
+
+def test_periods_are_merged_across_windows() -> None:
+    sla = _Sla()
+    with _client(sla) as client:
+        # windows of two and a half days split every other window boundary inside a day
+        matrices = get_sli(client, [7, 8], START, START + 10 * DAY, window=DAY * 5 // 2)
+    matrix = matrices[7]
+    assert len(matrix) == 10
+    assert list(matrix.periods[::2]) == [START + i * DAY for i in range(10)]
+    assert list(matrix.serviceids) == [1, 2]
+    assert matrix.series("uptime", 1) == [float(START + i * DAY) for i in range(10)]
+    assert matrix.value("sli", 0, 2) == 99.2
+    assert math.isnan(matrix.value("sli", 1, 2))
+    assert not math.isnan(matrix.value("sli", 1, 1))
+    assert {slaid for slaid, _, _ in sla.calls} == {7, 8}
+    assert len(sla.calls) == 2 * 4
+
+
+def test_closed_windows_are_cached() -> None:
+    sla = _Sla()
+    cache = SliCache()
+    now = int(time.time())
+    with _client(sla) as client:
+        first = get_sli(client, [7], START, START + 10 * DAY, window=2 * DAY, cache=cache)
+        assert sum(sla.calls.values()) == 5
+        second = get_sli(client, [7], START, START + 10 * DAY, window=2 * DAY, cache=cache)
+        assert sum(sla.calls.values()) == 5
+        assert second[7].series("sli", 1) == first[7].series("sli", 1)
+        # the window holding now is still open and is fetched every time
+        recent = now // (2 * DAY) * 2 * DAY - 2 * DAY
+        get_sli(client, [7], recent, recent + 4 * DAY, window=2 * DAY, cache=cache)
+        get_sli(client, [7], recent, recent + 4 * DAY, window=2 * DAY, cache=cache)
+    assert sum(sla.calls.values()) == 5 + 2 + 1
+    cache.close()